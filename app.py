@@ -1,17 +1,148 @@
 import streamlit as st
-import requests
 import json
 import pandas as pd
 from typing import Dict, List, Optional, Union, Any
-import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import numpy as np
 import os
+import base64
+import functools
+import gzip
+import hmac
+import io
+import multiprocessing
+from contextlib import contextmanager
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import altair as alt
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import feather
+from monday_client import (
+    DEFAULT_API_URL,
+    ITEMS_PAGE_MAX_LIMIT,
+    ITEMS_PAGE_MIN_LIMIT,
+    MAX_QUERY_COMPLEXITY,
+    MondayAPIError,
+    MondayClient,
+    MondayQueryTooComplexError,
+    RequestScheduler,
+    create_transport,
+    json_loads,
+)
+from item_decoding import (
+    BOARD_ID_COLUMN,
+    INTERNAL_COLUMNS,
+    ITEM_COLUMNS,
+    PERSON_IDS_COLUMN,
+    PERSON_NAMES_COLUMN,
+    STATUS_MAPPING,
+    BoardNormalizer,
+    ColumnDecoder,
+    DecodedPage,
+    decode_items_response,
+    decode_person_refs,
+    named_refs,
+    page_spec,
+    referenced_ids,
+    resolve_persons,
+    status_label,
+)
 
-st.set_page_config(page_title="Monday.com Dashboard", layout="wide")
+# Configuração Monday.com (API_URL e transporte podem apontar para um servidor local)
+API_URL = os.environ.get("MONDAY_API_URL", DEFAULT_API_URL)
+API_TRANSPORT = os.environ.get("MONDAY_TRANSPORT", "requests")
 
-# Configuração Monday.com
-API_URL = "https://api.monday.com/v2"
+# Número padrão de quadros buscados em paralelo
+DEFAULT_MAX_WORKERS = 8
+
+# Processos usados para decodificar as páginas de itens (0 decodifica na thread principal)
+DEFAULT_DECODE_PROCESSES = int(os.environ.get("MONDAY_DECODE_PROCESSES", "0"))
+
+# Limites para agrupar quadros pequenos em uma única consulta
+MAX_BOARDS_PER_BATCH = 25
+BATCH_ITEMS_TARGET = 500
+
+# Arquivo do armazenamento local usado pela sincronização incremental
+STORE_PATH = os.environ.get("MONDAY_STORE_PATH", "monday_store.sqlite3")
+
+# Eventos do log de atividades que indicam que um item saiu do quadro
+REMOVED_ITEM_EVENTS = {"delete_pulse", "archive_pulse", "move_pulse_from_board", "batch_delete_pulses", "batch_archive_pulses"}
+
+# Intervalo mínimo entre atualizações dos resultados parciais (segundos)
+STREAM_RENDER_INTERVAL = 1.5
+
+# Linhas exibidas na tabela de resultados parciais
+STREAM_PREVIEW_ROWS = 1000
+
+# Validade (segundos) das páginas normalizadas guardadas pela busca completa e
+# máximo de itens mantidos nesse cache (ver PageCache)
+PAGE_CACHE_TTL = 1800
+PAGE_CACHE_MAX_ITEMS = 500_000
+
+# Pasta dos snapshots gerados por snapshot.py e arquivo que aponta para o mais recente
+SNAPSHOT_DIR = os.environ.get("MONDAY_SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_MANIFEST = "latest.json"
+
+# Formatos aceitos para os snapshots e a extensão de cada um
+SNAPSHOT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Conjuntos de dados mantidos em memória para todas as sessões, visões filtradas
+# guardadas por conjunto e idade máxima (segundos) para reaproveitar uma busca
+# feita por outra sessão em vez de buscar tudo de novo
+MAX_SHARED_DATASETS = 4
+SHARED_VIEW_CACHE_SIZE = 8
+SHARED_DATASET_MAX_AGE = 300
+
+# Responsáveis exibidos na carga de trabalho, dos mais sobrecarregados para os menos
+WORKLOAD_TOP_PERSONS = 30
+
+# Formatos de exportação: nome exibido, extensão, tipo MIME e se aceita gzip
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv", "text/csv", True),
+    "json": ("JSON", ".json", "application/json", True),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet", False),
+    "arrow": ("Arrow", ".arrow", "application/vnd.apache.arrow.file", False),
+}
+
+# Tabela de itens: tamanhos de página, colunas pesquisadas e estilo de cada urgência
+TABLE_PAGE_SIZES = [50, 100, 250, 500]
+TABLE_SEARCH_COLUMNS = ["name", "board", "group", "persons", "status"]
+URGENCY_STYLES = {"Atrasado": "background-color: #FFCCCC", "Atenção": "background-color: #FFFFCC"}
+
+# Linhas convertidas por vez nas exportações em texto e exportações guardadas por conjunto
+EXPORT_CHUNK_ROWS = 50_000
+
+# Nível de compressão do gzip nas exportações (o padrão 9 é bem mais lento e quase não reduz o tamanho)
+EXPORT_GZIP_LEVEL = 6
+SHARED_EXPORT_CACHE_SIZE = 4
+
+# Receptor de webhooks do Monday (desligado sem MONDAY_WEBHOOK_PORT). Com
+# MONDAY_WEBHOOK_SECRET, só aceita requisições assinadas; com MONDAY_WEBHOOK_RECORD,
+# grava cada evento recebido (uma linha JSON) para ser reenviado com webhooks.py
+WEBHOOK_HOST = os.environ.get("MONDAY_WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.environ.get("MONDAY_WEBHOOK_PORT", "0"))
+WEBHOOK_SECRET = os.environ.get("MONDAY_WEBHOOK_SECRET")
+WEBHOOK_RECORD_PATH = os.environ.get("MONDAY_WEBHOOK_RECORD")
+
+# Intervalo (segundos) em que os eventos recebidos são aplicados aos conjuntos de dados
+WEBHOOK_APPLY_INTERVAL = 1.0
+
+# Tentativas de aplicar uma alteração recebida a um conjunto de dados antes de descartá-la
+WEBHOOK_MAX_ATTEMPTS = 5
+
+# Agendador único por token, compartilhado por todas as sessões do servidor,
+# já que o orçamento de complexidade é da conta e não da sessão
+@st.cache_resource
+def get_scheduler(api_token):
+    client = MondayClient(api_token, transport=create_transport(API_TRANSPORT), api_url=API_URL)
+    return RequestScheduler(client)
 
 # Função para a tela de login
 def login_screen():
@@ -32,13 +163,17 @@ def login_screen():
         else:
             st.error("Usuário ou senha incorretos!")
 
-# Cache para funções que usamos repetidamente
-@st.cache_data(ttl=3600)
-def fetch_all_boards(api_token):
+# Número de quadros por consulta ao carregar as colunas e grupos
+SCHEMA_BATCH_SIZE = 50
+
+# Rótulo do espaço de trabalho principal, que a API retorna como nulo
+MAIN_WORKSPACE_LABEL = "Principal"
+
+# Função para buscar o índice leve de quadros (sem colunas e grupos) diretamente da API
+def query_board_index(api_token):
     all_boards = []
     page = 1
     limit = 100  # Ajuste conforme o limite do seu plano
-    headers = {"Authorization": api_token}
 
     while True:
         query = f"""
@@ -46,25 +181,10 @@ def fetch_all_boards(api_token):
           boards (state: all, limit: {limit}, page: {page}) {{
             id
             name
-            description
-            owner {{
-              id
-              name
-            }}
-            permissions
             state
             board_kind
-            columns {{
-              id
-              title
-              type
-              settings_str
-            }}
-            groups {{
-              id
-              title
-            }}
             items_count
+            updated_at
             workspace {{
               id
               name
@@ -72,13 +192,7 @@ def fetch_all_boards(api_token):
           }}
         }}
         """
-        response = requests.post(API_URL, json={"query": query}, headers=headers)
-        
-        if response.status_code != 200:
-            st.error(f"Erro ao buscar quadros: {response.status_code} - {response.text}")
-            return []
-            
-        data = response.json()
+        data = make_request(query, api_token)
         if not data or "data" not in data or "boards" not in data["data"]:
             break
 
@@ -91,50 +205,269 @@ def fetch_all_boards(api_token):
 
     return all_boards
 
+# Função para buscar colunas e grupos de alguns quadros diretamente da API
+def query_board_schemas(board_ids, api_token):
+    schemas = {}
+    for start in range(0, len(board_ids), SCHEMA_BATCH_SIZE):
+        chunk = board_ids[start:start + SCHEMA_BATCH_SIZE]
+        query = f"""
+        query {{
+          boards (ids: [{", ".join(str(board_id) for board_id in chunk)}], limit: {len(chunk)}) {{
+            id
+            columns {{
+              id
+              title
+              type
+              settings_str
+            }}
+            groups {{
+              id
+              title
+            }}
+          }}
+        }}
+        """
+        data = make_request(query, api_token)
+        for board in ((data or {}).get("data") or {}).get("boards") or []:
+            schemas[str(board["id"])] = {"columns": board.get("columns", []), "groups": board.get("groups", [])}
+    return schemas
+
 @st.cache_data(ttl=3600)
-def get_user_map(api_token):
-    headers = {"Authorization": api_token}
-    query = """
-    query {
-      users {
-        id
-        name
-      }
-    }
-    """
-    response = requests.post(API_URL, json={"query": query}, headers=headers)
+def fetch_board_index(api_token):
+    return query_board_index(api_token)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_board_schemas(board_ids, api_token):
+    return query_board_schemas(board_ids, api_token)
+
+# Função para completar os quadros do índice com colunas e grupos, carregados
+# apenas para os quadros informados (em lotes, com ou sem cache)
+def load_board_schemas(boards, api_token, cached=True):
+    board_ids = tuple(str(board["id"]) for board in boards)
+    schemas = {}
+    for start in range(0, len(board_ids), SCHEMA_BATCH_SIZE):
+        chunk = board_ids[start:start + SCHEMA_BATCH_SIZE]
+        if cached:
+            schemas.update(fetch_board_schemas(chunk, api_token))
+        else:
+            schemas.update(query_board_schemas(chunk, api_token))
+    empty_schema = {"columns": [], "groups": []}
+    return [{**board, **schemas.get(str(board["id"]), empty_schema)} for board in boards]
+
+# Função para obter o rótulo do espaço de trabalho de um quadro
+def workspace_label(board):
+    workspace = board.get("workspace") or {}
+    return workspace.get("name") or MAIN_WORKSPACE_LABEL
+
+# Função para descartar quadros que não interessam antes de carregar colunas e itens:
+# arquivados ou excluídos, vazios, de outros espaços de trabalho ou sem alterações recentes
+def prune_boards(boards, skip_archived=False, skip_empty=False, workspaces=None, max_age_days=None):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days) if max_age_days else None
+    kept = []
+    for board in boards:
+        if skip_archived and board.get("state", "active") != "active":
+            continue
+        if skip_empty and board.get("items_count") == 0:
+            continue
+        if workspaces and workspace_label(board) not in workspaces:
+            continue
+        if cutoff is not None:
+            updated_at = parse_api_timestamp(board.get("updated_at"))
+            if updated_at is not None and updated_at < cutoff:
+                continue
+        kept.append(board)
+    return kept
+
+# Função para buscar todos os quadros, com colunas e grupos, diretamente da API
+def query_all_boards(api_token):
+    return load_board_schemas(query_board_index(api_token), api_token, cached=False)
+
+# Cache para funções que usamos repetidamente
+@st.cache_data(ttl=3600)
+def fetch_all_boards(api_token):
+    return load_board_schemas(fetch_board_index(api_token), api_token)
+
+# Diretório de usuários e equipes: usuários por página e equipes buscados sob demanda
+DIRECTORY_PAGE_SIZE = 200
+DIRECTORY_IDS_PER_REQUEST = 100
+DIRECTORY_WORKERS = 4
+
+# Validade dos nomes no diretório (segundos) e limite de entradas mantidas
+DIRECTORY_TTL = 6 * 3600
+DIRECTORY_MAX_ENTRIES = 100_000
+
+# Diretório de usuários e equipes de uma conta. Pode ser carregado por completo
+# (load_all, com as páginas de usuários buscadas em paralelo) ou resolver apenas os
+# IDs referenciados pelos itens (resolve), que é o que a busca de itens usa: com o
+# diretório frio, só os usuários e equipes que aparecem nos itens são buscados.
+# Entradas mais antigas que DIRECTORY_TTL são buscadas de novo quando referenciadas
+# e, acima de DIRECTORY_MAX_ENTRIES, as menos referenciadas recentemente saem.
+# Pode ser usado pelas threads de busca, por isso não chama funções de UI do Streamlit;
+# fora delas, os nomes são lidos por cópias tiradas com o lock (ver names).
+class UserDirectory:
+    def __init__(self, ttl=DIRECTORY_TTL, max_entries=DIRECTORY_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.users = {}  # ID do usuário -> nome
+        self.teams = {}  # ID da equipe -> nome
+        self.loaded_at = None
+        self.requests = 0
+        self.errors = 0
+        self._entries = OrderedDict()  # (tipo, ID) -> quando foi buscado, da menos para a mais referenciada
+        self._in_flight = set()
+        self._condition = threading.Condition()
     
-    if response.status_code != 200:
-        st.error(f"Erro ao buscar usuários: {response.status_code} - {response.text}")
-        return {}
+    # Cópias de {ID: nome} dos usuários e das equipes conhecidos
+    def names(self):
+        with self._condition:
+            return dict(self.users), dict(self.teams)
+    
+    def _is_fresh(self, key, now):
+        fetched_at = self._entries.get(key)
+        return fetched_at is not None and now - fetched_at < self.ttl
+    
+    # Grava nomes buscados (IDs ausentes da resposta ficam registrados sem nome,
+    # para não serem pedidos de novo a cada página); chamar com o lock
+    def _record(self, kind, names, requested_ids=(), fetched_at=None):
+        fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        target = self.users if kind == "person" else self.teams
+        for entity_id in requested_ids:
+            self._entries[(kind, entity_id)] = fetched_at
+            self._entries.move_to_end((kind, entity_id))
+        for entity_id, name in names.items():
+            target[entity_id] = name
+            self._entries[(kind, entity_id)] = fetched_at
+            self._entries.move_to_end((kind, entity_id))
+        while len(self._entries) > self.max_entries:
+            (old_kind, old_id), _ = self._entries.popitem(last=False)
+            (self.users if old_kind == "person" else self.teams).pop(old_id, None)
+    
+    # Nomes conhecidos de outra fonte (armazenamento local), usados enquanto não
+    # forem buscados de novo
+    def seed(self, user_map, team_map=None):
+        with self._condition:
+            self._record("person", {str(user_id): name for user_id, name in user_map.items() if str(user_id) not in self.users}, fetched_at=-self.ttl)
+            self._record("team", {str(team_id): name for team_id, name in (team_map or {}).items() if str(team_id) not in self.teams}, fetched_at=-self.ttl)
+    
+    def _query(self, query, api_token):
+        with self._condition:
+            self.requests += 1
+        data = make_request(query, api_token)
+        return (data or {}).get("data") or {}
+    
+    def _query_users_page(self, api_token, page):
+        query = f"""
+        query {{
+          users(limit: {DIRECTORY_PAGE_SIZE}, page: {page}) {{
+            id
+            name
+          }}
+        }}
+        """
+        return self._query(query, api_token).get("users") or []
+    
+    def _query_ids(self, api_token, person_ids, team_ids):
+        fields = []
+        if person_ids:
+            fields.append(f"users(ids: [{', '.join(person_ids)}], limit: {len(person_ids)}) {{ id name }}")
+        if team_ids:
+            fields.append(f"teams(ids: [{', '.join(team_ids)}]) {{ id name }}")
+        data = self._query("query { " + " ".join(fields) + " }", api_token)
+        return data.get("users") or [], data.get("teams") or []
+    
+    # Carrega todos os usuários e equipes, se o diretório não foi carregado há menos
+    # de DIRECTORY_TTL; as páginas de usuários são pedidas em ondas paralelas
+    def load_all(self, api_token, max_workers=DIRECTORY_WORKERS):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return self.names()[0]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            page = 1
+            while True:
+                pages = list(executor.map(lambda number: self._query_users_page(api_token, number), range(page, page + max_workers)))
+                with self._condition:
+                    for users in pages:
+                        self._record("person", {str(user["id"]): user["name"] for user in users})
+                if any(len(users) < DIRECTORY_PAGE_SIZE for users in pages):
+                    break
+                page += max_workers
         
-    data = response.json()
-    if data and "data" in data and "users" in data["data"]:
-        return {str(user["id"]): user["name"] for user in data["data"]["users"]}
-    return {}
+        teams = self._query("query { teams { id name } }", api_token).get("teams") or []
+        with self._condition:
+            self._record("team", {str(team["id"]): team["name"] for team in teams})
+            self.loaded_at = time.monotonic()
+        return self.names()[0]
+    
+    # Garante os nomes dos IDs informados, buscando só os ausentes ou vencidos. IDs que
+    # outra thread já está buscando não são pedidos de novo: a chamada espera por eles.
+    def resolve(self, api_token, person_ids=(), team_ids=()):
+        keys = {("person", str(entity_id)) for entity_id in person_ids} | {("team", str(entity_id)) for entity_id in team_ids}
+        if not keys:
+            return
+        with self._condition:
+            self._condition.wait_for(lambda: not (keys & self._in_flight))
+            now = time.monotonic()
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            missing = sorted(key for key in keys if not self._is_fresh(key, now))
+            self._in_flight.update(missing)
+        
+        try:
+            for start in range(0, len(missing), DIRECTORY_IDS_PER_REQUEST):
+                chunk = missing[start:start + DIRECTORY_IDS_PER_REQUEST]
+                persons = [entity_id for kind, entity_id in chunk if kind == "person"]
+                teams = [entity_id for kind, entity_id in chunk if kind == "team"]
+                try:
+                    users, found_teams = self._query_ids(api_token, persons, teams)
+                except MondayAPIError:
+                    with self._condition:
+                        self.errors += 1
+                    continue
+                with self._condition:
+                    self._record("person", {str(user["id"]): user["name"] for user in users}, persons)
+                    self._record("team", {str(team["id"]): team["name"] for team in found_teams}, teams)
+        finally:
+            with self._condition:
+                self._in_flight.difference_update(missing)
+                self._condition.notify_all()
+    
+    # Resolve os usuários e equipes citados nas colunas de pessoas de uma página de itens
+    def resolve_items(self, api_token, items, column_ids):
+        person_ids, team_ids = set(), set()
+        for item in items:
+            for column_value in item.get("column_values", []):
+                if column_value["id"] not in column_ids or not column_value.get("value"):
+                    continue
+                try:
+                    entries = json_loads(column_value["value"]).get("personsAndTeams") or []
+                except (ValueError, AttributeError):
+                    continue
+                for entry in entries:
+                    if entry.get("kind") == "person":
+                        person_ids.add(str(entry.get("id")))
+                    elif entry.get("kind") == "team":
+                        team_ids.add(str(entry.get("id")))
+        self.resolve(api_token, person_ids, team_ids)
 
-@st.cache_data(ttl=3600)
-def extract_status_maps(boards):
+# Diretório único por token, compartilhado por todas as sessões do servidor
+@st.cache_resource
+def get_user_directory(api_token):
+    return UserDirectory()
+
+# Mapa {ID: nome} de todos os usuários da conta (carrega o diretório por completo)
+def get_user_map(api_token):
+    return get_user_directory(api_token).load_all(api_token)
+
+# Mapeamentos de status {coluna: {índice: rótulo}} de todos os quadros, a partir dos
+# esquemas compilados (ver BoardSchemaCache); plans evita buscar os esquemas de novo
+def extract_status_maps(boards, plans=None):
     status_labels_map = {}
     
-    for board in boards:
-        for column in board.get("columns", []):
-            if column["type"] == "status" and column.get("settings_str"):
-                try:
-                    settings = json.loads(column["settings_str"])
-                    if "labels" in settings:
-                        # Criar mapeamento de índice para rótulo
-                        column_map = {}
-                        for index, label in enumerate(settings["labels"]):
-                            if isinstance(label, dict) and "name" in label:
-                                column_map[str(index)] = label["name"]
-                            elif isinstance(label, str):
-                                column_map[str(index)] = label
-                        
-                        if column_map:
-                            status_labels_map[column["id"]] = column_map
-                except (json.JSONDecodeError, Exception) as e:
-                    st.warning(f"Erro ao extrair configurações de status para coluna {column['id']}: {str(e)}")
+    for plan in plans if plans is not None else get_schema_cache().plans(boards):
+        status_labels_map.update(plan["status_labels"])
+        for column_id, error in plan["errors"]:
+            st.warning(f"Erro ao extrair configurações de status para coluna {column_id}: {error}")
     
     return status_labels_map
 
@@ -155,14 +488,11 @@ def get_all_status_values(boards, status_labels_map):
     return sorted(list(all_status))
 
 # Função para fazer a chamada à API do Monday
-def make_request(query, api_token):
-    headers = {"Authorization": api_token}
-    response = requests.post(API_URL, json={"query": query}, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error(f"Erro na API: {response.status_code} - {response.text}")
-        return None
+# Todas as consultas passam pelo agendador, que respeita o orçamento de complexidade
+# e repete a requisição em caso de limite de taxa; erros definitivos levantam MondayAPIError.
+# decode converte o corpo bruto da resposta (ver RequestScheduler._send)
+def make_request(query, api_token, estimated_cost=0, decode=None):
+    return get_scheduler(api_token).execute(query, estimated_cost, decode)
 
 # Função para identificar colunas específicas com base em tipo e título
 def identify_column(columns, column_type, possible_titles):
@@ -174,224 +504,621 @@ def identify_column(columns, column_type, possible_titles):
             return column
     return None
 
-# Função ajustada para extrair valores de coluna
-def extract_column_value(column_id, column_type, column_values, status_labels_map):
-    if not column_id or column_id not in column_values:
-        return f"No {column_type}"
-    
-    value = column_values[column_id].get("value")
-    text = column_values[column_id].get("text", "")
-    
-    # Se não houver valor, usar texto se disponível
-    if not value:
-        return text if text else f"No {column_type}"
-    
-    # Tratamento específico para cada tipo de coluna
-    if column_type == "status":
-        # Mapeamento fixo de status
-        status_mapping = {
-            "0": "Em Andamento",
-            "1": "Feito",
-            "2": "Parado"
-        }
-        
-        try:
-            parsed_value = json.loads(value)
-            
-            # Caso 1: Formato padrão do Monday com index
-            if isinstance(parsed_value, dict) and "index" in parsed_value:
-                index = str(parsed_value.get("index"))
-                
-                # Verificar se o índice está no mapeamento fixo (prioridade)
-                if index in status_mapping:
-                    return status_mapping[index]
-                
-                # Caso contrário, verificar se temos um mapeamento no status_labels_map
-                if column_id in status_labels_map and index in status_labels_map[column_id]:
-                    return status_labels_map[column_id][index]
-                
-                # Se não houver mapeamento, usar o texto se disponível
-                return text if text else f"Status {index}"
-            
-            # Caso 2: Formato com label explícito
-            elif isinstance(parsed_value, dict) and "label" in parsed_value:
-                if isinstance(parsed_value["label"], dict):
-                    return parsed_value["label"].get("text", text if text else f"No {column_type}")
-                return str(parsed_value["label"])
-            
-            # Caso 3: Outros formatos (como múltiplas alterações)
-            elif re.search(r'\{.*?\}\{.*?\}', value):
-                # Extrair o último status com changed_at
-                matches = re.findall(r'\{.*?"index":\s*(\d+).*?"changed_at":\s*"([^"]+)".*?\}', value)
-                if matches:
-                    # Ordenar por data e pegar o mais recente
-                    matches.sort(key=lambda x: x[1], reverse=True)
-                    latest_index = matches[0][0]
-                    
-                    # Verificar se o índice está no mapeamento fixo (prioridade)
-                    if latest_index in status_mapping:
-                        return status_mapping[latest_index]
-                    
-                    # Caso contrário, verificar se temos um mapeamento no status_labels_map
-                    if column_id in status_labels_map and latest_index in status_labels_map[column_id]:
-                        return status_labels_map[column_id][latest_index]
+# Títulos usados para reconhecer as colunas de pessoas, data e status
+PERSON_COLUMN_TITLES = ["Pessoas", "Responsável", "Assignee", "Owner", "people", "responsible", "assignee", "owner", "Pessoa"]
+DATE_COLUMN_TITLES = ["Data", "Deadline", "Due Date", "Prazo", "date", "deadline", "due date", "prazo", "PRAZO"]
+STATUS_COLUMN_TITLES = ["Status", "Estado", "status", "state", "STATUS"]
+
+# Número máximo de esquemas compilados guardados no armazenamento local
+SCHEMA_CACHE_MAX_ENTRIES = 5000
+
+# Função para calcular o hash do esquema de um quadro (colunas e grupos); quadros
+# com o mesmo esquema, como os criados do mesmo modelo, compartilham o plano compilado
+def board_schema_hash(board):
+    payload = {
+        "columns": [[column["id"], column["title"], column["type"], column.get("settings_str")] for column in board.get("columns", [])],
+        "groups": [[group["id"], group["title"]] for group in board.get("groups", [])],
+    }
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+# Função para compilar o esquema de um quadro no plano usado pela normalização:
+# colunas de pessoas, data e status identificadas, tabelas índice -> rótulo das colunas
+# de status, mapa de grupos e os erros encontrados nas configurações de status
+def compile_board_schema(board):
+    columns = board.get("columns", [])
+    person_column = identify_column(columns, "people", PERSON_COLUMN_TITLES)
+    date_column = identify_column(columns, "date", DATE_COLUMN_TITLES)
+    status_column = identify_column(columns, "status", STATUS_COLUMN_TITLES)
+
+    status_labels = {}
+    errors = []
+    for column in columns:
+        if column["type"] == "status" and column.get("settings_str"):
+            try:
+                settings = json.loads(column["settings_str"])
+                if "labels" in settings:
+                    # Criar mapeamento de índice para rótulo
+                    labels = {}
+                    for index, label in enumerate(settings["labels"]):
+                        if isinstance(label, dict) and "name" in label:
+                            labels[str(index)] = label["name"]
+                        elif isinstance(label, str):
+                            labels[str(index)] = label
                     
-                    return text if text else f"Status {latest_index}"
-            
-            # Caso padrão: usar o texto ou valor bruto
-            return text if text else str(parsed_value)
-                
-        except json.JSONDecodeError:
-            # Se o valor não for JSON, usar o texto ou tratar como valor direto
-            if text and text != "":
-                return text
-            return f"No {column_type}"
-    
-    elif column_type == "date":
-        try:
-            parsed_value = json.loads(value)
-            if isinstance(parsed_value, dict) and "date" in parsed_value:
-                return parsed_value["date"]
-            return text if text else str(parsed_value)
-        except json.JSONDecodeError:
-            return text if text else f"No {column_type}"
-    
-    elif column_type == "person":
-        try:
-            parsed_value = json.loads(value)
-            if isinstance(parsed_value, dict) and "personsAndTeams" in parsed_value:
-                persons = []
-                for person in parsed_value["personsAndTeams"]:
-                    if person.get("kind") == "person":
-                        persons.append(str(person.get("id", "")))
-                return ",".join(persons)
-            return text if text else f"No {column_type}"
-        except json.JSONDecodeError:
-            return text if text else f"No {column_type}"
-    
+                    if labels:
+                        status_labels[column["id"]] = labels
+            except Exception as e:
+                errors.append((column["id"], str(e)))
+
+    return {
+        "person_column_id": person_column["id"] if person_column else None,
+        "date_column_id": date_column["id"] if date_column else None,
+        "status_column_id": status_column["id"] if status_column else None,
+        "status_labels": status_labels,
+        "group_map": {group["id"]: group["title"] for group in board.get("groups", [])},
+        "errors": errors,
+    }
+
+# Cache de esquemas compilados, indexado pelo hash do esquema: o plano de um quadro só
+# é compilado de novo quando suas colunas ou grupos mudam. Os planos novos são gravados
+# no armazenamento local, para sobreviver a reinícios do servidor.
+class BoardSchemaCache:
+    def __init__(self, store=None):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._plans = store.load_schema_plans() if store is not None else {}
+        self._pending = {}
+
+    def plan(self, board):
+        key = board_schema_hash(board)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self.hits += 1
+                return plan
+        plan = compile_board_schema(board)
+        with self._lock:
+            self.misses += 1
+            self._plans[key] = plan
+            self._pending[key] = plan
+        return plan
+
+    # Planos de vários quadros, na mesma ordem, gravando de uma vez os recém-compilados
+    def plans(self, boards):
+        plans = [self.plan(board) for board in boards]
+        self.flush()
+        return plans
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending and self.store is not None:
+            self.store.save_schema_plans(pending)
+
+# Cache único de esquemas, compartilhado por todas as sessões do servidor
+@st.cache_resource
+def get_schema_cache(path=STORE_PATH):
+    return BoardSchemaCache(get_item_store(path))
+
+# Função para identificar as colunas usadas pelo dashboard em um quadro, a partir do
+# esquema compilado, incluindo colunas adicionais pedidas pelo usuário (por ID ou título)
+def resolve_column_map(board, extra_columns=None, plan=None):
+    columns = board.get("columns", [])
+    plan = plan or get_schema_cache().plan(board)
+
+    extra = []
+    wanted = {name.strip().lower() for name in (extra_columns or []) if name.strip()}
+    for column in columns:
+        if column["id"].lower() in wanted or column["title"].lower() in wanted:
+            extra.append({"id": column["id"], "title": column["title"], "type": column["type"]})
+
+    return {
+        "person_column_id": plan["person_column_id"],
+        "date_column_id": plan["date_column_id"],
+        "status_column_id": plan["status_column_id"],
+        "extra_columns": extra,
+    }
+
+# Função para listar os IDs de coluna que precisam ser baixados para um quadro
+def projected_column_ids(column_map):
+    column_ids = {
+        column_map.get("person_column_id"),
+        column_map.get("date_column_id"),
+        column_map.get("status_column_id"),
+    }
+    column_ids.update(column["id"] for column in column_map.get("extra_columns", []))
+    column_ids.discard(None)
+    return tuple(sorted(column_ids))
+
+# Função para listar os IDs das colunas de pessoas de um quadro (a identificada e as
+# adicionais do tipo pessoas), sem a coluna ausente dos quadros que não têm uma
+def people_column_ids(column_map):
+    column_ids = {column_map.get("person_column_id")}
+    column_ids.update(column["id"] for column in column_map.get("extra_columns", []) if column["type"] == "people")
+    column_ids.discard(None)
+    return column_ids
+
+# Função para montar os campos buscados para cada item; com column_ids,
+# apenas as colunas informadas são baixadas (None baixa todas as colunas)
+def item_fields(column_ids=None):
+    if column_ids is None:
+        column_filter = ""
+    elif not column_ids:
+        column_filter = None
     else:
+        column_filter = "(ids: [" + ", ".join(json.dumps(column_id) for column_id in column_ids) + "])"
+
+    fields = """
+    id
+    name
+    group {
+      id
+      title
+    }"""
+    if column_filter is not None:
+        fields += f"""
+    column_values{column_filter} {{
+      id
+      value
+      text
+    }}"""
+    return fields + "\n"
+
+# Gerador das páginas de itens de vários quadros: a primeira página de todos os
+# quadros vem em uma única consulta boards(ids: [...]) e os quadros com mais itens
+# continuam via next_items_page, com vários cursores por requisição.
+# Produz (board_id, itens da página, quadro concluído) à medida que as páginas chegam.
+# query_params (GraphQL) filtra os itens no servidor; o filtro segue nos cursores.
+# Com decode_pages, que recebe {chave da página: board_id} (ID do quadro ou alias page_i)
+# e devolve a função de decodificação da resposta, os itens vêm como DecodedPage.
+# Pode ser executada em threads auxiliares, por isso não chama funções de UI do Streamlit
+def iter_items_batch(board_ids, api_token, limit=None, column_ids=None, query_params=None, decode_pages=None):
+    scheduler = get_scheduler(api_token)
+    fields = item_fields(column_ids)
+    params_field = f", query_params: {query_params}" if query_params else ""
+    board_ids = [str(board_id) for board_id in board_ids]
+    ids = ", ".join(board_ids)
+    limit = min(limit or ITEMS_PAGE_MAX_LIMIT, scheduler.items_page_limit())
+
+    # Primeira página de todos os quadros
+    decode = decode_pages({board_id: board_id for board_id in board_ids}) if decode_pages else None
+    while True:
+        query = f"""
+        query {{
+          boards(ids: [{ids}], limit: {len(board_ids)}) {{
+            id
+            items_page(limit: {limit}{params_field}) {{
+              cursor
+              items {{{fields}}}
+            }}
+          }}
+        }}
+        """
+        total_limit = limit * len(board_ids)
         try:
-            parsed_value = json.loads(value)
-            if isinstance(parsed_value, dict):
-                for key in ["text", "label", "value", "name"]:
-                    if key in parsed_value:
-                        if isinstance(parsed_value[key], dict):
-                            return parsed_value[key].get("text", str(parsed_value[key]))
-                        return str(parsed_value[key])
-                return text if text else str(parsed_value)
+            data = make_request(query, api_token, scheduler.estimate_items_page_cost(total_limit), decode)
+            break
+        except MondayQueryTooComplexError:
+            if limit <= ITEMS_PAGE_MIN_LIMIT:
+                raise
+            limit = max(ITEMS_PAGE_MIN_LIMIT, limit // 2)
+
+    boards = ((data or {}).get("data") or {}).get("boards") or []
+    if boards:
+        complexity = data["data"].get("complexity") or {}
+        scheduler.record_items_page_cost(total_limit, complexity.get("query"))
+
+    cursors = {}
+    returned_ids = set()
+    for board in boards:
+        board_id = str(board["id"])
+        returned_ids.add(board_id)
+        items_page = board.get("items_page") or {}
+        if items_page.get("cursor"):
+            cursors[board_id] = items_page["cursor"]
+        yield board_id, items_page.get("items", []), board_id not in cursors
+
+    # Quadros ausentes da resposta terminam sem itens
+    for board_id in board_ids:
+        if board_id not in returned_ids:
+            yield board_id, [], True
+
+    # Páginas seguintes: um alias de next_items_page por cursor pendente
+    while cursors:
+        limit = scheduler.items_page_limit()
+        per_request = max(1, min(MAX_BOARDS_PER_BATCH, scheduler.items_per_request() // limit))
+        pending = list(cursors.items())[:per_request]
+        pages = "\n".join(
+            f"""
+          page_{index}: next_items_page(limit: {limit}, cursor: "{cursor}") {{
+            cursor
+            items {{{fields}}}
+          }}"""
+            for index, (_, cursor) in enumerate(pending)
+        )
+        query = f"""
+        query {{{pages}
+        }}
+        """
+        total_limit = limit * len(pending)
+        decode = decode_pages({f"page_{index}": board_id for index, (board_id, _) in enumerate(pending)}) if decode_pages else None
+        try:
+            data = make_request(query, api_token, scheduler.estimate_items_page_cost(total_limit), decode)
+        except MondayQueryTooComplexError:
+            if len(pending) == 1 and limit <= ITEMS_PAGE_MIN_LIMIT:
+                raise
+            scheduler.record_items_page_cost(limit, MAX_QUERY_COMPLEXITY)
+            continue
+
+        if not data or not data.get("data"):
+            for board_id in list(cursors):
+                del cursors[board_id]
+                yield board_id, [], True
+            break
+
+        complexity = data["data"].get("complexity") or {}
+        scheduler.record_items_page_cost(total_limit, complexity.get("query"))
+
+        for index, (board_id, _) in enumerate(pending):
+            items_page = data["data"].get(f"page_{index}") or {}
+            if items_page.get("cursor"):
+                cursors[board_id] = items_page["cursor"]
             else:
-                return str(parsed_value)
-        except json.JSONDecodeError:
-            return text if text else value
-
-# Função para buscar todos os itens de um quadro usando items_page com paginação
-@st.cache_data(ttl=1800)
-def fetch_items(board_id, api_token):
-    all_items = []
-    cursor = None
-    limit = 500  # Máximo permitido por chamada
-    headers = {"Authorization": api_token}
-
-    with st.spinner(f"Carregando itens do quadro {board_id}..."):
-        while True:
-            cursor_field = f', cursor: "{cursor}"' if cursor else ""
-            query = f"""
-            query {{
-              boards(ids: [{board_id}]) {{
-                items_page(limit: {limit}{cursor_field}) {{
-                  cursor
-                  items {{
-                    id
-                    name
-                    group {{
-                      id
-                      title
-                    }}
-                    column_values {{
-                      id
-                      value
-                      text
-                    }}
-                  }}
-                }}
-              }}
-            }}
-            """
-            response = requests.post(API_URL, json={"query": query}, headers=headers)
-            
-            if response.status_code != 200:
-                st.error(f"Erro ao buscar itens: {response.status_code} - {response.text}")
-                break
-                
-            data = response.json()
-            if not data or "data" not in data or "boards" not in data["data"] or not data["data"]["boards"]:
-                break
+                del cursors[board_id]
+            yield board_id, items_page.get("items", []), board_id not in cursors
 
-            items_page = data["data"]["boards"][0]["items_page"]
-            items = items_page.get("items", [])
-            all_items.extend(items)
-            cursor = items_page.get("cursor")
+# Função para buscar todos os itens de vários quadros de uma vez (ver iter_items_batch)
+def query_items_batch(board_ids, api_token, limit=None, column_ids=None, query_params=None):
+    items_by_board = {str(board_id): [] for board_id in board_ids}
+    for board_id, items, _ in iter_items_batch(board_ids, api_token, limit, column_ids, query_params):
+        items_by_board[board_id].extend(items)
+    return items_by_board
 
-            if not cursor:  # Se não houver mais cursor, terminamos
-                break
+# Versão com cache de query_items_batch usada pela busca completa
+@st.cache_data(ttl=1800, show_spinner=False)
+def fetch_items_batch(board_ids, api_token, limit=None, column_ids=None, query_params=None):
+    return query_items_batch(board_ids, api_token, limit, column_ids, query_params)
+
+# Função para buscar todos os itens de um quadro
+def fetch_items(board_id, api_token, column_ids=None):
+    return fetch_items_batch((str(board_id),), api_token, column_ids=column_ids)[str(board_id)]
+
+# Função para agrupar quadros pequenos em lotes buscados com uma única consulta.
+# Cada lote respeita BATCH_ITEMS_TARGET considerando o limite de página aplicado a
+# todos os quadros do lote; quadros grandes ou sem contagem ficam sozinhos.
+def plan_board_batches(boards, batch_boards=True):
+    if not batch_boards:
+        return [([index], None) for index in range(len(boards))]
 
-    return all_items
+    def items_count(index):
+        count = boards[index].get("items_count")
+        return count if isinstance(count, int) else None
+
+    batches = []
+    current = []
+    current_max = 0
+    candidates = []
+    for index in range(len(boards)):
+        count = items_count(index)
+        if count is None or count > BATCH_ITEMS_TARGET:
+            batches.append(([index], None))
+        else:
+            candidates.append(index)
+
+    for index in sorted(candidates, key=items_count):
+        count = max(1, items_count(index))
+        if current and (len(current) >= MAX_BOARDS_PER_BATCH or (len(current) + 1) * count > BATCH_ITEMS_TARGET):
+            batches.append((current, current_max))
+            current, current_max = [], 0
+        current.append(index)
+        current_max = max(current_max, count)
+    if current:
+        batches.append((current, current_max))
+
+    return batches
+
+# Regras de query_params que reproduzem no servidor os filtros de data e de status
+# de process_dates_and_add_urgency para um quadro. O filtro de status vira os índices
+# cujo rótulo (pelas mesmas regras de status_label) está entre os desconsiderados;
+# valores que não vêm por índice continuam sendo filtrados depois, no cliente.
+def pushdown_rules(column_map, status_labels_map, start_date=None, end_date=None, excluded_status=None):
+    rules = []
+    date_column_id = column_map["date_column_id"]
+    if start_date and end_date and date_column_id:
+        start, end = pd.Timestamp(start_date).strftime("%Y-%m-%d"), pd.Timestamp(end_date).strftime("%Y-%m-%d")
+        rules.append(f'{{column_id: {json.dumps(date_column_id)}, compare_value: ["{start}", "{end}"], operator: between}}')
+    
+    status_column_id = column_map["status_column_id"]
+    if excluded_status and status_column_id:
+        excluded = set(excluded_status)
+        candidates = set(STATUS_MAPPING) | set(status_labels_map.get(status_column_id, {}))
+        indexes = sorted(
+            int(index) for index in candidates
+            if index.isdigit() and status_label(status_column_id, index, "", status_labels_map) in excluded
+        )
+        if indexes:
+            compare_value = ", ".join(str(index) for index in indexes)
+            rules.append(f'{{column_id: {json.dumps(status_column_id)}, compare_value: [{compare_value}], operator: not_any_of}}')
+    
+    return tuple(rules)
 
-# Função para processar um item e extrair os campos desejados
-def process_item(item, board_data, user_map, column_map, status_labels_map):
-    group_map = {g["id"]: g["title"] for g in board_data.get("groups", [])}
-    column_values = {cv["id"]: cv for cv in item.get("column_values", [])}
+# Monta o argumento query_params de items_page a partir das regras de pushdown_rules
+def rules_query_params(rules):
+    if not rules:
+        return None
+    return "{rules: [" + ", ".join(rules) + "], operator: and}"
 
-    # Nome do item
-    name = item.get("name", "No name")
+# Função para converter as datas ISO 8601 da API em datetime com fuso horário
+def parse_api_timestamp(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
-    # Grupo
-    group_id = item["group"]["id"] if item.get("group") else None
-    group = group_map.get(group_id, "No group") if group_id else "No group"
+# Função para buscar os IDs de itens removidos de um quadro (excluídos, arquivados
+# ou movidos) desde a última sincronização, a partir do log de atividades
+def fetch_removed_item_ids(board_id, api_token, since):
+    removed_ids = set()
+    page = 1
+    limit = 1000
 
-    # Quadro
-    board = board_data.get("name", "No board")
+    while True:
+        query = f"""
+        query {{
+          boards(ids: [{board_id}]) {{
+            activity_logs(from: "{since.isoformat()}", limit: {limit}, page: {page}) {{
+              event
+              data
+            }}
+          }}
+        }}
+        """
+        data = make_request(query, api_token)
+        boards = (data.get("data") or {}).get("boards") or []
+        logs = boards[0].get("activity_logs") or [] if boards else []
 
-    # Pessoas
-    person_column_id = column_map.get("person_column_id")
-    persons = []
-    if person_column_id and person_column_id in column_values:
-        value = column_values[person_column_id].get("value")
-        if value:
+        for log in logs:
+            if log.get("event") not in REMOVED_ITEM_EVENTS:
+                continue
             try:
-                parsed_value = json.loads(value)
-                if isinstance(parsed_value, dict) and "personsAndTeams" in parsed_value:
-                    for user in parsed_value["personsAndTeams"]:
-                        if user.get("kind") == "person":
-                            user_id = str(user.get("id", ""))
-                            persons.append(user_map.get(user_id, f"Unknown User {user_id}"))
+                log_data = json.loads(log.get("data") or "{}")
             except json.JSONDecodeError:
-                # Para casos onde o valor não é um JSON válido
-                text_value = column_values[person_column_id].get("text", "")
-                if text_value:
-                    persons.append(text_value)
-    persons = ", ".join(persons) if persons else "No person"
+                continue
+            if log_data.get("pulse_id") is not None:
+                removed_ids.add(str(log_data["pulse_id"]))
+            for pulse_id in log_data.get("pulse_ids") or []:
+                removed_ids.add(str(pulse_id))
 
-    # Data - usando a função genérica
-    date_column_id = column_map.get("date_column_id")
-    date = extract_column_value(date_column_id, "date", column_values, status_labels_map)
+        if len(logs) < limit:
+            break
+        page += 1
 
-    # Status - usando a função genérica
-    status_column_id = column_map.get("status_column_id")
-    status = extract_column_value(status_column_id, "status", column_values, status_labels_map)
+    return removed_ids
+
+# Função para buscar apenas as alterações de um quadro desde a última sincronização:
+# itens atualizados (filtro __last_updated__, com granularidade de dia) e itens removidos
+def fetch_board_changes(board_id, api_token, since, column_ids=None):
+    query_params = (
+        '{rules: [{column_id: "__last_updated__", '
+        f'compare_value: ["EXACT", "{since.date().isoformat()}"], '
+        'operator: greater_than_or_equals, compare_attribute: "UPDATED_AT"}]}'
+    )
+    items = query_items_batch((str(board_id),), api_token, column_ids=column_ids, query_params=query_params)[str(board_id)]
+    removed_ids = fetch_removed_item_ids(board_id, api_token, since)
+    return items, removed_ids
 
-    # Item ID para rastreabilidade
-    item_id = item.get("id", "No ID")
+# Versão do formato dos itens guardados no armazenamento local; faz parte da assinatura
+# dos quadros, então quadros gravados em outro formato são buscados por completo
+STORE_ITEM_FORMAT = 3
 
-    return {
-        "id": item_id,
-        "name": name,
-        "group": group,
-        "board": board,
-        "persons": persons,
-        "date": date,
-        "status": status
+# Função para calcular a assinatura das regras de normalização de um quadro; se mudar
+# (colunas identificadas, rótulos de status ou grupos), o quadro é buscado por completo.
+# Os nomes das pessoas não entram: os itens guardam só os IDs (ver ItemStore).
+def board_signature(column_map, status_labels_map, group_map=None):
+    status_column_id = column_map.get("status_column_id")
+    payload = {
+        "format": STORE_ITEM_FORMAT,
+        "columns": column_map,
+        "status_labels": status_labels_map.get(status_column_id, {}),
+        "groups": group_map or {},
     }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+# Armazenamento local persistente (SQLite) de quadros, usuários, equipes e itens normalizados.
+# Cada quadro guarda o momento da última sincronização, usado para buscar apenas as alterações.
+# Os itens guardam as pessoas pela chave de referências (PERSON_IDS_COLUMN); os nomes
+# são resolvidos na leitura, então renomear um usuário não exige buscar os itens de novo.
+class ItemStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS boards (id TEXT PRIMARY KEY, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY, name TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS teams (id TEXT PRIMARY KEY, name TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY, board_id TEXT NOT NULL, data TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS items_board_id ON items (board_id);
+            CREATE TABLE IF NOT EXISTS board_sync (board_id TEXT PRIMARY KEY, synced_at TEXT NOT NULL, signature TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS board_schemas (hash TEXT PRIMARY KEY, plan TEXT NOT NULL, compiled_at TEXT NOT NULL);
+            """)
+
+    def save_boards(self, boards):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM boards")
+            self._conn.executemany(
+                "INSERT INTO boards (id, data) VALUES (?, ?)",
+                [(str(board["id"]), json.dumps(board)) for board in boards]
+            )
+
+    def load_boards(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM boards").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def save_users(self, user_map, team_map=None):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM users")
+            self._conn.executemany("INSERT INTO users (id, name) VALUES (?, ?)", list(user_map.items()))
+            if team_map is not None:
+                self._conn.execute("DELETE FROM teams")
+                self._conn.executemany("INSERT INTO teams (id, name) VALUES (?, ?)", list(team_map.items()))
+
+    def load_users(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT id, name FROM users").fetchall())
+
+    def load_teams(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT id, name FROM teams").fetchall())
+
+    # Planos compilados de esquemas de quadros, {hash: plano}
+    def load_schema_plans(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT hash, plan FROM board_schemas").fetchall()
+        return {key: json.loads(plan) for key, plan in rows}
+
+    # Grava planos recém-compilados, mantendo apenas os SCHEMA_CACHE_MAX_ENTRIES mais recentes
+    def save_schema_plans(self, plans):
+        compiled_at = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO board_schemas (hash, plan, compiled_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(plan, ensure_ascii=False), compiled_at) for key, plan in plans.items()]
+            )
+            self._conn.execute(
+                "DELETE FROM board_schemas WHERE hash NOT IN (SELECT hash FROM board_schemas ORDER BY compiled_at DESC LIMIT ?)",
+                (SCHEMA_CACHE_MAX_ENTRIES,)
+            )
+
+    # Retorna {board_id: (synced_at, signature)} de todos os quadros já sincronizados
+    def board_sync_states(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT board_id, synced_at, signature FROM board_sync").fetchall()
+        return {board_id: (parse_api_timestamp(synced_at), signature) for board_id, synced_at, signature in rows}
+
+    # Substitui todos os itens de um quadro (sincronização completa)
+    def replace_board_items(self, board_id, items, signature, synced_at):
+        board_id = str(board_id)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items WHERE board_id = ?", (board_id,))
+            self._upsert_items(board_id, items)
+            self._set_synced(board_id, signature, synced_at)
+
+    # Aplica as alterações de um quadro (sincronização incremental)
+    def apply_board_changes(self, board_id, items, removed_ids, signature, synced_at):
+        board_id = str(board_id)
+        with self._lock, self._conn:
+            self._upsert_items(board_id, items)
+            self._conn.executemany(
+                "DELETE FROM items WHERE id = ? AND board_id = ?",
+                [(str(item_id), board_id) for item_id in removed_ids]
+            )
+            self._set_synced(board_id, signature, synced_at)
+
+    # Remove itens e estado de quadros que não existem mais na conta; board_ids deve ser
+    # o índice completo de quadros, não só os que passaram pelos filtros da busca
+    def remove_missing_boards(self, board_ids):
+        board_ids = [str(board_id) for board_id in board_ids]
+        placeholders = ", ".join("?" for _ in board_ids) or "NULL"
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM items WHERE board_id NOT IN ({placeholders})", board_ids)
+            self._conn.execute(f"DELETE FROM board_sync WHERE board_id NOT IN ({placeholders})", board_ids)
+
+    # Itens normalizados guardados (sem os nomes das pessoas, ver resolve_persons),
+    # de todos os quadros ou só dos quadros informados
+    def load_items(self, board_ids=None):
+        with self._lock:
+            if board_ids is None:
+                rows = self._conn.execute("SELECT data FROM items").fetchall()
+            else:
+                board_ids = [str(board_id) for board_id in board_ids]
+                placeholders = ", ".join("?" for _ in board_ids) or "NULL"
+                rows = self._conn.execute(f"SELECT data FROM items WHERE board_id IN ({placeholders})", board_ids).fetchall()
+        return pd.DataFrame.from_records([json_loads(data) for (data,) in rows])
+
+    # Grava as linhas de um DataFrame de itens normalizados; nomes de pessoas não são guardados
+    def _upsert_items(self, board_id, items):
+        items = items.drop(columns=["persons", PERSON_NAMES_COLUMN], errors="ignore")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO items (id, board_id, data) VALUES (?, ?, ?)",
+            [(str(item["id"]), board_id, json.dumps(item, ensure_ascii=False)) for item in items.to_dict("records")]
+        )
+
+    def _set_synced(self, board_id, signature, synced_at):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO board_sync (board_id, synced_at, signature) VALUES (?, ?, ?)",
+            (board_id, synced_at.isoformat(), signature)
+        )
+
+# Armazenamento único por arquivo, compartilhado por todas as sessões do servidor
+@st.cache_resource
+def get_item_store(path=STORE_PATH):
+    return ItemStore(path)
+
+# Formatos alternativos tentados quando a data não é reconhecida automaticamente
+DATE_FORMATS = ['%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%m-%d-%Y']
+
+# Fuso horário no fim de uma data com hora ("...T23:00:00-03:00", "... 10:00Z"), retirado
+# antes da conversão para manter a data e a hora locais, como no texto original
+TIMEZONE_SUFFIX = r"(\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)\s*(?:Z|UTC|GMT|[+-]\d{2}:?\d{2})$"
+
+# Função para descartar o fuso horário de datas convertidas, mantendo a hora local
+def local_datetimes(converted):
+    if isinstance(converted.dtype, pd.DatetimeTZDtype):
+        return converted.dt.tz_localize(None)
+    if converted.dtype == object:
+        converted = converted.map(lambda value: value.tz_localize(None) if isinstance(value, pd.Timestamp) and value.tzinfo else value)
+    return converted.astype("datetime64[ns]")
+
+# Função para converter uma coluna de datas em texto para datetime de forma vetorizada.
+# Cada valor distinto é convertido uma única vez: primeiro ISO 8601 (formato do Monday),
+# depois inferência por valor e, por fim, os formatos de DATE_FORMATS, em lote.
+# Datas com fuso horário ficam com a data e a hora locais (sem conversão para UTC).
+def parse_dates(date_series):
+    codes, uniques = pd.factorize(date_series)
+    values = pd.Series(uniques, dtype=object)
+
+    # Valores vazios, "No date" ou que não são texto ficam sem data
+    is_text = values.map(lambda value: isinstance(value, str))
+    valid = is_text & (values.str.len() > 0) & ~values.str.startswith("No ", na=False)
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    pending = values[valid]
+
+    for fmt in ["ISO8601", "mixed"] + DATE_FORMATS:
+        if pending.empty:
+            break
+        candidates = pending.str.replace(TIMEZONE_SUFFIX, r"\1", regex=True) if fmt in ("ISO8601", "mixed") else pending
+        converted = local_datetimes(pd.to_datetime(candidates, format=fmt, errors="coerce"))
+        found = converted.notna()
+        parsed[found[found].index] = converted[found]
+        pending = pending[~found]
+
+    result = parsed.to_numpy().take(codes)
+    result[codes == -1] = np.datetime64("NaT")
+    return pd.Series(result, index=date_series.index, dtype="datetime64[ns]")
+
+# Função para classificar a urgência dos itens de forma vetorizada:
+# "Atrasado" - até 30 dias atrasado; "Atenção" - até 15 dias à frente;
+# itens com status "Feito" ou sem data não são classificados
+def classify_urgency(dates, statuses, today):
+    days_diff = ((dates.dt.normalize() - pd.Timestamp(today)) / pd.Timedelta(days=1)).to_numpy()
+    has_date = dates.notna().to_numpy()
+    not_done = (statuses != "Feito").to_numpy()
+
+    with np.errstate(invalid="ignore"):
+        late = has_date & not_done & (days_diff <= 0) & (days_diff >= -30)
+        attention = has_date & not_done & (days_diff > 0) & (days_diff <= 15)
+
+    urgency = np.select([late, attention], np.array(["Atrasado", "Atenção"], dtype=object), default=None)
+    return pd.Series(urgency, index=dates.index, dtype=object)
 
 # Função ajustada para converter datas e adicionar classificação de urgência
 def process_dates_and_add_urgency(df, start_date=None, end_date=None, excluded_status=None):
@@ -401,28 +1128,8 @@ def process_dates_and_add_urgency(df, start_date=None, end_date=None, excluded_s
     # Criar uma cópia do DataFrame
     df_processed = df.copy()
     
-    # Função auxiliar para converter data de string para objeto date
-    def safe_date_conversion(date_str):
-        if not date_str or date_str.startswith('No ') or not isinstance(date_str, str):
-            return pd.NaT
-        
-        try:
-            # Tentar conversão direta (formato YYYY-MM-DD esperado)
-            return pd.to_datetime(date_str)
-        except:
-            try:
-                # Tentar outros formatos comuns
-                for fmt in ['%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%m-%d-%Y']:
-                    try:
-                        return pd.to_datetime(date_str, format=fmt)
-                    except:
-                        continue
-                return pd.NaT
-            except:
-                return pd.NaT
-    
     # Adicionar coluna de data convertida para ordenação
-    df_processed['date_converted'] = df_processed['date'].apply(safe_date_conversion)
+    df_processed['date_converted'] = parse_dates(df_processed['date'])
     
     # Filtrar por status (se especificado)
     if excluded_status and len(excluded_status) > 0:
@@ -440,41 +1147,8 @@ def process_dates_and_add_urgency(df, start_date=None, end_date=None, excluded_s
         
         df_processed = df_processed[date_mask]
     
-    # Função para classificar urgência com base nas novas regras
-    def classify_urgency(row):
-        date_str = row['date']
-        status = row['status']
-        
-        # Se o status for "Feito", não classificar como Atrasado ou Atenção
-        if status == "Feito":
-            return None
-        
-        # Usar a data já convertida da nova coluna
-        date_obj = row['date_converted']
-        if pd.isna(date_obj):
-            return None
-        
-        # Extrair a data como objeto date para comparação com today
-        date_obj = date_obj.date() if hasattr(date_obj, 'date') else None
-        if date_obj is None:
-            return None
-        
-        # Calcular a diferença em dias entre a data do item e hoje
-        days_diff = (date_obj - today).days
-        
-        # Regra 1: "Atrasado" - até 30 dias atrasado e status diferente de "Feito"
-        if days_diff <= 0 and days_diff >= -30:
-            return "Atrasado"
-        
-        # Regra 2: "Atenção" - até 15 dias à frente e status diferente de "Feito"
-        elif days_diff > 0 and days_diff <= 15:
-            return "Atenção"
-        
-        # Caso não se enquadre nas regras acima
-        return None
-    
     # Aplicar a classificação de urgência
-    df_processed['urgency'] = df_processed.apply(classify_urgency, axis=1)
+    df_processed['urgency'] = classify_urgency(df_processed['date_converted'], df_processed['status'], today)
     
     # Ordenar por persons (ordem alfabética) e date_converted (da mais antiga para a mais nova)
     if not df_processed.empty:
@@ -490,81 +1164,1558 @@ def process_dates_and_add_urgency(df, start_date=None, end_date=None, excluded_s
     
     return df_processed
 
-# Função principal para processar todos os itens de todos os quadros
-def fetch_all_items(api_token, start_date=None, end_date=None, excluded_status=None):
+# Classificações de urgência, na ordem da coluna categórica
+URGENCY_LABELS = ["Atrasado", "Atenção"]
+
+# Colunas convertidas em categorias na representação compacta
+CATEGORY_COLUMNS = ["group", "board", "persons", "status"]
+
+# Separador usado por extract_persons ao juntar os nomes das pessoas
+PERSONS_SEPARATOR = ", "
+
+# Representação compacta dos itens normalizados: IDs inteiros, datas em datetime64
+# e categorias para as colunas com poucos valores distintos (inclusive as colunas
+# adicionais com até metade de valores distintos). Aceita itens já compactados.
+# As colunas internas (INTERNAL_COLUMNS) ficam de fora.
+# Devolve também a relação item↔pessoa, com uma linha por responsável do item (chave
+# da referência e nome, de PERSON_NAMES_COLUMN); os nomes exibidos em persons vêm dela.
+# Itens sem essa coluna (snapshots antigos) têm os nomes exibidos separados por vírgula,
+# sem a chave da referência.
+def compact_items(df):
+    frame = df.drop(columns=INTERNAL_COLUMNS, errors="ignore").reset_index(drop=True).copy()
+    
+    # Os pares de cada combinação distinta de responsáveis são lidos uma vez; a coluna
+    # pode vir como categorias (snapshots, ver write_snapshot)
+    named = None
+    if PERSON_NAMES_COLUMN in df.columns:
+        codes, keys = pd.factorize(df[PERSON_NAMES_COLUMN].astype(object).fillna("[]").to_numpy())
+        named = [json_loads(key) for key in keys]
+        frame["persons"] = np.array([PERSONS_SEPARATOR.join(name for _, name in pairs) or "No person" for pairs in named], dtype=object)[codes]
+    
+    ids = pd.to_numeric(frame["id"], errors="coerce")
+    if not ids.isna().any():
+        frame["id"] = ids.astype("int64")
+    
+    if not pd.api.types.is_datetime64_any_dtype(frame["date"]):
+        frame["date"] = parse_dates(frame["date"])
+    
+    for column in frame.columns:
+        if column in CATEGORY_COLUMNS or (
+            column not in ITEM_COLUMNS and frame[column].dtype == object and frame[column].nunique() <= len(frame) // 2
+        ):
+            frame[column] = frame[column].astype("category")
+            # Categorias em ordem alfabética, para que ordenar pela coluna siga o texto
+            categories = frame[column].cat.categories
+            if not categories.is_monotonic_increasing:
+                frame[column] = frame[column].cat.reorder_categories(categories.sort_values())
+    
+    if named is None:
+        persons = frame["persons"].cat
+        named = [[] if value == "No person" else [[None, name] for name in value.split(PERSONS_SEPARATOR)] for value in persons.categories]
+        codes = persons.codes.to_numpy()
+    counts = np.array([len(pairs) for pairs in named], dtype=np.int64)
+    valid = codes >= 0
+    item_persons = pd.DataFrame({
+        "id": np.repeat(frame["id"].to_numpy()[valid], counts[codes[valid]]),
+        "person_id": pd.Categorical([ref for code in codes[valid] for ref, _ in named[code]]),
+        "person": pd.Categorical([name for code in codes[valid] for _, name in named[code]]),
+    })
+    
+    return frame, item_persons
+
+# Chaves da ordem de exibição de itens compactos, como em process_dates_and_add_urgency:
+# a posição do nome das pessoas (sem diferenciar maiúsculas) entre os nomes distintos e
+# a data em nanossegundos, com os itens sem data por último
+def display_keys(frame):
+    persons = frame["persons"].cat
+    lower = persons.categories.str.lower().to_numpy(dtype=object)
+    ranks = np.append(np.searchsorted(np.unique(lower), lower), len(lower))[persons.codes.to_numpy()]
+    dates = frame["date"].to_numpy().astype("datetime64[ns]").view("int64")
+    dates = np.where(frame["date"].isna().to_numpy(), np.iinfo(np.int64).max, dates)
+    return ranks, dates
+
+# Junta duas tabelas compactas (itens ou relação item↔pessoa, ver compact_items) sem
+# desfazer as categorias: cada coluna de categorias fica com as do primeiro e as novas do
+# segundo, em ordem alfabética; as demais colunas seguem o tipo do primeiro
+def concat_compact(first, second):
+    second = second.reindex(columns=first.columns)
+    first_columns, second_columns = {}, {}
+    for name, dtype in first.dtypes.items():
+        values = second[name]
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+            categories = dtype.categories
+            added = pd.Index(values.dropna().unique()).difference(categories)
+            first_columns[name] = first[name]
+            if len(added):
+                categories = categories.append(added).sort_values()
+                first_columns[name] = first[name].cat.set_categories(categories)
+            second_columns[name] = pd.Categorical(values, categories=categories)
+        else:
+            first_columns[name] = first[name]
+            second_columns[name] = values.astype(dtype)
+    return pd.concat([
+        pd.DataFrame(first_columns, index=first.index),
+        pd.DataFrame(second_columns, index=second.index),
+    ])
+
+# Prefixo das métricas exportadas no formato do Prometheus
+METRICS_PREFIX = "monday_dashboard"
+
+# Métricas de desempenho de uma atualização: tempo de cada etapa de fetch_all_items
+# e contadores (requisições, bytes, complexidade, itens, cache de decodificação).
+# Os contadores da API vêm do agendador, que é compartilhado entre as sessões; se
+# duas atualizações rodarem ao mesmo tempo, os números de ambas se misturam.
+class FetchMetrics:
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._api_start = None
+
+    # Mede o tempo de uma etapa; etapas repetidas são somadas
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def add(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        self.counters[name] = value
+
+    # Marca o início e o fim do intervalo de uso da API medido pelo agendador
+    def start_api(self, scheduler):
+        self._api_start = scheduler.stats()
+
+    def finish_api(self, scheduler):
+        if self._api_start is None:
+            return
+        for name, value in scheduler.stats().items():
+            self.set(f"api_{name}", value - self._api_start[name])
+        self._api_start = None
+
+    # Métricas derivadas: tempo total e itens por segundo
+    def summary(self):
+        total_seconds = self.stages.get("total", sum(self.stages.values()))
+        items = self.counters.get("items", 0)
+        return {
+            "total_seconds": total_seconds,
+            "items_per_second": items / total_seconds if total_seconds else 0.0,
+        }
+
+    def to_dict(self):
+        return {
+            "started_at": self.started_at.isoformat(),
+            "stages": dict(self.stages),
+            "counters": dict(self.counters),
+            "summary": self.summary(),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    # Exporta no formato de texto do Prometheus
+    def to_prometheus(self, prefix=METRICS_PREFIX):
+        lines = [
+            f"# HELP {prefix}_stage_seconds Tempo de cada etapa da última atualização",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        for name, seconds in self.stages.items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{name}"}} {seconds:.6f}')
+        for name, value in list(self.counters.items()) + list(self.summary().items()):
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+# Gerador das páginas de uma tarefa de busca, no formato
+# (board_id, itens, quadro concluído, IDs de itens removidos).
+# Tarefas "delta" trazem apenas as alterações de um quadro; tarefas "full" trazem todos
+# os itens de um lote, página a página (o cache fica em PageCache, já normalizado),
+# decodificados nos processos auxiliares com decode_pages (ver iter_items_batch)
+def fetch_job_pages(job, api_token, decode_pages=None):
+    kind, _, board_ids, limit, column_ids, since, query_params = job
+    if kind == "delta":
+        items, removed_ids = fetch_board_changes(board_ids[0], api_token, since, column_ids)
+        yield board_ids[0], items, True, removed_ids
+    else:
+        for board_id, items, finished in iter_items_batch(board_ids, api_token, limit, column_ids, query_params, decode_pages):
+            yield board_id, items, finished, set()
+
+# Cache das páginas normalizadas das tarefas "full" concluídas, {chave da tarefa:
+# {board_id: DataFrames}}. A chave inclui os quadros, o lote, as colunas, os filtros
+# enviados ao servidor e a assinatura de normalização de cada quadro; entradas vencidas
+# (PAGE_CACHE_TTL) são descartadas e, acima de PAGE_CACHE_MAX_ITEMS, as mais antigas saem.
+class PageCache:
+    def __init__(self, ttl=PAGE_CACHE_TTL, max_items=PAGE_CACHE_MAX_ITEMS):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.items = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # chave -> (quando foi guardada, itens, páginas)
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+                self._entries.pop(key)
+                self.items -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {board_id: list(frames) for board_id, frames in entry[2].items()}
+    
+    def put(self, key, frames_by_board):
+        items = sum(len(frame) for frames in frames_by_board.values() for frame in frames)
+        if items > self.max_items:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.items -= previous[1]
+            self._entries[key] = (time.monotonic(), items, {board_id: list(frames) for board_id, frames in frames_by_board.items()})
+            self.items += items
+            while self.items > self.max_items:
+                _, (_, old_items, _) = self._entries.popitem(last=False)
+                self.items -= old_items
+
+# Cache único por token, compartilhado por todas as sessões do servidor
+@st.cache_resource
+def get_page_cache(api_token):
+    return PageCache()
+
+# Processos de decodificação compartilhados pelas buscas do servidor. Os processos são
+# iniciados com "spawn", já que o servidor do Streamlit mantém várias threads ativas.
+@st.cache_resource
+def get_decode_pool(processes):
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+
+# Função de decodificação de uma resposta de itens nos processos de decodificação, a
+# partir de {chave da página: board_id} e do page_spec de cada quadro (specs)
+def pool_decoder(pool, specs, keys):
+    page_specs = {key: specs[board_id] for key, board_id in keys.items()}
+    return lambda content: pool.submit(decode_items_response, content, page_specs).result()
+
+# Função executada nas threads de busca: publica na fila um evento ("page", tarefa, página)
+# para cada página e, ao final, ("done", tarefa, None) ou ("error", tarefa, exceção).
+# Com directory, os usuários e equipes citados nas colunas de pessoas (people_columns:
+# ID do quadro -> IDs de coluna) são resolvidos antes de a página ser publicada; nas
+# páginas já decodificadas (DecodedPage), pelas referências da coluna de pessoas.
+def run_fetch_job(events, job, api_token, directory=None, people_columns=None, decode_pages=None):
+    try:
+        for page in fetch_job_pages(job, api_token, decode_pages):
+            if directory is not None and isinstance(page[1], DecodedPage):
+                directory.resolve(api_token, *referenced_ids(page[1].person_keys()))
+            elif directory is not None:
+                directory.resolve_items(api_token, page[1], people_columns.get(page[0], ()))
+            events.put(("page", job, page))
+        events.put(("done", job, None))
+    except Exception as e:
+        events.put(("error", job, e))
+
+# Função principal para processar todos os itens de todos os quadros.
+# board_filters são os argumentos de prune_boards aplicados ao índice de quadros.
+# Com on_partial, as páginas são processadas à medida que chegam e on_partial recebe
+# periodicamente só os itens que chegaram desde a chamada anterior, já filtrados e
+# classificados. Fora da sincronização incremental, tarefas já buscadas vêm de PageCache.
+# Com pushdown, os filtros de data e status também são enviados à API (ver
+# pushdown_rules), inclusive com raw; a sincronização incremental sempre busca tudo.
+# Com decode_processes, as respostas das consultas de itens vão brutas para esse número
+# de processos, que convertem o JSON e normalizam as páginas (ver decode_items_response).
+def fetch_all_items(api_token, start_date=None, end_date=None, excluded_status=None, max_workers=DEFAULT_MAX_WORKERS, batch_boards=True, extra_columns=None, incremental=False, on_partial=None, board_filters=None, metrics=None, raw=False, pushdown=False, decode_processes=DEFAULT_DECODE_PROCESSES):
     # Mostrar progresso
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    # Buscar todos os quadros
+    # Métricas de desempenho desta atualização
+    if metrics is None:
+        metrics = FetchMetrics()
+    started = time.perf_counter()
+    scheduler = get_scheduler(api_token)
+    metrics.start_api(scheduler)
+    
+    # Na sincronização incremental, os dados vêm da API sem cache e ficam no armazenamento local
+    store = get_item_store() if incremental else None
+    sync_started_at = datetime.now(timezone.utc)
+    board_index = None
+    
+    # Buscar o índice de quadros, descartar os que não interessam e
+    # carregar colunas e grupos apenas dos quadros restantes
     status_text.text("Buscando quadros...")
-    boards = fetch_all_boards(api_token)
-    if not boards:
-        st.error("Não foi possível obter os quadros. Verifique seu token de API.")
-        return None
+    try:
+        with metrics.stage("board_index"):
+            board_index = query_board_index(api_token) if incremental else fetch_board_index(api_token)
+        if not board_index:
+            st.error("Não foi possível obter os quadros. Verifique seu token de API.")
+            return None
+        
+        selected_boards = prune_boards(board_index, **(board_filters or {}))
+        metrics.set("boards_indexed", len(board_index))
+        if not selected_boards:
+            st.warning("Nenhum quadro corresponde aos filtros de quadros selecionados.")
+            return None
+        
+        status_text.text(f"Carregando colunas de {len(selected_boards)} de {len(board_index)} quadros...")
+        with metrics.stage("board_schemas"):
+            boards = load_board_schemas(selected_boards, api_token, cached=not incremental)
+        if store is not None:
+            store.save_boards(boards)
+    except MondayAPIError as e:
+        st.error(f"Erro ao buscar quadros: {str(e)}")
+        if store is None:
+            return None
+        boards = store.load_boards()
+        if not boards:
+            return None
     
-    # Buscar mapeamento de usuários
-    status_text.text("Buscando usuários...")
-    user_map = get_user_map(api_token)
+    # Diretório de usuários e equipes; os nomes são resolvidos pelas threads de busca,
+    # apenas para os IDs que aparecem nos itens. Na sincronização incremental, os nomes
+    # guardados no armazenamento local valem até serem buscados de novo.
+    status_text.text("Preparando diretório de usuários...")
+    with metrics.stage("users"):
+        directory = get_user_directory(api_token)
+        if store is not None:
+            directory.seed(store.load_users(), store.load_teams())
+    directory_requests, directory_errors = directory.requests, directory.errors
     
-    # Extrair mapeamentos de status das configurações de coluna
-    status_text.text("Extraindo mapeamentos de status...")
-    status_labels_map = extract_status_maps(boards)
+    # Esquemas compilados dos quadros (colunas identificadas, rótulos de status e grupos),
+    # recompilados apenas para quadros cujo esquema mudou
+    status_text.text("Compilando esquemas dos quadros...")
+    schema_cache = get_schema_cache()
+    schema_misses = schema_cache.misses
+    with metrics.stage("schema_plans"):
+        plans = schema_cache.plans(boards)
+        status_labels_map = extract_status_maps(boards, plans)
+    metrics.set("schema_plans_compiled", schema_cache.misses - schema_misses)
     
-    # Lista para armazenar todos os itens
-    all_items = []
+    # Páginas normalizadas de cada quadro, na mesma ordem da lista de quadros
+    frames_by_board = [[] for _ in boards]
+    board_positions = {str(board["id"]): index for index, board in enumerate(boards)}
+    
+    # Páginas de cada quadro já enviadas a on_partial
+    rendered_pages = [0] * len(boards)
     
     # Contador para monitorar o progresso
     processed_boards = 0
     total_boards = len(boards)
     
-    # Processar cada quadro
-    for board in boards:
-        processed_boards += 1
-        board_id = board["id"]
-        board_name = board["name"]
-        
-        # Log: Informar qual quadro está sendo processado
-        status_text.text(f"Processando quadro {processed_boards}/{total_boards}: '{board_name}' (ID: {board_id})...")
-        progress_bar.progress(processed_boards / total_boards)
-        
-        # Identificar colunas específicas
-        columns = board.get("columns", [])
-        column_map = {
-            "person_column_id": identify_column(columns, "people", ["Pessoas", "Responsável", "Assignee", "Owner", "people", "responsible", "assignee", "owner", "Pessoa"])["id"] if identify_column(columns, "people", ["Pessoas", "Responsável", "Assignee", "Owner", "people", "responsible", "assignee", "owner", "Pessoa"]) else None,
-            "date_column_id": identify_column(columns, "date", ["Data", "Deadline", "Due Date", "Prazo", "date", "deadline", "due date", "prazo", "PRAZO"])["id"] if identify_column(columns, "date", ["Data", "Deadline", "Due Date", "Prazo", "date", "deadline", "due date", "prazo", "PRAZO"]) else None,
-            "status_column_id": identify_column(columns, "status", ["Status", "Estado", "status", "state", "STATUS"])["id"] if identify_column(columns, "status", ["Status", "Estado", "status", "state", "STATUS"]) else None,
+    # Identificar colunas específicas de cada quadro
+    column_maps = [resolve_column_map(board, extra_columns, plan) for board, plan in zip(boards, plans)]
+    
+    # Colunas de pessoas de cada quadro, cujos usuários e equipes são resolvidos no diretório
+    people_columns = {str(board["id"]): people_column_ids(column_map) for board, column_map in zip(boards, column_maps)}
+    
+    # Decodificador com cache compartilhado por todos os quadros desta busca; as pessoas
+    # ficam como referências e os nomes são resolvidos no fim (ver resolve_persons)
+    decoder = ColumnDecoder(status_labels_map)
+    
+    # Com processos de decodificação, cada quadro é descrito uma vez (page_spec) e as
+    # respostas das consultas de itens vão brutas aos processos; as threads de busca
+    # só esperam pelas páginas já normalizadas (DecodedPage)
+    decode_pool = get_decode_pool(decode_processes) if decode_processes else None
+    decode_pages = None
+    if decode_pool is not None:
+        specs = {
+            str(board["id"]): page_spec(
+                board["name"], plan["group_map"], column_map,
+                {column_id: status_labels_map[column_id] for column_id in plan["status_labels"] if column_id in status_labels_map},
+                str(board["id"])
+            )
+            for board, column_map, plan in zip(boards, column_maps, plans)
         }
+        decode_pages = functools.partial(pool_decoder, decode_pool, specs)
+    
+    # Decidir quais quadros são buscados por completo e quais apenas pelas alterações
+    full_indexes = list(range(total_boards))
+    delta_boards = []
+    signatures = []
+    if store is not None:
+        sync_states = store.board_sync_states()
+        signatures = [board_signature(column_map, status_labels_map, plan["group_map"]) for column_map, plan in zip(column_maps, plans)]
+        full_indexes = []
+        for index, board in enumerate(boards):
+            synced_at, signature = sync_states.get(str(board["id"]), (None, None))
+            if synced_at is None or signature != signatures[index]:
+                full_indexes.append(index)
+                continue
+            updated_at = parse_api_timestamp(board.get("updated_at"))
+            if updated_at is not None and updated_at <= synced_at:
+                processed_boards += 1  # Quadro sem alterações desde a última sincronização
+            else:
+                delta_boards.append((index, synced_at))
+    
+    # Filtros enviados ao servidor: os quadros são agrupados pelas mesmas regras,
+    # já que uma consulta em lote usa um único query_params. Com intervalo de datas,
+    # quadros sem coluna de data não teriam nenhum item aceito e nem são buscados.
+    rules_groups = {(): full_indexes}
+    if pushdown and store is None:
+        rules_groups = {}
+        for index in full_indexes:
+            if start_date and end_date and not column_maps[index]["date_column_id"]:
+                processed_boards += 1
+                metrics.add("boards_skipped", 1)
+                continue
+            rules = pushdown_rules(column_maps[index], status_labels_map, start_date, end_date, excluded_status)
+            rules_groups.setdefault(rules, []).append(index)
+        full_indexes = [index for group in rules_groups.values() for index in group]
+    
+    batches = [
+        ([group[position] for position in positions], limit, rules_query_params(rules))
+        for rules, group in rules_groups.items()
+        for positions, limit in plan_board_batches([boards[index] for index in group], batch_boards)
+    ]
+    
+    # Tarefas de busca: (tipo, índices dos quadros, IDs, limite de página, colunas,
+    # última sincronização, filtros enviados ao servidor)
+    jobs = []
+    for indexes, limit, query_params in batches:
+        # Apenas as colunas usadas pelos quadros do lote são baixadas
+        column_ids = tuple(sorted({column_id for index in indexes for column_id in projected_column_ids(column_maps[index])}))
+        jobs.append(("full", tuple(indexes), tuple(str(boards[index]["id"]) for index in indexes), limit, column_ids, None, query_params))
+    for index, synced_at in delta_boards:
+        jobs.append(("delta", (index,), (str(boards[index]["id"]),), None, projected_column_ids(column_maps[index]), synced_at, None))
+    
+    status_text.text(f"Buscando itens de {len(full_indexes) + len(delta_boards)} quadros em {len(jobs)} consultas ({max_workers} em paralelo)...")
+    
+    item_counts = [0] * len(boards)
+    finished_boards = set()
+    last_render = time.monotonic()
+    
+    # Tarefas "full" já buscadas vêm do cache de páginas normalizadas, exceto na
+    # sincronização incremental; as buscadas agora são guardadas ao terminar (cache_keys)
+    events = queue.Queue()
+    page_cache = get_page_cache(api_token) if store is None else None
+    cache_keys = {}
+    fetched_jobs = []
+    for job in jobs:
+        if page_cache is None or job[0] != "full":
+            fetched_jobs.append(job)
+            continue
+        key = job[2:] + tuple(
+            (boards[index]["name"], boards[index].get("updated_at"), board_signature(column_maps[index], status_labels_map, plans[index]["group_map"]))
+            for index in job[1]
+        )
+        cached = page_cache.get(key)
+        if cached is None:
+            cache_keys[job] = key
+            fetched_jobs.append(job)
+            continue
+        for board_id in job[2]:
+            events.put(("cached", job, (board_id, cached.get(board_id, []), True, set())))
+        events.put(("done", job, None))
+    metrics.set("cached_jobs", len(jobs) - len(fetched_jobs))
+    
+    # Buscar os itens dos quadros em paralelo; as threads publicam as páginas em uma fila
+    # e o processamento e a atualização do progresso acontecem na thread principal,
+    # na ordem em que as páginas chegam
+    fetch_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for job in fetched_jobs:
+            executor.submit(run_fetch_job, events, job, api_token, directory, people_columns, decode_pages)
         
-        # Buscar itens do quadro
-        items = fetch_items(board_id, api_token)
-        
-        # Log: Informar quantos itens foram encontrados no quadro
-        status_text.text(f"Processando quadro {processed_boards}/{total_boards}: '{board_name}' (ID: {board_id}) - {len(items)} itens encontrados.")
-        
-        # Processar cada item
-        for item in items:
-            try:
-                item_data = process_item(item, board, user_map, column_map, status_labels_map)
-                all_items.append(item_data)
-            except Exception as e:
-                st.warning(f"Erro ao processar item {item.get('id', 'desconhecido')} do quadro {board['name']}: {str(e)}")
+        remaining_jobs = len(jobs)
+        while remaining_jobs:
+            kind, job, payload = events.get()
+            job_kind, indexes = job[0], job[1]
+            
+            if kind == "done":
+                remaining_jobs -= 1
+                if job in cache_keys:
+                    page_cache.put(cache_keys[job], {str(boards[index]["id"]): frames_by_board[index] for index in indexes})
+                continue
+            
+            if kind == "error":
+                remaining_jobs -= 1
+                names = ", ".join(f"'{boards[index]['name']}'" for index in indexes if index not in finished_boards)
+                st.error(f"Erro ao buscar itens dos quadros {names}: {str(payload)}")
+                # Quadros incompletos são descartados
+                for index in indexes:
+                    if index not in finished_boards:
+                        frames_by_board[index] = []
+                        rendered_pages[index] = 0
+                        finished_boards.add(index)
+                        processed_boards += 1
+                progress_bar.progress(processed_boards / total_boards)
+                continue
+            
+            board_id, items, finished, removed_ids = payload
+            index = board_positions[board_id]
+            board = boards[index]
+            board_name = board["name"]
+            
+            # Converter a página de itens em colunas (as decodificadas nos processos auxiliares
+            # já chegam em colunas); as tarefas vindas do cache trazem as páginas normalizadas
+            with metrics.stage("normalize"):
+                if kind == "cached":
+                    item_counts[index] += sum(len(frame) for frame in items)
+                    frames_by_board[index].extend(items)
+                else:
+                    metrics.add("pages", 1)
+                    if isinstance(items, DecodedPage):
+                        item_counts[index] += items.item_count
+                        frame, errors = items.frame(), items.errors
+                    else:
+                        item_counts[index] += len(items)
+                        normalizer = BoardNormalizer(board, column_maps[index], status_labels_map, decoder, plans[index])
+                        frame, errors = normalizer.normalize(items)
+                    for item_id, error in errors:
+                        st.warning(f"Erro ao processar item {item_id} do quadro {board_name}: {error}")
+                    frames_by_board[index].append(frame)
+            
+            # Liberar os itens brutos assim que a página é normalizada
+            del items
+            
+            if finished:
+                finished_boards.add(index)
+                processed_boards += 1
+                progress_bar.progress(processed_boards / total_boards)
+                
+                # Log: Informar qual quadro terminou e quantos itens foram encontrados
+                if job_kind == "delta":
+                    status_text.text(f"Quadro {processed_boards}/{total_boards} sincronizado: '{board_name}' (ID: {board_id}) - {item_counts[index]} itens alterados, {len(removed_ids)} removidos.")
+                else:
+                    status_text.text(f"Quadro {processed_boards}/{total_boards} concluído: '{board_name}' (ID: {board_id}) - {item_counts[index]} itens encontrados.")
+                
+                # Gravar o resultado do quadro no armazenamento local
+                if store is not None:
+                    with metrics.stage("store"):
+                        board_frame = pd.concat(frames_by_board[index], ignore_index=True)
+                        if job_kind == "delta":
+                            store.apply_board_changes(board_id, board_frame, removed_ids, signatures[index], sync_started_at)
+                        else:
+                            store.replace_board_items(board_id, board_frame, signatures[index], sync_started_at)
+            
+            # Atualizar os resultados parciais só com as páginas que chegaram desde a última atualização
+            if on_partial is not None and time.monotonic() - last_render >= STREAM_RENDER_INTERVAL:
+                new_frames = []
+                for board_index, board_frames in enumerate(frames_by_board):
+                    new_frames.extend(frame for frame in board_frames[rendered_pages[board_index]:] if not frame.empty)
+                    rendered_pages[board_index] = len(board_frames)
+                if new_frames:
+                    metrics.add("partial_renders", 1)
+                    partial = resolve_persons(pd.concat(new_frames, ignore_index=True), *directory.names()).drop(columns=INTERNAL_COLUMNS)
+                    on_partial(process_dates_and_add_urgency(partial, start_date, end_date, excluded_status))
+                last_render = time.monotonic()
+    
+    # Tempo de espera pela API: a fase de busca menos o processamento feito enquanto as páginas chegavam
+    fetch_seconds = time.perf_counter() - fetch_started
+    metrics.stages["fetch"] = fetch_seconds - metrics.stages.get("normalize", 0.0) - metrics.stages.get("store", 0.0)
+    if decode_pool is not None:
+        metrics.set("decode_processes", decode_processes)
+    metrics.set("boards", total_boards)
+    metrics.set("jobs", len(jobs))
+    metrics.set("items_fetched", sum(item_counts))
+    
+    with metrics.stage("concat"):
+        if store is not None:
+            # Só quadros ausentes do índice completo saem do armazenamento; quadros
+            # deixados de fora pelos filtros continuam guardados para as próximas buscas
+            if board_index is not None:
+                store.remove_missing_boards([board["id"] for board in board_index])
+            df = store.load_items([board["id"] for board in boards])
+        else:
+            frames = [frame for board_frames in frames_by_board for frame in board_frames if not frame.empty]
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    
+    # Nomes das pessoas resolvidos na leitura: os IDs que ainda não estão no diretório
+    # (ou estão vencidos, como os vindos do armazenamento local) são buscados agora.
+    # O diretório é compartilhado com outras buscas, então os nomes vêm de uma cópia.
+    with metrics.stage("users"):
+        if PERSON_IDS_COLUMN in df.columns:
+            person_ids, team_ids = referenced_ids(df[PERSON_IDS_COLUMN].dropna())
+            directory.resolve(api_token, person_ids, team_ids)
+        user_map, team_map = directory.names()
+        if PERSON_IDS_COLUMN in df.columns:
+            df = resolve_persons(df, user_map, team_map)
+    metrics.set("directory_requests", directory.requests - directory_requests)
+    metrics.set("directory_entries", len(user_map) + len(team_map))
+    if directory.errors > directory_errors:
+        st.warning("Não foi possível buscar os nomes de alguns usuários ou equipes; eles aparecem como desconhecidos.")
+    if store is not None and user_map:
+        store.save_users(user_map, team_map)
     
     # Finalizar progresso
     progress_bar.progress(1.0)
-    status_text.text("Processamento concluído!")
+    cache_info = decoder.cache_info()
+    decoded_values = cache_info["hits"] + cache_info["misses"]
+    hit_rate = cache_info["hits"] / decoded_values if decoded_values else 0
+    status_text.text(f"Processamento concluído! ({cache_info['misses']} valores distintos decodificados, {hit_rate:.0%} de acertos no cache)")
+    metrics.set("decoder_cache_hits", cache_info["hits"])
+    metrics.set("decoder_cache_misses", cache_info["misses"])
     
-    # Converter para DataFrame e processar
-    if all_items:
-        df = pd.DataFrame(all_items)
-        
+    # Processar o DataFrame
+    df_processed = None
+    if not df.empty:
         # Processar datas e adicionar classificação de urgência
-        df_processed = process_dates_and_add_urgency(df, start_date, end_date, excluded_status)
-        
-        return df_processed
+        # Com raw, os itens normalizados são devolvidos sem filtros nem urgência
+        if raw:
+            df_processed = df.reset_index(drop=True)
+        else:
+            with metrics.stage("dates_and_urgency"):
+                df_processed = process_dates_and_add_urgency(df.drop(columns=INTERNAL_COLUMNS, errors="ignore"), start_date, end_date, excluded_status)
+        metrics.set("items", len(df_processed))
     else:
         st.warning("Nenhum item foi processado com sucesso.")
+    
+    metrics.finish_api(scheduler)
+    metrics.stages["total"] = time.perf_counter() - started
+    return df_processed
+
+# Grava um snapshot dos itens normalizados (sem filtros nem urgência, que dependem
+# do dia e da sessão) e atualiza o arquivo que aponta para o snapshot mais recente.
+# Os arquivos são escritos com outro nome e renomeados, então o dashboard nunca lê
+# um snapshot pela metade; keep limita quantos snapshots antigos são mantidos.
+def write_snapshot(df, directory=SNAPSHOT_DIR, file_format="parquet", metadata=None, keep=None):
+    if file_format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Formato de snapshot desconhecido: {file_format}")
+    os.makedirs(directory, exist_ok=True)
+    
+    created_at = datetime.now(timezone.utc)
+    file_name = f"monday_items_{created_at.strftime('%Y%m%d_%H%M%S')}{SNAPSHOT_FORMATS[file_format]}"
+    path = os.path.join(directory, file_name)
+    
+    # As colunas internas ficam no arquivo: o quadro de cada item para os webhooks (ver
+    # SharedDataset.board_ids) e as referências das pessoas para a relação item↔pessoa
+    frame, _ = compact_items(df)
+    for column in INTERNAL_COLUMNS:
+        if column in df.columns:
+            frame[column] = pd.Categorical(df[column].to_numpy())
+    if file_format == "parquet":
+        frame.to_parquet(path + ".tmp", index=False)
+    else:
+        frame.to_feather(path + ".tmp")
+    os.replace(path + ".tmp", path)
+    
+    manifest = dict(metadata or {})
+    manifest.update({
+        "file": file_name,
+        "format": file_format,
+        "created_at": created_at.isoformat(),
+        "items": len(frame),
+    })
+    manifest_path = os.path.join(directory, SNAPSHOT_MANIFEST)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    
+    if keep:
+        snapshots = sorted(
+            name for name in os.listdir(directory)
+            if name.startswith("monday_items_") and name.endswith(tuple(SNAPSHOT_FORMATS.values()))
+        )
+        for name in snapshots[:-keep]:
+            if name != file_name:
+                os.remove(os.path.join(directory, name))
+    
+    return manifest
+
+# Lê o arquivo que aponta para o snapshot mais recente; None se não houver snapshot
+def read_snapshot_manifest(directory=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(directory, SNAPSHOT_MANIFEST), encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
         return None
+    if not os.path.exists(os.path.join(directory, manifest.get("file", ""))):
+        return None
+    return manifest
+
+# Carrega os itens de um snapshot; arquivos Arrow são lidos por mapeamento de memória
+def load_snapshot(directory, file_name, file_format):
+    path = os.path.join(directory, file_name)
+    if file_format == "parquet":
+        return pd.read_parquet(path)
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+# Exporta os itens no formato pedido e devolve os bytes do arquivo. CSV e JSON são
+# convertidos em blocos de EXPORT_CHUNK_ROWS linhas escritos direto no destino
+# (comprimido com gzip se compress), sem montar o texto inteiro na memória.
+def export_items(df, file_format, compress=False):
+    output = io.BytesIO()
+    if file_format in ("parquet", "arrow"):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if file_format == "parquet":
+            pq.write_table(table, output)
+        else:
+            feather.write_feather(table, output)
+        return output.getvalue()
+    
+    binary = gzip.GzipFile(fileobj=output, mode="wb", compresslevel=EXPORT_GZIP_LEVEL) if compress else output
+    text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    if file_format == "csv":
+        for start in range(0, max(len(df), 1), EXPORT_CHUNK_ROWS):
+            df.iloc[start:start + EXPORT_CHUNK_ROWS].to_csv(
+                text, index=False, sep=";", header=start == 0, date_format="%Y-%m-%d"
+            )
+    elif file_format == "json":
+        text.write("[")
+        for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+            chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS].to_json(orient="records", force_ascii=False, date_format="iso")
+            text.write(("," if start else "") + chunk[1:-1])
+        text.write("]")
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {file_format}")
+    text.flush()
+    text.detach()
+    if compress:
+        binary.close()
+    return output.getvalue()
+
+# Contagens não nulas de value_counts ou groupby.size, com um índice comum de objetos
+# (tuplas para chaves compostas), para que agregados diferentes possam ser somados
+def nonzero_counts(sizes):
+    sizes = sizes[sizes > 0]
+    return pd.Series(sizes.to_numpy(dtype=np.int64), index=pd.Index(sizes.index.tolist(), dtype=object, tupleize_cols=False))
+
+# Agregados de uma visão: total de itens e contagens por quadro, grupo, status,
+# urgência e responsável, carga de cada responsável por urgência e itens abertos de
+# cada responsável por semana do prazo. Alterações de itens entram somando os
+# agregados dos itens novos e subtraindo os dos antigos (ver combine).
+class ItemAggregates:
+    def __init__(self, items, counts):
+        self.items = items
+        self.counts = counts
+    
+    # Agregados de itens com a coluna de urgência e da relação item↔pessoa desses
+    # itens; sem a relação (resultados parciais), cada combinação de responsáveis
+    # conta como um responsável. Aceita datas em texto, que são convertidas.
+    @classmethod
+    def from_items(cls, items, item_persons=None):
+        if item_persons is None:
+            item_persons = pd.DataFrame({"id": items["id"].to_numpy(), "person": items["persons"].to_numpy()})
+        # Resultados parciais (process_dates_and_add_urgency) mantêm as datas em texto
+        if not pd.api.types.is_datetime64_any_dtype(items["date"]):
+            items = items.assign(date=parse_dates(items["date"]))
+        persons = item_persons.merge(items[["id", "date", "status", "urgency"]], on="id", how="inner")
+        dates = persons["date"].dt.normalize()
+        persons = persons.assign(week=dates - pd.to_timedelta(dates.dt.weekday, unit="D"))
+        open_items = persons[(persons["status"] != "Feito").to_numpy()]
+        
+        counts = {
+            "board": nonzero_counts(items["board"].value_counts()),
+            "group": nonzero_counts(items["group"].value_counts()),
+            "status": nonzero_counts(items["status"].value_counts()),
+            "urgency": nonzero_counts(items["urgency"].value_counts()),
+            "person": nonzero_counts(persons["person"].value_counts()),
+            "workload": nonzero_counts(persons.groupby(["person", "urgency"], observed=True).size()),
+            "weekly": nonzero_counts(open_items.groupby(["person", "week"], observed=True).size()),
+        }
+        return cls(len(items), counts)
+    
+    # Novos agregados com os de other somados (sign=1) ou subtraídos (sign=-1)
+    def combine(self, other, sign=1):
+        counts = {}
+        for name, values in self.counts.items():
+            merged = values.add(other.counts[name] * sign, fill_value=0)
+            counts[name] = merged[merged > 0].astype(np.int64)
+        return ItemAggregates(self.items + sign * other.items, counts)
+    
+    def count(self, name, key):
+        return int(self.counts[name].get(key, 0))
+    
+    # Responsáveis com mais itens atrasados, depois em atenção e depois no total
+    def workload(self, limit=WORKLOAD_TOP_PERSONS):
+        workload = self.counts["workload"]
+        table = pd.DataFrame(0, index=self.counts["person"].index, columns=URGENCY_LABELS)
+        if len(workload):
+            keys = pd.MultiIndex.from_tuples(workload.index.tolist())
+            table = pd.Series(workload.to_numpy(), index=keys).unstack(fill_value=0).reindex(index=table.index, columns=URGENCY_LABELS, fill_value=0)
+        table["Itens"] = self.counts["person"]
+        table = table.sort_values(URGENCY_LABELS + ["Itens"], ascending=False).head(limit)
+        return table.rename_axis("Responsável")
+    
+    # Itens abertos por responsável e semana do prazo, só dos responsáveis pedidos
+    def weekly(self, persons):
+        weekly = self.counts["weekly"]
+        keys = weekly.index.tolist()
+        rows = pd.DataFrame({
+            "person": [person for person, _ in keys],
+            "week": [week for _, week in keys],
+            "items": weekly.to_numpy(),
+        })
+        return rows[rows["person"].isin(persons)]
+
+# Itens normalizados de uma busca, compartilhados por todas as sessões, na forma
+# compacta (compact_items) com a relação item↔pessoa. Os itens não são alterados
+# depois de criados: cada combinação de filtros gera uma visão e agregados guardados
+# em cache, também compartilhados; eventos de webhook geram um novo conjunto (patched).
+class SharedDataset:
+    def __init__(self, key, frame, source, pushed_filters=None, item_persons=None, board_ids=None):
+        self.key = key
+        self.source = source
+        self.pushed_filters = pushed_filters
+        self.created_at = datetime.now(timezone.utc)
+        
+        # Índices calculados uma única vez sobre a representação compacta: os itens
+        # ficam na ordem de exibição (ver display_keys), então cada visão é só uma
+        # máscara sobre as datas e os códigos de status. Com item_persons, frame já é
+        # compacto e está nessa ordem (ver patched). board_ids são os quadros de onde os
+        # itens vieram (None para dados sem BOARD_ID_COLUMN, como snapshots antigos).
+        if item_persons is None:
+            if board_ids is None and BOARD_ID_COLUMN in frame.columns:
+                board_ids = frame[BOARD_ID_COLUMN].dropna().astype(str).unique()
+            frame, item_persons = compact_items(frame)
+            ranks, dates = display_keys(frame)
+            frame = frame.iloc[np.lexsort((dates, ranks))]
+        self.frame = frame
+        self.item_persons = item_persons
+        self.board_ids = frozenset(board_ids) if board_ids is not None else None
+        self.dates = self.frame["date"]
+        self.status_codes = self.frame["status"].cat.codes.to_numpy()
+        self.status_values = self.frame["status"].cat.categories
+        
+        self.updated_at = self.created_at
+        self.applied_events = 0
+        
+        self._urgency = (None, None)
+        self._views = OrderedDict()
+        self._aggregates = OrderedDict()
+        self._exports = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def age_seconds(self):
+        return (datetime.now(timezone.utc) - self.created_at).total_seconds()
+    
+    # Urgência de todos os itens, recalculada só quando o dia muda
+    def urgency(self):
+        today = datetime.now().date()
+        with self._lock:
+            day, urgency = self._urgency
+        if day != today:
+            urgency = pd.Categorical(classify_urgency(self.dates, self.frame["status"], today), categories=URGENCY_LABELS)
+            with self._lock:
+                self._urgency = (today, urgency)
+        return urgency
+    
+    # Indica se os filtros cabem nos que foram enviados ao servidor na busca;
+    # fora disso, a visão não tem os itens que o servidor descartou
+    def covers(self, start_date=None, end_date=None, excluded_status=None):
+        if self.pushed_filters is None:
+            return True
+        pushed_start, pushed_end, pushed_excluded = self.pushed_filters
+        if pushed_start and pushed_end and not (start_date and end_date and pushed_start <= start_date and end_date <= pushed_end):
+            return False
+        return set(pushed_excluded) <= set(excluded_status or [])
+    
+    # Itens filtrados por data, status e urgência (None para itens sem classificação),
+    # com a coluna de urgência, na ordem de exibição. O resultado é compartilhado e
+    # não deve ser alterado por quem o recebe.
+    def view(self, start_date=None, end_date=None, excluded_status=None, urgency=None):
+        urgency_values = self.urgency()
+        view_key = (
+            start_date, end_date, tuple(sorted(excluded_status or [])),
+            tuple(urgency or []), datetime.now().date()
+        )
+        with self._lock:
+            if view_key in self._views:
+                self._views.move_to_end(view_key)
+                return self._views[view_key]
+        
+        mask = np.ones(len(self.frame), dtype=bool)
+        if excluded_status:
+            excluded_codes = np.flatnonzero(pd.Index(self.status_values).isin(excluded_status))
+            mask &= ~np.isin(self.status_codes, excluded_codes)
+        if start_date and end_date:
+            date_values = self.dates.to_numpy()
+            mask &= (date_values >= np.datetime64(pd.to_datetime(start_date))) & (date_values <= np.datetime64(pd.to_datetime(end_date)))
+        if urgency:
+            mask &= pd.Series(urgency_values).isin(urgency).to_numpy()
+        
+        view = self.frame[mask]
+        view = view.assign(urgency=pd.Categorical(urgency_values[mask], categories=URGENCY_LABELS))
+        with self._lock:
+            self._views[view_key] = view
+            while len(self._views) > SHARED_VIEW_CACHE_SIZE:
+                self._views.popitem(last=False)
+        return view
+    
+    # Arquivo exportado de uma visão (ver export_items), gerado uma vez por conjunto,
+    # filtros e formato e compartilhado entre as sessões
+    def export(self, file_format, compress=False, start_date=None, end_date=None, excluded_status=None):
+        export_key = (file_format, compress, start_date, end_date, tuple(sorted(excluded_status or [])), datetime.now().date())
+        with self._lock:
+            if export_key in self._exports:
+                self._exports.move_to_end(export_key)
+                return self._exports[export_key]
+        
+        content = export_items(self.view(start_date, end_date, excluded_status), file_format, compress)
+        with self._lock:
+            self._exports[export_key] = content
+            while len(self._exports) > SHARED_EXPORT_CACHE_SIZE:
+                self._exports.popitem(last=False)
+        return content
+    
+    # Relação item↔pessoa restrita aos itens de uma visão
+    def view_persons(self, view):
+        return self.item_persons[self.item_persons["id"].isin(view["id"])]
+    
+    # Agregados de uma visão (ver ItemAggregates), calculados uma vez por versão do
+    # conjunto, filtros e dia; as versões criadas por webhook herdam os agregados já
+    # calculados, atualizados só com os itens alterados (ver carry_aggregates)
+    def aggregates(self, start_date=None, end_date=None, excluded_status=None):
+        aggregates_key = (start_date, end_date, tuple(sorted(excluded_status or [])), datetime.now().date())
+        with self._lock:
+            if aggregates_key in self._aggregates:
+                self._aggregates.move_to_end(aggregates_key)
+                return self._aggregates[aggregates_key]
+        
+        view = self.view(start_date, end_date, excluded_status)
+        aggregates = ItemAggregates.from_items(view, self.view_persons(view))
+        self._store_aggregates(aggregates_key, aggregates)
+        return aggregates
+    
+    def _store_aggregates(self, aggregates_key, aggregates):
+        with self._lock:
+            self._aggregates[aggregates_key] = aggregates
+            while len(self._aggregates) > SHARED_VIEW_CACHE_SIZE:
+                self._aggregates.popitem(last=False)
+    
+    # IDs de itens (textos, como nos eventos de webhook) no tipo da coluna id
+    def _item_ids(self, item_ids):
+        item_ids = pd.Series(list(item_ids), dtype=object)
+        if pd.api.types.is_integer_dtype(self.frame["id"]):
+            return pd.to_numeric(item_ids, errors="coerce").dropna().astype("int64")
+        return item_ids
+    
+    # Pares [chave da referência, nome] dos responsáveis de itens (IDs em texto), em JSON
+    # como em PERSON_NAMES_COLUMN, a partir da relação item↔pessoa
+    def _person_names(self, item_ids):
+        relation = self.item_persons[self.item_persons["id"].isin(self._item_ids(item_ids)).to_numpy()]
+        named = {}
+        for item_id, ref, name in zip(relation["id"].astype(str), relation["person_id"], relation["person"]):
+            named.setdefault(item_id, []).append([None if pd.isna(ref) else ref, name])
+        return [json.dumps(named.get(item_id, []), ensure_ascii=False) for item_id in item_ids]
+    
+    # Itens com os ids pedidos (textos, como nos eventos de webhook) que passam pelos
+    # filtros de uma visão, com a coluna de urgência, e a relação item↔pessoa deles
+    def item_rows(self, item_ids, start_date, end_date, excluded_status, today):
+        rows = self.frame[self.frame["id"].isin(self._item_ids(item_ids)).to_numpy()]
+        if excluded_status:
+            rows = rows[~rows["status"].isin(excluded_status).to_numpy()]
+        if start_date and end_date:
+            rows = rows[((rows["date"] >= pd.to_datetime(start_date)) & (rows["date"] <= pd.to_datetime(end_date))).to_numpy()]
+        rows = rows.assign(urgency=pd.Categorical(classify_urgency(rows["date"], rows["status"], today), categories=URGENCY_LABELS))
+        return rows, self.view_persons(rows)
+    
+    # Agregados das visões já calculadas em previous, com os itens alterados trocados:
+    # a versão antiga de cada item sai e a nova entra, sem percorrer a visão inteira
+    def carry_aggregates(self, previous, item_ids):
+        today = datetime.now().date()
+        with previous._lock:
+            entries = list(previous._aggregates.items())
+        for aggregates_key, aggregates in entries:
+            if aggregates_key[-1] != today:
+                continue
+            filters = aggregates_key[:3]
+            removed = ItemAggregates.from_items(*previous.item_rows(item_ids, *filters, today))
+            added = ItemAggregates.from_items(*self.item_rows(item_ids, *filters, today))
+            self._store_aggregates(aggregates_key, aggregates.combine(removed, -1).combine(added))
+    
+    # Novo conjunto com as alterações de itens recebidas por webhook (ver
+    # parse_webhook_event) aplicadas, ou o próprio conjunto se nenhuma se aplica.
+    # Só as linhas dos itens alterados são refeitas: as antigas saem, com a relação
+    # item↔pessoa delas, e as novas são compactadas à parte e entram nas suas posições
+    # da ordem de exibição. O conjunto atual não é alterado, já que outras sessões podem
+    # estar lendo dele; o novo mantém created_at, que continua indicando a idade da
+    # última busca completa.
+    def patched(self, changes, api_token):
+        extra_columns = [column for column in self.frame.columns if column not in ITEM_COLUMNS]
+        contexts = webhook_board_contexts({change["board_id"] for change in changes if change["kind"] != "remove"}, api_token, extra_columns)
+        patch = apply_item_changes(self.frame, changes, contexts, api_token, self.board_ids or ())
+        if patch is None:
+            return self
+        removed_ids, rows = patch
+        
+        # Itens alterados sem mudança nas pessoas mantêm os pares da relação atual
+        missing = rows[PERSON_NAMES_COLUMN].isna().to_numpy()
+        if missing.any():
+            rows[PERSON_NAMES_COLUMN] = rows[PERSON_NAMES_COLUMN].astype(object)
+            rows.loc[missing, PERSON_NAMES_COLUMN] = self._person_names(rows["id"][missing])
+        
+        removed = self._item_ids(removed_ids)
+        frame = self.frame[~self.frame["id"].isin(removed).to_numpy()]
+        item_persons = self.item_persons[~self.item_persons["id"].isin(removed).to_numpy()]
+        if len(rows):
+            id_dtype = self.frame["id"].dtype
+            rows, row_persons = compact_items(rows)
+            rows["id"] = rows["id"].astype(str).astype(id_dtype)
+            row_persons["id"] = row_persons["id"].astype(str).astype(id_dtype)
+            next_label = self.frame.index.max() + 1 if len(self.frame) else 0
+            rows.index = pd.RangeIndex(next_label, next_label + len(rows))
+            
+            # Cada linha nova entra depois das que têm a mesma chave de exibição
+            count = len(frame)
+            merged = concat_compact(frame, rows)
+            ranks, dates = display_keys(merged)
+            new_order = np.lexsort((dates[count:], ranks[count:]))
+            positions = []
+            for rank, date in zip(ranks[count:][new_order], dates[count:][new_order]):
+                start, end = np.searchsorted(ranks[:count], rank, "left"), np.searchsorted(ranks[:count], rank, "right")
+                positions.append(start + np.searchsorted(dates[start:end], date, "right"))
+            frame = merged.iloc[np.insert(np.arange(count), positions, count + new_order)]
+            item_persons = concat_compact(item_persons, row_persons).reset_index(drop=True)
+        
+        dataset = SharedDataset(self.key, frame, self.source, self.pushed_filters, item_persons, self.board_ids)
+        dataset.created_at = self.created_at
+        dataset.applied_events = self.applied_events + len(changes)
+        dataset.carry_aggregates(self, {change["item_id"] for change in changes})
+        return dataset
+
+# Registro dos conjuntos de dados compartilhados, pela chave da busca (filtros de
+# quadros e colunas adicionais ou arquivo do snapshot). Só a versão mais recente
+# de cada chave é mantida, e as chaves menos usadas saem quando passam do limite.
+class DatasetRegistry:
+    def __init__(self, max_datasets=MAX_SHARED_DATASETS):
+        self.max_datasets = max_datasets
+        self._datasets = OrderedDict()
+        self._build_locks = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is not None:
+                self._datasets.move_to_end(key)
+            return dataset
+    
+    # Conjuntos publicados, do menos para o mais usado
+    def datasets(self):
+        with self._lock:
+            return list(self._datasets.values())
+    
+    # Troca um conjunto pela versão atualizada, se ele ainda for o publicado na chave
+    # (uma busca completa publicada nesse meio tempo tem prioridade)
+    def replace(self, dataset, updated):
+        with self._lock:
+            if self._datasets.get(dataset.key) is not dataset:
+                return False
+            self._datasets[dataset.key] = updated
+            return True
+    
+    def publish(self, key, frame, source, pushed_filters=None):
+        dataset = SharedDataset(key, frame, source, pushed_filters)
+        with self._lock:
+            self._datasets[key] = dataset
+            self._datasets.move_to_end(key)
+            while len(self._datasets) > self.max_datasets:
+                self._datasets.popitem(last=False)
+        return dataset
+    
+    # Devolve o conjunto da chave se for mais novo que max_age; senão chama build e
+    # publica o resultado. Sessões que pedem a mesma chave ao mesmo tempo esperam
+    # a primeira busca terminar em vez de repetir a busca.
+    def get_or_build(self, key, build, source, max_age=None, pushed_filters=None):
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            dataset = self.get(key)
+            if dataset is not None and (max_age is None or dataset.age_seconds() <= max_age):
+                return dataset, False
+            frame = build()
+            if frame is None or frame.empty:
+                return None, True
+            return self.publish(key, frame, source, pushed_filters), True
+
+# Registro único do servidor
+@st.cache_resource
+def get_dataset_registry():
+    return DatasetRegistry()
+
+# Chave do conjunto de dados de uma busca na API: só os parâmetros que mudam os
+# itens normalizados entram na chave (datas e status são filtrados em cada sessão,
+# a não ser que tenham sido enviados ao servidor, em pushed_filters)
+def dataset_key(board_filters, extra_columns, pushed_filters=None):
+    params = json.dumps({"board_filters": board_filters, "extra_columns": sorted(extra_columns or []), "pushed_filters": pushed_filters}, sort_keys=True, default=str)
+    return "api:" + hashlib.sha1(params.encode("utf-8")).hexdigest()
+
+# Conjunto compartilhado da sessão atual: a sessão guarda só a chave, e os filtros
+# da barra lateral são aplicados a cada execução sobre o conjunto em memória
+def session_dataset():
+    key = st.session_state.get("dataset_key")
+    if key is None:
+        return None
+    return get_dataset_registry().get(key)
+
+# Tipos de evento de webhook do Monday tratados como alterações de itens; os eventos de
+# REMOVED_ITEM_EVENTS removem o item
+WEBHOOK_ITEM_EVENTS = {
+    "create_pulse": "create",
+    "update_column_value": "column",
+    "update_name": "name",
+    "move_pulse_into_group": "group",
+}
+
+# Converte o valor de coluna de um evento de webhook no formato de column_values da API.
+# Colunas de status chegam como {"label": {"index": ..., "text": ...}}.
+def webhook_column_value(column_id, value):
+    if value is None:
+        return {"id": column_id, "value": None, "text": ""}
+    if not isinstance(value, dict):
+        value = {"value": value}
+    text = ""
+    if isinstance(value.get("label"), dict):
+        text = value["label"].get("text") or ""
+        value = {"index": value["label"].get("index")}
+    return {"id": column_id, "value": json.dumps(value), "text": text}
+
+# Função para converter o corpo de um webhook do Monday em uma alteração de item
+# {"kind", "board_id", "item_id", ...}; devolve None para eventos não tratados
+def parse_webhook_event(payload):
+    event = (payload or {}).get("event") or {}
+    event_type = event.get("type")
+    kind = "remove" if event_type in REMOVED_ITEM_EVENTS else WEBHOOK_ITEM_EVENTS.get(event_type)
+    item_id = event.get("pulseId") or event.get("itemId")
+    if kind is None or item_id is None or event.get("boardId") is None:
+        return None
+    
+    change = {"kind": kind, "board_id": str(event["boardId"]), "item_id": str(item_id)}
+    if kind == "create":
+        change["name"] = event.get("pulseName")
+        change["group_id"] = event.get("groupId")
+        change["column_values"] = [webhook_column_value(column_id, value) for column_id, value in (event.get("columnValues") or {}).items()]
+    elif kind == "column":
+        change["column_values"] = [webhook_column_value(event.get("columnId"), event.get("value"))]
+    elif kind == "name":
+        change["name"] = (event.get("value") or {}).get("name") or event.get("pulseName")
+    elif kind == "group":
+        change["group_id"] = event.get("destGroupId")
+    return change
+
+# Normalizadores dos quadros citados em eventos de webhook, a partir do índice de quadros
+# e dos esquemas em cache (quadros fora do índice ficam de fora)
+def webhook_board_contexts(board_ids, api_token, extra_columns=None):
+    if not board_ids:
+        return {}
+    index = {str(board["id"]): board for board in fetch_board_index(api_token)}
+    boards = load_board_schemas([index[board_id] for board_id in sorted(board_ids) if board_id in index], api_token)
+    plans = get_schema_cache().plans(boards)
+    directory = get_user_directory(api_token)
+    contexts = {}
+    for board, plan in zip(boards, plans):
+        column_map = resolve_column_map(board, extra_columns, plan)
+        decoder = ColumnDecoder(plan["status_labels"])
+        normalizer = BoardNormalizer(board, column_map, plan["status_labels"], decoder, plan)
+        contexts[str(board["id"])] = (normalizer, directory, people_column_ids(column_map))
+    return contexts
+
+# Troca a chave de referências de uma linha normalizada pelos nomes das pessoas
+def with_person_names(fields, directory):
+    if PERSON_IDS_COLUMN in fields:
+        named = named_refs(decode_person_refs(fields.pop(PERSON_IDS_COLUMN)), *directory.names())
+        fields["persons"] = PERSONS_SEPARATOR.join(name for _, name in named) or "No person"
+        fields[PERSON_NAMES_COLUMN] = json.dumps(named, ensure_ascii=False)
+    return fields
+
+# Função para aplicar alterações de itens aos itens compactos de um SharedDataset, na
+# ordem recebida. Itens criados só entram se o quadro (pelo ID) fizer parte dos dados
+# (board_ids); alterações de itens que não estão nos dados são ignoradas. Pessoas e
+# equipes citadas são resolvidas no diretório antes da decodificação. Devolve os IDs
+# dos itens que saem (removidos e alterados) e as linhas novas (alterados e criados),
+# com as colunas de frame e as datas convertidas, ou None se nenhuma alteração se aplica.
+def apply_item_changes(frame, changes, contexts, api_token, board_ids=()):
+    change_ids = pd.Series(sorted({change["item_id"] for change in changes}), dtype=object)
+    if pd.api.types.is_integer_dtype(frame["id"]):
+        change_ids = pd.to_numeric(change_ids, errors="coerce").dropna().astype("int64")
+    matches = np.flatnonzero(frame["id"].isin(change_ids).to_numpy())
+    positions = {str(item_id): position for position, item_id in zip(matches, frame["id"].iloc[matches].tolist())}
+    removed = set()
+    updates = {}
+    created = {}
+    
+    for change in changes:
+        item_id = change["item_id"]
+        exists = item_id in created or (item_id in positions and item_id not in removed)
+        if change["kind"] == "remove":
+            if created.pop(item_id, None) is None and item_id in positions:
+                removed.add(item_id)
+            updates.pop(item_id, None)
+            continue
+        
+        context = contexts.get(change["board_id"])
+        if context is None:
+            continue
+        normalizer, directory, people_columns = context
+        column_values = change.get("column_values", [])
+        if column_values:
+            directory.resolve_items(api_token, [{"column_values": column_values}], people_columns)
+        
+        if change["kind"] == "create":
+            if exists or change["board_id"] not in board_ids:
+                continue
+            item = {"id": item_id, "name": change.get("name") or "No name", "group": {"id": change.get("group_id")}, "column_values": column_values}
+            created[item_id] = with_person_names(dict(zip(normalizer.column_names, normalizer.normalize_item(item))), directory)
+            continue
+        if not exists:
+            continue
+        
+        if change["kind"] == "column":
+            fields = with_person_names(normalizer.column_fields(column_values), directory)
+        elif change["kind"] == "name":
+            fields = {"name": change.get("name") or "No name"}
+        else:
+            group_id = change.get("group_id")
+            fields = {"group": normalizer.group_map.get(group_id, "No group") if group_id else "No group"}
+        (created[item_id] if item_id in created else updates.setdefault(item_id, {})).update(fields)
+    
+    if not (removed or updates or created):
+        return None
+    
+    # Versões novas: a linha atual com os campos alterados, mais os itens criados
+    records = frame.iloc[[positions[item_id] for item_id in updates]].to_dict("records")
+    for record, fields in zip(records, updates.values()):
+        record.update(fields)
+    records.extend(created.values())
+    rows = pd.DataFrame(records).reindex(columns=[*frame.columns, PERSON_NAMES_COLUMN])
+    if records:
+        rows["id"] = rows["id"].astype(str)
+        rows["date"] = parse_dates(rows["date"].map(lambda value: value.isoformat() if isinstance(value, pd.Timestamp) else value))
+    return removed | set(updates), rows
+
+# Função para conferir a assinatura (JWT HS256 no cabeçalho Authorization) de um webhook
+def webhook_signature_valid(authorization, secret):
+    parts = (authorization or "").split(" ")[-1].split(".")
+    if len(parts) != 3:
+        return False
+    digest = hmac.new(secret.encode("utf-8"), f"{parts[0]}.{parts[1]}".encode("ascii"), hashlib.sha256).digest()
+    return hmac.compare_digest(base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii"), parts[2])
+
+# Função para gerar um cabeçalho Authorization assinado como o do Monday (usada ao reenviar eventos)
+def sign_webhook_request(secret):
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).rstrip(b"=").decode("ascii")
+    signing_input = f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode({'iat': int(time.time())})}"
+    digest = hmac.new(secret.encode("utf-8"), signing_input.encode("ascii"), hashlib.sha256).digest()
+    return f"{signing_input}.{base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')}"
+
+# Receptor local de webhooks do Monday, executado em threads do próprio servidor do
+# Streamlit: responde ao desafio de verificação, guarda as alterações de itens em uma
+# fila e, a cada WEBHOOK_APPLY_INTERVAL, aplica as pendentes a todos os conjuntos do
+# registro compartilhado (ver SharedDataset.patched), sem buscar os itens de novo.
+# submit também pode ser chamado diretamente para aplicar eventos gravados.
+class WebhookReceiver:
+    def __init__(self, api_token, host=WEBHOOK_HOST, port=WEBHOOK_PORT, secret=WEBHOOK_SECRET, record_path=WEBHOOK_RECORD_PATH, registry=None):
+        self.api_token = api_token
+        self.secret = secret
+        self.record_path = record_path
+        self.registry = registry or get_dataset_registry()
+        self.received = 0
+        self.ignored = 0
+        self.applied = 0
+        self.pending = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_applied_at = None
+        self.last_error = None
+        self._changes = queue.Queue()
+        self._retries = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        
+        receiver = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                status, response = receiver.handle(self.rfile.read(length), self.headers.get("Authorization"))
+                body = json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+    
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    # Trata o corpo de uma requisição; devolve (status HTTP, resposta)
+    def handle(self, body, authorization=None):
+        if self.secret and not webhook_signature_valid(authorization, self.secret):
+            return 401, {"error": "Assinatura inválida"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "JSON inválido"}
+        if "challenge" in payload:
+            return 200, {"challenge": payload["challenge"]}
+        self.submit(payload)
+        return 200, {"ok": True}
+    
+    # Registra um evento; devolve False para eventos que não alteram itens
+    def submit(self, payload):
+        change = parse_webhook_event(payload)
+        with self._lock:
+            self.received += 1
+            if change is None:
+                self.ignored += 1
+            if self.record_path:
+                with open(self.record_path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        if change is not None:
+            self._changes.put(change)
+        return change is not None
+    
+    # Aplica as alterações pendentes aos conjuntos publicados; devolve quantas foram
+    # aplicadas. Cada conjunto é atualizado à parte: se falhar (API fora do ar, por
+    # exemplo), as alterações são aplicadas uma a uma e as que falharem ficam guardadas
+    # para o conjunto, antes das novas, até WEBHOOK_MAX_ATTEMPTS tentativas
+    def apply_pending(self):
+        changes = []
+        while True:
+            try:
+                changes.append(self._changes.get_nowait())
+            except queue.Empty:
+                break
+        datasets = self.registry.datasets()
+        retries = {dataset: self._retries[dataset] for dataset in datasets if dataset in self._retries}
+        self._retries = {}
+        processed = {id(change): change for change in changes}
+        for pending in retries.values():
+            processed.update((id(change), change) for change, _ in pending)
+        if not processed:
+            return 0
+        
+        errors, dropped, failed_ids = [], set(), set()
+        for dataset in datasets:
+            pending = retries.get(dataset, []) + [(change, 0) for change in changes]
+            if not pending:
+                continue
+            try:
+                updated, failed = dataset.patched([change for change, _ in pending], self.api_token), []
+            except Exception as e:
+                errors.append(e)
+                updated, failed = self._patch_each(dataset, pending, errors, dropped)
+            # Uma busca completa publicada nesse meio tempo substitui o conjunto e as
+            # alterações guardadas para ele
+            if updated is not dataset and not self.registry.replace(dataset, updated):
+                continue
+            if failed:
+                self._retries[updated] = failed
+                failed_ids.update(id(change) for change, _ in failed)
+        
+        applied = [key for key in processed if key not in failed_ids and key not in dropped]
+        with self._lock:
+            self.applied += len(applied)
+            self.pending = len(failed_ids)
+            self.dropped += len(dropped)
+            if applied:
+                self.last_applied_at = datetime.now()
+            if errors:
+                self.errors += len(errors)
+                self.last_error = str(errors[-1])
+        return len(applied)
+    
+    # Aplica as alterações a um conjunto uma a uma; devolve o conjunto atualizado e as
+    # que falharam, com o número de tentativas. Alterações seguintes de um item cuja
+    # alteração falhou esperam junto, para manter a ordem; as que esgotam as tentativas
+    # vão para dropped (pelo id do objeto)
+    def _patch_each(self, dataset, pending, errors, dropped):
+        failed = []
+        held = set()
+        for change, attempts in pending:
+            if change["item_id"] in held:
+                failed.append((change, attempts))
+                continue
+            try:
+                dataset = dataset.patched([change], self.api_token)
+                continue
+            except Exception as e:
+                errors.append(e)
+            if attempts + 1 < WEBHOOK_MAX_ATTEMPTS:
+                held.add(change["item_id"])
+                failed.append((change, attempts + 1))
+            else:
+                dropped.add(id(change))
+        return dataset, failed
+    
+    def _apply_loop(self):
+        while not self._stop.wait(WEBHOOK_APPLY_INTERVAL):
+            try:
+                self.apply_pending()
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = str(e)
+    
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self.httpd.serve_forever, daemon=True),
+            threading.Thread(target=self._apply_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# Receptor único do servidor, iniciado na primeira sessão com MONDAY_WEBHOOK_PORT definido
+@st.cache_resource
+def get_webhook_receiver(api_token):
+    return WebhookReceiver(api_token).start()
+
+# Posições das linhas de df que contêm search (sem diferenciar maiúsculas) em uma das
+# colunas de TABLE_SEARCH_COLUMNS, ordenadas por sort_by (None mantém a ordem de df).
+# Nas colunas categóricas a busca é feita nas categorias, não em cada linha.
+def table_rows(df, search="", sort_by=None, descending=False):
+    positions = np.arange(len(df))
+    if search:
+        mask = np.zeros(len(df), dtype=bool)
+        for column in TABLE_SEARCH_COLUMNS:
+            if column not in df.columns:
+                continue
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                matched = values.cat.categories.str.contains(search, case=False, regex=False)
+                mask |= np.isin(values.cat.codes.to_numpy(), np.flatnonzero(matched))
+            else:
+                mask |= values.astype(str).str.contains(search, case=False, regex=False).to_numpy()
+        positions = positions[mask]
+    
+    if sort_by:
+        order = df[sort_by].iloc[positions].reset_index(drop=True).sort_values(
+            ascending=not descending, kind="stable", na_position="last"
+        ).index.to_numpy()
+        positions = positions[order]
+    return positions
+
+# Estilo da tabela derivado da coluna de urgência já calculada, aplicado só às linhas exibidas
+def style_urgency(df):
+    return df.style.apply(
+        lambda column: column.map(URGENCY_STYLES).astype(object).fillna(""),
+        subset=["urgency"]
+    )
+
+# Nomes exibidos das etapas medidas em fetch_all_items
+STAGE_LABELS = {
+    "board_index": "Índice de quadros",
+    "board_schemas": "Colunas dos quadros",
+    "users": "Usuários",
+    "schema_plans": "Esquemas dos quadros",
+    "fetch": "Espera pela API",
+    "normalize": "Normalização",
+    "store": "Armazenamento local",
+    "concat": "Junção dos quadros",
+    "dates_and_urgency": "Datas e urgência",
+    "total": "Total",
+}
+
+# Função para exibir o painel de diagnóstico de desempenho da última atualização,
+# com o layout estreito da barra lateral (onde é chamada)
+def render_diagnostics(metrics):
+    st.subheader("Diagnóstico de Desempenho")
+    summary = metrics.summary()
+    counters = metrics.counters
+    
+    col1, col2 = st.columns(2)
+    col1.metric("Tempo Total", f"{summary['total_seconds']:.1f} s")
+    col2.metric("Itens por Segundo", f"{summary['items_per_second']:.0f}")
+    col1.metric("Requisições", counters.get("api_requests", 0))
+    col2.metric("Dados Baixados", f"{counters.get('api_bytes_downloaded', 0) / 1_000_000:.1f} MB")
+    
+    stages = pd.DataFrame(
+        [(STAGE_LABELS.get(name, name), seconds) for name, seconds in metrics.stages.items()],
+        columns=["Etapa", "Segundos"]
+    )
+    st.dataframe(stages, use_container_width=True, hide_index=True)
+    
+    with st.expander("Contadores"):
+        st.json(counters)
+    
+    st.download_button(
+        label="Download Métricas (JSON)",
+        data=metrics.to_json(),
+        file_name=f"monday_metrics_{metrics.started_at.strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json"
+    )
+    st.download_button(
+        label="Download Métricas (Prometheus)",
+        data=metrics.to_prometheus(),
+        file_name=f"monday_metrics_{metrics.started_at.strftime('%Y%m%d_%H%M%S')}.prom",
+        mime="text/plain"
+    )
+
+# Função para exibir as estatísticas e os gráficos a partir dos agregados de uma visão
+# (ItemAggregates), sem percorrer os itens
+def render_statistics(aggregates):
+    st.subheader("Estatísticas")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total de Itens", aggregates.items)
+    col2.metric("Responsáveis Únicos", len(aggregates.counts["person"]))
+    
+    urgent_count = aggregates.count("urgency", "Atrasado")
+    attention_count = aggregates.count("urgency", "Atenção")
+    col3.metric("Itens Atrasados/Atenção", f"{urgent_count}/{attention_count}")
+    
+    # Gráfico de status
+    st.subheader("Distribuição por Status")
+    status_counts = aggregates.counts["status"].sort_values(ascending=False)
+    st.bar_chart(status_counts.rename_axis("status").rename("count"))
+
+# Carga de trabalho dos responsáveis: mapa de calor dos itens abertos por semana do
+# prazo e tabela de itens atrasados e em atenção, montados só a partir dos agregados
+def render_workload(aggregates):
+    st.subheader("Carga de Trabalho por Pessoa")
+    table = aggregates.workload()
+    if table.empty:
+        st.info("Nenhum responsável nos itens filtrados.")
+        return
+    
+    weekly = aggregates.weekly(table.index)
+    if not weekly.empty:
+        persons = list(table.index)
+        chart = alt.Chart(weekly).mark_rect().encode(
+            x=alt.X("yearmonthdate(week):O", title="Semana do prazo", axis=alt.Axis(format="%d/%m/%Y")),
+            y=alt.Y("person:N", title="Responsável", sort=persons),
+            color=alt.Color("items:Q", title="Itens abertos", scale=alt.Scale(scheme="orangered")),
+            tooltip=[
+                alt.Tooltip("person:N", title="Responsável"),
+                alt.Tooltip("yearmonthdate(week):T", title="Semana", format="%d/%m/%Y"),
+                alt.Tooltip("items:Q", title="Itens abertos"),
+            ]
+        ).properties(height=max(120, 22 * len(persons)))
+        st.altair_chart(chart, use_container_width=True)
+    st.dataframe(table, use_container_width=True)
+
+# Resultados parciais de uma busca, usado como on_partial de fetch_all_items: cada
+# chamada recebe só os itens novos, que são somados aos agregados (ver combine) e às
+# primeiras STREAM_PREVIEW_ROWS linhas, e o conteúdo do placeholder é substituído
+class PartialResults:
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+        self.aggregates = None
+        self.preview = pd.DataFrame()
+    
+    def __call__(self, new_items):
+        aggregates = ItemAggregates.from_items(new_items)
+        self.aggregates = aggregates if self.aggregates is None else self.aggregates.combine(aggregates)
+        if len(self.preview) < STREAM_PREVIEW_ROWS:
+            self.preview = pd.concat([self.preview, new_items.head(STREAM_PREVIEW_ROWS - len(self.preview))], ignore_index=True)
+        
+        with self.placeholder.container():
+            st.info(f"Resultados parciais: {self.aggregates.items} itens carregados até agora...")
+            render_statistics(self.aggregates)
+            st.subheader("Itens (parcial)")
+            st.dataframe(self.preview, use_container_width=True)
 
 # Função para o dashboard principal
 def dashboard():
@@ -575,20 +2726,34 @@ def dashboard():
     # Carregar os quadros e extrair informações de status
     if st.sidebar.button("Carregar Dados de Status"):
         with st.spinner("Carregando dados iniciais..."):
-            boards = fetch_all_boards(st.secrets["API_TOKEN"])
-            status_labels_map = extract_status_maps(boards)
-            all_status = get_all_status_values(boards, status_labels_map)
+            try:
+                boards = fetch_all_boards(st.secrets["API_TOKEN"])
+            except MondayAPIError as e:
+                st.error(f"Erro ao buscar quadros: {str(e)}")
+                boards = None
             
-            # Armazenar no estado da sessão
-            st.session_state.all_status = all_status
-            st.session_state.boards_loaded = True
+            if boards is not None:
+                status_labels_map = extract_status_maps(boards)
+                all_status = get_all_status_values(boards, status_labels_map)
+                
+                # Armazenar no estado da sessão
+                st.session_state.all_status = all_status
+                st.session_state.workspaces = sorted({workspace_label(board) for board in boards})
+                st.session_state.boards_loaded = True
+    
+    # Snapshot mais recente gerado por snapshot.py, se houver
+    snapshot = read_snapshot_manifest()
     
-    # Inicializar o estado da sessão se necessário
+    # Inicializar o estado da sessão se necessário; com um snapshot, os status
+    # e áreas de trabalho vêm dele e não é preciso carregar os quadros
     if "all_status" not in st.session_state:
-        st.session_state.all_status = ["Feito", "Em Andamento", "Parado"]
+        st.session_state.all_status = snapshot.get("all_status", ["Feito", "Em Andamento", "Parado"]) if snapshot else ["Feito", "Em Andamento", "Parado"]
     
     if "boards_loaded" not in st.session_state:
-        st.session_state.boards_loaded = False
+        st.session_state.boards_loaded = snapshot is not None
+    
+    if "workspaces" not in st.session_state:
+        st.session_state.workspaces = snapshot.get("workspaces", []) if snapshot else []
         
     # Seleção de datas
     st.sidebar.subheader("Intervalo de Data")
@@ -603,70 +2768,207 @@ def dashboard():
         default=["Feito"]
     )
     
+    # Seleção dos quadros consultados
+    st.sidebar.subheader("Quadros")
+    skip_archived = st.sidebar.checkbox("Ignorar quadros arquivados ou excluídos", value=True)
+    skip_empty = st.sidebar.checkbox("Ignorar quadros vazios", value=True)
+    workspaces = st.sidebar.multiselect(
+        "Espaços de trabalho (vazio = todos)",
+        st.session_state.workspaces,
+        default=[]
+    )
+    max_age_days = st.sidebar.number_input(
+        "Ignorar quadros sem alterações há mais de (dias, 0 = nunca)",
+        min_value=0,
+        value=0,
+        step=30
+    )
+    board_filters = {
+        "skip_archived": skip_archived,
+        "skip_empty": skip_empty,
+        "workspaces": workspaces,
+        "max_age_days": max_age_days,
+    }
+    
+    # Origem dos itens: snapshot pronto ou busca na API
+    use_snapshot = False
+    if snapshot is not None:
+        st.sidebar.subheader("Fonte dos Dados")
+        use_snapshot = st.sidebar.checkbox("Usar snapshot mais recente", value=True)
+        created_at = datetime.fromisoformat(snapshot["created_at"]).astimezone()
+        st.sidebar.caption(f"Snapshot de {created_at.strftime('%d/%m/%Y %H:%M')} com {snapshot['items']} itens.")
+    
+    # Atualizações ao vivo: alterações recebidas por webhook são aplicadas aos dados em memória
+    if WEBHOOK_PORT and st.secrets["API_TOKEN"]:
+        receiver = get_webhook_receiver(st.secrets["API_TOKEN"])
+        st.sidebar.subheader("Atualizações ao Vivo")
+        last_applied = receiver.last_applied_at.strftime("%H:%M:%S") if receiver.last_applied_at else "nenhuma"
+        st.sidebar.caption(f"Webhooks em {receiver.url}: {receiver.applied} alterações aplicadas (última: {last_applied}), {receiver.pending} aguardando nova tentativa.")
+        if receiver.last_error:
+            st.sidebar.warning(f"Erro ao aplicar alterações: {receiver.last_error}")
+    
+    # Configurações de desempenho da busca
+    st.sidebar.subheader("Desempenho")
+    max_workers = st.sidebar.slider(
+        "Quadros buscados em paralelo",
+        min_value=1,
+        max_value=32,
+        value=DEFAULT_MAX_WORKERS
+    )
+    batch_boards = st.sidebar.checkbox(
+        "Agrupar quadros pequenos na mesma consulta",
+        value=True
+    )
+    decode_processes = st.sidebar.number_input(
+        "Processos de decodificação (0 = thread principal)",
+        min_value=0,
+        max_value=os.cpu_count() or 1,
+        value=min(DEFAULT_DECODE_PROCESSES, os.cpu_count() or 1)
+    )
+    
+    # Apenas as colunas de pessoas, data e status são baixadas; outras podem ser incluídas
+    extra_columns_input = st.sidebar.text_input(
+        "Colunas adicionais (IDs ou títulos, separados por vírgula)",
+        value=""
+    )
+    extra_columns = [name.strip() for name in extra_columns_input.split(",") if name.strip()]
+    
+    # Mantém os itens em disco e busca apenas o que mudou desde a última sincronização
+    incremental = st.sidebar.checkbox(
+        "Sincronização incremental (armazenamento local)",
+        value=False
+    )
+    
+    # Envia o intervalo de datas e os status desconsiderados para a API, que devolve
+    # só os itens aceitos (sem efeito na sincronização incremental)
+    pushdown = st.sidebar.checkbox(
+        "Filtrar datas e status no servidor",
+        value=True
+    )
+    
+    # Exibe estatísticas e itens parciais enquanto os quadros chegam
+    show_partial = st.sidebar.checkbox(
+        "Exibir resultados parciais durante a busca",
+        value=True
+    )
+    
+    # Tempo de cada etapa e uso da API na última busca
+    show_diagnostics = st.sidebar.checkbox(
+        "Mostrar diagnóstico de desempenho",
+        value=False
+    )
+    
     # Botão para buscar dados
+    registry = get_dataset_registry()
+    view_filters = (start_date, end_date, tuple(sorted(excluded_status)))
     if st.sidebar.button("Buscar Itens"):
-        if st.secrets["API_TOKEN"]:
+        if use_snapshot:
+            with st.spinner("Carregando snapshot..."):
+                dataset, _ = registry.get_or_build(
+                    f"snapshot:{snapshot['file']}",
+                    lambda: load_snapshot(SNAPSHOT_DIR, snapshot["file"], snapshot["format"]),
+                    source="snapshot"
+                )
+                df = dataset.view(*view_filters) if dataset is not None else None
+            
+            if df is not None and not df.empty:
+                st.session_state.dataset_key = dataset.key
+                st.success(f"Dados carregados do snapshot! {len(df)} itens encontrados.")
+            else:
+                st.warning("Nenhum item encontrado com os filtros selecionados.")
+        elif st.secrets["API_TOKEN"]:
+            partial_placeholder = st.empty()
+            render_partial = PartialResults(partial_placeholder)
+            
+            # Os itens normalizados ficam no registro compartilhado; se outra sessão
+            # acabou de buscar os mesmos quadros, o resultado dela é reaproveitado
+            metrics = FetchMetrics()
             with st.spinner("Buscando itens do Monday.com..."):
-                df = fetch_all_items(
-                    st.secrets["API_TOKEN"], 
-                    start_date=start_date,
-                    end_date=end_date,
-                    excluded_status=excluded_status
+                pushed_filters = view_filters if pushdown and not incremental else None
+                dataset, fetched = registry.get_or_build(
+                    dataset_key(board_filters, extra_columns, pushed_filters),
+                    lambda: fetch_all_items(
+                        st.secrets["API_TOKEN"], 
+                        start_date=start_date,
+                        end_date=end_date,
+                        excluded_status=excluded_status,
+                        max_workers=max_workers,
+                        batch_boards=batch_boards,
+                        extra_columns=extra_columns,
+                        incremental=incremental,
+                        on_partial=render_partial if show_partial else None,
+                        board_filters=board_filters,
+                        metrics=metrics,
+                        raw=True,
+                        pushdown=pushdown,
+                        decode_processes=decode_processes
+                    ),
+                    source="api",
+                    max_age=SHARED_DATASET_MAX_AGE,
+                    pushed_filters=pushed_filters
                 )
+                partial_placeholder.empty()
+                if fetched:
+                    st.session_state.fetch_metrics = metrics
+                df = dataset.view(*view_filters) if dataset is not None else None
                 
                 if df is not None and not df.empty:
-                    st.session_state.data = df
-                    st.success(f"Dados carregados com sucesso! {len(df)} itens encontrados.")
+                    st.session_state.dataset_key = dataset.key
+                    if fetched:
+                        st.success(f"Dados carregados com sucesso! {len(df)} itens encontrados.")
+                    else:
+                        st.success(f"Dados compartilhados carregados (buscados há {dataset.age_seconds() / 60:.0f} min)! {len(df)} itens encontrados.")
                 else:
                     st.warning("Nenhum item encontrado com os filtros selecionados.")
         else:
             st.error("Token de API não configurado corretamente.")
     
-    # Botões para exportar
-    col1, col2 = st.sidebar.columns(2)
-    
-    if col1.button("Exportar CSV"):
-        if "data" in st.session_state and not st.session_state.data.empty:
-            csv = st.session_state.data.to_csv(index=False, encoding="utf-8", sep=";")
-            col1.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"monday_items_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
+    # Itens da sessão, filtrados em memória sobre o conjunto compartilhado; mudar
+    # datas, status ou urgência não exige uma nova busca
+    dataset = session_dataset()
+    data = dataset.view(*view_filters) if dataset is not None else None
+    if dataset is not None and not dataset.covers(*view_filters):
+        st.warning("Os filtros atuais vão além dos que foram aplicados no servidor na última busca; clique em 'Buscar Itens' para buscar os itens que faltam.")
+    
+    # Exportação dos itens filtrados
+    st.sidebar.subheader("Exportar")
+    export_format = st.sidebar.selectbox(
+        "Formato",
+        list(EXPORT_FORMATS),
+        format_func=lambda file_format: EXPORT_FORMATS[file_format][0]
+    )
+    label, extension, mime, compressible = EXPORT_FORMATS[export_format]
+    compress = st.sidebar.checkbox("Compactar (gzip)", value=False, disabled=not compressible) and compressible
+    
+    if st.sidebar.button("Exportar"):
+        if data is not None and not data.empty:
+            with st.spinner(f"Gerando arquivo {label}..."):
+                content = dataset.export(export_format, compress, *view_filters)
+            st.sidebar.download_button(
+                label=f"Download {label}" + (" (gzip)" if compress else ""),
+                data=content,
+                file_name=f"monday_items_{datetime.now().strftime('%Y%m%d')}{extension}" + (".gz" if compress else ""),
+                mime="application/gzip" if compress else mime,
+                on_click="ignore"
             )
         else:
             st.sidebar.warning("Não há dados para exportar.")
     
-    if col2.button("Exportar JSON"):
-        if "data" in st.session_state and not st.session_state.data.empty:
-            json_str = st.session_state.data.to_json(orient="records", force_ascii=False)
-            col2.download_button(
-                label="Download JSON",
-                data=json_str,
-                file_name=f"monday_items_{datetime.now().strftime('%Y%m%d')}.json",
-                mime="application/json"
-            )
+    if show_diagnostics:
+        if "fetch_metrics" in st.session_state:
+            with st.sidebar:
+                render_diagnostics(st.session_state.fetch_metrics)
         else:
-            st.sidebar.warning("Não há dados para exportar.")
+            st.sidebar.info("Busque os itens para ver o diagnóstico de desempenho.")
     
     # Exibir dados se disponíveis
-    if "data" in st.session_state and not st.session_state.data.empty:
-        df = st.session_state.data
+    if data is not None and not data.empty:
+        df = data
         
-        # Mostrar estatísticas
-        st.subheader("Estatísticas")
-        col1, col2, col3 = st.columns(3)
-        col1.metric("Total de Itens", len(df))
-        col2.metric("Responsáveis Únicos", df["persons"].nunique())
-        
-        urgent_count = df[df["urgency"] == "Atrasado"].shape[0]
-        attention_count = df[df["urgency"] == "Atenção"].shape[0]
-        col3.metric("Itens Atrasados/Atenção", f"{urgent_count}/{attention_count}")
-        
-        # Gráfico de status
-        st.subheader("Distribuição por Status")
-        status_counts = df["status"].value_counts()
-        st.bar_chart(status_counts)
+        # Mostrar estatísticas e a carga de trabalho, a partir dos agregados da visão
+        aggregates = dataset.aggregates(*view_filters)
+        render_statistics(aggregates)
+        render_workload(aggregates)
         
         # Tabela com os dados
         st.subheader("Itens")
@@ -684,31 +2986,29 @@ def dashboard():
             # Substituir None por "Sem Classificação" para o filtro
             urgency_mapping = {"Atrasado": "Atrasado", "Atenção": "Atenção", "Sem Classificação": None}
             urgency_values = [urgency_mapping[u] for u in urgency_filter]
-            
-            # Filtrar DataFrame
-            if "Sem Classificação" in urgency_filter:
-                # Necessário tratar None separadamente
-                filtered_df = df[df["urgency"].isin([v for v in urgency_values if v is not None]) | df["urgency"].isna()]
-            else:
-                filtered_df = df[df["urgency"].isin(urgency_values)]
-        
-        # Aplicar estilo à tabela baseado na urgência
-        def highlight_urgency(val):
-            if val == "Atrasado":
-                return 'background-color: #FFCCCC'
-            elif val == "Atenção":
-                return 'background-color: #FFFFCC'
-            else:
-                return ''
+            filtered_df = dataset.view(*view_filters, urgency=urgency_values)
+        
+        # Busca, ordenação e paginação feitas no servidor: só a página atual
+        # é estilizada e enviada ao navegador
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+        search = col1.text_input("Buscar", placeholder="Nome, quadro, grupo, responsável ou status")
+        sort_by = col2.selectbox("Ordenar por", [None] + list(filtered_df.columns), format_func=lambda column: column or "Padrão")
+        descending = col3.selectbox("Ordem", ["Crescente", "Decrescente"]) == "Decrescente"
+        page_size = col4.selectbox("Itens por página", TABLE_PAGE_SIZES, index=1)
         
-        # Mostrar a tabela com highlighting
+        rows = table_rows(filtered_df, search.strip(), sort_by, descending)
+        pages = max(1, -(-len(rows) // page_size))
+        page = st.number_input("Página", min_value=1, max_value=pages, value=1, step=1)
+        start = (page - 1) * page_size
+        page_df = filtered_df.iloc[rows[start:start + page_size]]
+        
+        # Mostrar a página da tabela com highlighting
         st.dataframe(
-            filtered_df.style.applymap(
-                highlight_urgency, 
-                subset=["urgency"]
-            ),
-            use_container_width=True
+            style_urgency(page_df),
+            use_container_width=True,
+            column_config={"date": st.column_config.DateColumn("date", format="DD/MM/YYYY")}
         )
+        st.caption(f"Mostrando {min(start + 1, len(rows))}–{start + len(page_df)} de {len(rows)} itens (página {page} de {pages}).")
     else:
         if not st.session_state.boards_loaded:
             st.info("Clique em 'Carregar Dados de Status' para iniciar a aplicação e carregar os status disponíveis.")
@@ -717,6 +3017,8 @@ def dashboard():
 
 # Função principal
 def main():
+    st.set_page_config(page_title="Monday.com Dashboard", layout="wide")
+    
     # Inicializar o estado de login
     if "logged_in" not in st.session_state:
         st.session_state["logged_in"] = False
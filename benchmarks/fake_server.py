@@ -0,0 +1,335 @@
+# Servidor GraphQL local que imita a API do Monday.com com uma conta sintética.
+# Entende apenas as consultas feitas pelo dashboard (índice e colunas de quadros,
+# usuários, items_page/next_items_page e activity_logs) e calcula uma complexidade
+# aproximada para cada consulta, para que o agendador se comporte como em produção.
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Rótulos de status usados quando a conta não define outros
+DEFAULT_STATUS_LABELS = ["Em Andamento", "Feito", "Parado", "Pendente", "Aguardando", "Em Revisão"]
+
+# Formatos de data "estranhos" usados no texto de algumas colunas de data
+ODD_DATE_FORMATS = ["%d/%m/%Y", "%m-%d-%Y", "%Y/%m/%d", "%d-%m-%Y"]
+
+# Complexidade aproximada por item e por consulta
+ITEM_COST = 10
+COLUMN_VALUE_COST = 1
+QUERY_BASE_COST = 10
+
+# Orçamento de complexidade por minuto da conta sintética
+BUDGET_PER_MINUTE = 10_000_000
+
+
+# Configuração da conta sintética
+class AccountConfig:
+    def __init__(self, boards=50, items=200, columns=10, users=50, status_labels=None,
+                 multi_change_ratio=0.05, odd_date_ratio=0.1, empty_board_ratio=0.1,
+                 archived_board_ratio=0.05, teams=5, team_ratio=0.05, seed=42):
+        self.boards = boards
+        self.items = items
+        self.columns = max(3, columns)
+        self.users = users
+        self.status_labels = status_labels or DEFAULT_STATUS_LABELS
+        self.multi_change_ratio = multi_change_ratio
+        self.odd_date_ratio = odd_date_ratio
+        self.empty_board_ratio = empty_board_ratio
+        self.archived_board_ratio = archived_board_ratio
+        self.teams = teams
+        self.team_ratio = team_ratio
+        self.seed = seed
+
+
+# Conta sintética: quadros, colunas, usuários e itens gerados de forma determinística
+class SyntheticAccount:
+    def __init__(self, config):
+        self.config = config
+        rng = random.Random(config.seed)
+        self.users = [{"id": 1000 + index, "name": f"Usuário {index}"} for index in range(config.users)]
+        self.teams = [{"id": 900 + index, "name": f"Equipe {index}"} for index in range(config.teams)]
+        self.boards = []
+        self.items = {}
+        today = date.today()
+
+        for board_index in range(config.boards):
+            board_id = str(5000000 + board_index)
+            roll = rng.random()
+            empty = roll < config.empty_board_ratio
+            archived = not empty and roll < config.empty_board_ratio + config.archived_board_ratio
+            items_count = 0 if empty else max(1, int(rng.expovariate(1 / config.items)))
+
+            columns = [
+                {"id": "person", "title": "Responsável", "type": "people", "settings_str": "{}"},
+                {"id": "date4", "title": "Prazo", "type": "date", "settings_str": "{}"},
+                {"id": "status", "title": "Status", "type": "status", "settings_str": json.dumps(
+                    {"labels": {str(index): label for index, label in enumerate(config.status_labels)}}
+                )},
+            ]
+            for column_index in range(config.columns - 3):
+                columns.append({"id": f"text{column_index}", "title": f"Texto {column_index}", "type": "text", "settings_str": "{}"})
+
+            groups = [{"id": f"group{index}", "title": f"Grupo {index}"} for index in range(rng.randint(1, 5))]
+            self.boards.append({
+                "id": board_id,
+                "name": f"Quadro {board_index}",
+                "state": "archived" if archived else "active",
+                "board_kind": "public",
+                "items_count": items_count,
+                "updated_at": f"{today - timedelta(days=rng.randint(0, 400))}T12:00:00Z",
+                "workspace": {"id": str(board_index % 4), "name": f"Espaço {board_index % 4}"} if board_index % 4 else None,
+                "columns": columns,
+                "groups": groups,
+            })
+            self.items[board_id] = [
+                self._make_item(rng, board_id, item_index, columns, groups, today)
+                for item_index in range(items_count)
+            ]
+
+    def _make_item(self, rng, board_id, item_index, columns, groups, today):
+        config = self.config
+        due = today + timedelta(days=rng.randint(-90, 90))
+        due_text = due.strftime(rng.choice(ODD_DATE_FORMATS)) if rng.random() < config.odd_date_ratio else due.isoformat()
+        status_index = rng.randrange(len(config.status_labels))
+        if rng.random() < config.multi_change_ratio:
+            status_value = "".join(
+                json.dumps({"index": rng.randrange(len(config.status_labels)), "changed_at": f"2024-0{month}-01T00:00:00Z"})
+                for month in range(1, 4)
+            )
+        else:
+            status_value = json.dumps({"index": status_index, "post_id": None, "changed_at": "2024-01-01T00:00:00Z"})
+        people = [dict(person, kind="person") for person in rng.sample(self.users, k=min(len(self.users), rng.choice([0, 1, 1, 1, 2])))]
+        if self.teams and rng.random() < config.team_ratio:
+            people.append(dict(rng.choice(self.teams), kind="team"))
+
+        column_values = [
+            {"id": "person", "value": json.dumps({"personsAndTeams": [{"id": person["id"], "kind": person["kind"]} for person in people]}) if people else None,
+             "text": ", ".join(person["name"] for person in people)},
+            {"id": "date4", "value": json.dumps({"date": due_text}) if due_text == due.isoformat() else None, "text": due_text},
+            {"id": "status", "value": status_value, "text": config.status_labels[status_index]},
+        ]
+        for column in columns[3:]:
+            text = f"valor {rng.randrange(1000)}"
+            column_values.append({"id": column["id"], "value": json.dumps(text), "text": text})
+
+        group = groups[item_index % len(groups)]
+        return {"id": f"{board_id}{item_index:06d}", "name": f"Item {item_index}", "group": {"id": group["id"], "title": group["title"]},
+                "column_values": column_values}
+
+    @property
+    def total_items(self):
+        return sum(len(items) for items in self.items.values())
+
+
+# Resolvedor das consultas GraphQL usadas pelo dashboard, baseado em expressões regulares
+class FakeMondayAPI:
+    def __init__(self, account):
+        self.account = account
+        self.boards_by_id = {board["id"]: board for board in account.boards}
+        self._lock = threading.Lock()
+        self.budget = BUDGET_PER_MINUTE
+        self.budget_reset_at = time.monotonic() + 60
+        self.requests = 0
+        self.bytes_sent = 0
+        self._rule_sets = []
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    # Valor de uma coluna do item usado nas regras de query_params
+    def _rule_value(self, item, column_id):
+        column_value = next((cv for cv in item["column_values"] if cv["id"] == column_id), None)
+        if column_value is None:
+            return None
+        if column_id == "status":
+            labels = self.account.config.status_labels
+            return labels.index(column_value["text"]) if column_value["text"] in labels else None
+        if column_value["value"]:
+            return json.loads(column_value["value"]).get("date")
+        for date_format in ODD_DATE_FORMATS:
+            try:
+                return datetime.strptime(column_value["text"], date_format).date().isoformat()
+            except ValueError:
+                continue
+        return None
+
+    # Itens de um quadro que atendem às regras (between e not_any_of; as demais são ignoradas)
+    def _filtered_items(self, board_id, rule_set):
+        items = self.account.items.get(board_id, [])
+        for column_id, compare_value, operator in self._rule_sets[rule_set] if rule_set is not None else []:
+            if operator == "between":
+                start, end = compare_value
+                items = [item for item in items if (value := self._rule_value(item, column_id)) and start <= value <= end]
+            elif operator == "not_any_of":
+                items = [item for item in items if self._rule_value(item, column_id) not in compare_value]
+        return items
+
+    # Registra as regras de query_params da consulta; o índice segue nos cursores
+    def _parse_rule_set(self, query):
+        params = re.search(r"query_params: \{rules: \[(.*?)\], operator: and\}", query)
+        if not params:
+            return None
+        rules = tuple(
+            (column_id, tuple(json.loads("[" + compare_value + "]")), operator)
+            for column_id, compare_value, operator in re.findall(
+                r'\{column_id: "([^"]+)", compare_value: \[([^\]]*)\], operator: (\w+)\}', params.group(1)
+            )
+        )
+        with self._lock:
+            if rules not in self._rule_sets:
+                self._rule_sets.append(rules)
+            return self._rule_sets.index(rules)
+
+    # Página de itens de um quadro a partir de um deslocamento, com projeção de colunas
+    def _page(self, board_id, offset, limit, column_ids, include_columns, rule_set=None):
+        items = self._filtered_items(board_id, rule_set)
+        page = items[offset:offset + limit]
+        if not include_columns:
+            page = [{key: value for key, value in item.items() if key != "column_values"} for item in page]
+        elif column_ids is not None:
+            page = [dict(item, column_values=[cv for cv in item["column_values"] if cv["id"] in column_ids]) for item in page]
+        next_offset = offset + limit
+        suffix = f":{rule_set}" if rule_set is not None else ""
+        cursor = f"{board_id}:{next_offset}{suffix}" if next_offset < len(items) else None
+        return {"cursor": cursor, "items": page}
+
+    # Usuários ou equipes, filtrados por ids e paginados por limit/page (sem argumentos, todos)
+    def _directory_page(self, entries, arguments):
+        arguments = arguments or ""
+        ids = re.search(r"ids: \[([^\]]*)\]", arguments)
+        if ids:
+            wanted = {int(value) for value in ids.group(1).split(",") if value.strip()}
+            entries = [entry for entry in entries if entry["id"] in wanted]
+        limit = re.search(r"limit: (\d+)", arguments)
+        if limit:
+            page = re.search(r"page: (\d+)", arguments)
+            offset = (int(page.group(1)) - 1) * int(limit.group(1)) if page else 0
+            entries = entries[offset:offset + int(limit.group(1))]
+        return entries
+
+    def resolve(self, query):
+        data = {}
+        cost = QUERY_BASE_COST
+        include_columns = "column_values" in query
+        projection = re.search(r"column_values\(ids: \[([^\]]*)\]\)", query)
+        column_ids = set(json.loads("[" + projection.group(1) + "]")) if projection else None
+        per_item_cost = ITEM_COST + COLUMN_VALUE_COST * (len(column_ids) if column_ids is not None else self.account.config.columns)
+
+        users = re.search(r"\busers\s*(?:\(([^)]*)\))?\s*\{", query)
+        if users:
+            data["users"] = self._directory_page(self.account.users, users.group(1))
+            cost += len(data["users"])
+        teams = re.search(r"\bteams\s*(?:\(([^)]*)\))?\s*\{", query)
+        if teams:
+            data["teams"] = self._directory_page(self.account.teams, teams.group(1))
+            cost += len(data["teams"])
+
+        index = re.search(r"boards \(state: all, limit: (\d+), page: (\d+)\)", query)
+        if index:
+            limit, page = int(index.group(1)), int(index.group(2))
+            fields = ["id", "name", "state", "board_kind", "items_count", "updated_at", "workspace"]
+            boards = self.account.boards[(page - 1) * limit:page * limit]
+            data["boards"] = [{field: board.get(field) for field in fields} for board in boards]
+            cost += limit
+
+        schemas = re.search(r"boards \(ids: \[([^\]]*)\], limit: \d+\)", query)
+        if schemas:
+            ids = [board_id.strip() for board_id in schemas.group(1).split(",")]
+            data["boards"] = [
+                {"id": board_id, "columns": self.boards_by_id[board_id]["columns"], "groups": self.boards_by_id[board_id]["groups"]}
+                for board_id in ids if board_id in self.boards_by_id
+            ]
+            cost += 10 * len(ids)
+
+        items = re.search(r"boards\(ids: \[([^\]]*)\](?:, limit: \d+)?\)", query)
+        if items:
+            ids = [board_id.strip() for board_id in items.group(1).split(",")]
+            page_limit = re.search(r"items_page\(limit: (\d+)", query)
+            activity = "activity_logs" in query
+            rule_set = self._parse_rule_set(query)
+            boards = []
+            for board_id in ids:
+                if board_id not in self.boards_by_id:
+                    continue
+                board = {"id": board_id}
+                if page_limit:
+                    board["items_page"] = self._page(board_id, 0, int(page_limit.group(1)), column_ids, include_columns, rule_set)
+                if activity:
+                    board["activity_logs"] = []
+                boards.append(board)
+            data["boards"] = boards
+            if page_limit:
+                cost += int(page_limit.group(1)) * len(ids) * per_item_cost
+
+        for alias, limit, cursor in re.findall(r'(\w+): next_items_page\(limit: (\d+), cursor: "([^"]+)"\)', query):
+            board_id, offset, *rule_set = cursor.split(":")
+            rule_set = int(rule_set[0]) if rule_set else None
+            data[alias] = self._page(board_id, int(offset), int(limit), column_ids, include_columns, rule_set)
+            cost += int(limit) * per_item_cost
+
+        with self._lock:
+            now = time.monotonic()
+            if now >= self.budget_reset_at:
+                self.budget = BUDGET_PER_MINUTE
+                self.budget_reset_at = now + 60
+            before = self.budget
+            self.budget = max(0, self.budget - cost)
+            reset_in = int(self.budget_reset_at - now)
+
+        if "complexity" in query:
+            data["complexity"] = {"before": before, "after": self.budget, "query": cost, "reset_in_x_seconds": reset_in}
+        return {"data": data}
+
+
+# Servidor HTTP que atende a API sintética, com latência opcional por requisição
+class FakeMondayServer:
+    def __init__(self, account, host="127.0.0.1", port=0, latency=0.0):
+        self.api = FakeMondayAPI(account)
+        self.latency = latency
+        api = self.api
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if server.latency:
+                    time.sleep(server.latency)
+                body = json.dumps(api.resolve(payload.get("query", ""))).encode("utf-8")
+                with api._lock:
+                    api.requests += 1
+                    api.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,201 @@
+# Benchmark de ponta a ponta do dashboard contra o servidor GraphQL sintético,
+# sem acessar a API real. Mede cada etapa da busca e do processamento e informa
+# tempo, vazão (itens/s), requisições, bytes baixados e pico de memória.
+#
+# Uso (a partir da raiz do repositório):
+#     python -m benchmarks.run --boards 100 --items 500 --columns 40 --latency 0.05
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fake_server import AccountConfig, FakeMondayServer, SyntheticAccount
+
+# Token qualquer: o servidor sintético não valida autenticação
+BENCHMARK_TOKEN = "benchmark"
+
+
+# Executa uma etapa medindo tempo, memória e o tráfego registrado pelo servidor
+def measure(results, server, name, func, count_items=None, trace_memory=True):
+    server.api.reset_counters()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    items = count_items(result) if count_items else None
+    results.append({
+        "stage": name,
+        "seconds": elapsed,
+        "items": items,
+        "items_per_second": items / elapsed if items and elapsed else None,
+        "requests": server.api.requests,
+        "bytes_downloaded": server.api.bytes_sent,
+        "peak_memory_bytes": peak if trace_memory else None,
+    })
+    return result
+
+
+# Executa todas as etapas do dashboard contra o servidor sintético
+def run_benchmark(args):
+    config = AccountConfig(
+        boards=args.boards,
+        items=args.items,
+        columns=args.columns,
+        users=args.users,
+        status_labels=args.status_labels.split(",") if args.status_labels else None,
+        multi_change_ratio=args.multi_change_ratio,
+        odd_date_ratio=args.odd_date_ratio,
+        seed=args.seed,
+    )
+    account = SyntheticAccount(config)
+    server = FakeMondayServer(account, latency=args.latency).start()
+
+    # O app lê o endereço da API e o transporte ao ser importado
+    os.environ["MONDAY_API_URL"] = server.url
+    os.environ["MONDAY_TRANSPORT"] = args.transport
+    import pandas as pd
+    from headless import quiet_streamlit
+    quiet_streamlit()
+    import app
+    import item_decoding
+
+    trace = not args.no_memory
+    results = []
+    try:
+        boards = measure(results, server, "fetch_all_boards", lambda: app.query_all_boards(BENCHMARK_TOKEN), len, trace)
+        user_map = measure(results, server, "get_user_map", lambda: app.get_user_map(BENCHMARK_TOKEN), len, trace)
+        status_labels_map = app.extract_status_maps(boards)
+        column_maps = [app.resolve_column_map(board) for board in boards]
+
+        def fetch_items():
+            return [
+                app.query_items_batch((board["id"],), BENCHMARK_TOKEN, column_ids=app.projected_column_ids(column_map))[str(board["id"])]
+                for board, column_map in zip(boards, column_maps)
+            ]
+        items_by_board = measure(results, server, "fetch_items", fetch_items, lambda result: sum(map(len, result)), trace)
+
+        def process_items():
+            return [
+                item_decoding.process_item(item, board, user_map, column_map, status_labels_map)
+                for board, column_map, items in zip(boards, column_maps, items_by_board)
+                for item in items
+            ]
+        processed = measure(results, server, "process_item", process_items, len, trace)
+
+        def normalize_items():
+            decoder = item_decoding.ColumnDecoder(status_labels_map)
+            return [
+                item_decoding.resolve_persons(item_decoding.BoardNormalizer(board, column_map, status_labels_map, decoder).normalize(items)[0], user_map)
+                for board, column_map, items in zip(boards, column_maps, items_by_board)
+            ]
+        frames = measure(results, server, "normalize (BoardNormalizer)", normalize_items, lambda result: sum(map(len, result)), trace)
+
+        if args.decode_processes:
+            # Processos já iniciados antes da medição, como no servidor do dashboard
+            pool = app.get_decode_pool(args.decode_processes)
+            list(pool.map(abs, range(args.decode_processes)))
+
+            def decode_items():
+                futures = [
+                    pool.submit(
+                        item_decoding.decode_page,
+                        item_decoding.page_spec(board["name"], {g["id"]: g["title"] for g in board.get("groups", [])}, column_map, status_labels_map, str(board["id"])),
+                        items
+                    )
+                    for board, column_map, items in zip(boards, column_maps, items_by_board)
+                ]
+                return [future.result()[0] for future in futures]
+            measure(results, server, f"decode_page ({args.decode_processes} processos)", decode_items, lambda result: sum(len(columns[0]) for columns in result), trace)
+
+        df = measure(results, server, "DataFrame (process_item)", lambda: pd.DataFrame(processed), len, trace)
+        measure(results, server, "DataFrame (concat)", lambda: pd.concat(frames, ignore_index=True), len, trace)
+
+        df_processed = measure(
+            results, server, "process_dates_and_add_urgency",
+            lambda: app.process_dates_and_add_urgency(df), len, trace
+        )
+
+        # Exportação pelo mesmo caminho do botão do dashboard, em todos os formatos
+        for file_format, (label, _, _, compressible) in app.EXPORT_FORMATS.items():
+            for compress in (False, True) if compressible else (False,):
+                measure(
+                    results, server, f"export_items {label}" + (" (gzip)" if compress else ""),
+                    lambda: app.export_items(df_processed, file_format, compress), lambda _: len(df_processed), trace
+                )
+
+        measure(
+            results, server, "fetch_all_items (ponta a ponta)",
+            lambda: app.fetch_all_items(BENCHMARK_TOKEN, max_workers=args.workers, batch_boards=not args.no_batch, decode_processes=args.decode_processes),
+            lambda result: 0 if result is None else len(result), trace
+        )
+    finally:
+        server.stop()
+
+    return {
+        "account": {"boards": len(account.boards), "items": account.total_items, "columns": config.columns},
+        "latency": args.latency,
+        "transport": args.transport,
+        "results": results,
+    }
+
+
+# Formata o relatório como tabela de texto
+def format_report(report):
+    account = report["account"]
+    lines = [
+        f"Conta sintética: {account['boards']} quadros, {account['items']} itens, {account['columns']} colunas "
+        f"(latência {report['latency'] * 1000:.0f} ms, transporte {report['transport']})",
+        "",
+        f"{'Etapa':<34}{'Tempo (s)':>11}{'Itens':>10}{'Itens/s':>12}{'Req.':>7}{'MB baixados':>13}{'Pico MB':>10}",
+    ]
+    for row in report["results"]:
+        items = "" if row["items"] is None else str(row["items"])
+        rate = "" if row["items_per_second"] is None else f"{row['items_per_second']:.0f}"
+        peak = "" if row["peak_memory_bytes"] is None else f"{row['peak_memory_bytes'] / 1e6:.1f}"
+        lines.append(
+            f"{row['stage']:<34}{row['seconds']:>11.3f}{items:>10}{rate:>12}{row['requests']:>7}"
+            f"{row['bytes_downloaded'] / 1e6:>13.2f}{peak:>10}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline do dashboard Monday.com")
+    parser.add_argument("--boards", type=int, default=50, help="quantidade de quadros")
+    parser.add_argument("--items", type=int, default=200, help="média de itens por quadro")
+    parser.add_argument("--columns", type=int, default=10, help="colunas por quadro")
+    parser.add_argument("--users", type=int, default=50, help="quantidade de usuários")
+    parser.add_argument("--status-labels", default="", help="rótulos de status separados por vírgula")
+    parser.add_argument("--multi-change-ratio", type=float, default=0.05, help="fração de status com várias alterações")
+    parser.add_argument("--odd-date-ratio", type=float, default=0.1, help="fração de datas em formatos alternativos")
+    parser.add_argument("--latency", type=float, default=0.0, help="latência simulada por requisição (segundos)")
+    parser.add_argument("--workers", type=int, default=8, help="quadros buscados em paralelo em fetch_all_items")
+    parser.add_argument("--no-batch", action="store_true", help="não agrupar quadros pequenos")
+    parser.add_argument("--decode-processes", type=int, default=0, help="processos de decodificação (0 = thread principal)")
+    parser.add_argument("--transport", default="requests", help="transporte HTTP (requests ou httpx)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="não medir o pico de memória (mais rápido)")
+    parser.add_argument("--json", help="grava o relatório em JSON neste arquivo")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
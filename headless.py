@@ -0,0 +1,13 @@
+# Uso do app.py fora do "streamlit run" (snapshot.py, webhooks.py, benchmarks e testes):
+# os elementos de UI e os caches não têm efeito visível e só geram avisos.
+import logging
+
+from streamlit import config as streamlit_config
+from streamlit import logger as streamlit_logger
+
+
+# Desliga os avisos do Streamlit; deve ser chamada antes de importar o app
+def quiet_streamlit():
+    streamlit_config.set_option("logger.level", "error")
+    streamlit_config.set_option("global.showWarningOnDirectExecution", False)
+    streamlit_logger.set_log_level(logging.ERROR)
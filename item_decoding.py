@@ -0,0 +1,415 @@
+# Decodificação dos itens do Monday.com nas linhas do dashboard: valores de coluna
+# (status, datas, pessoas e demais tipos), o decodificador com cache e o normalizador
+# das páginas de itens de um quadro. Não depende do Streamlit, para que as páginas
+# possam ser decodificadas também em processos auxiliares (ver decode_items_response).
+import functools
+import json
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from monday_client import json_loads
+
+# Tipos de coluna do Monday tratados por extract_column_value com nome diferente
+EXTRACT_COLUMN_TYPES = {"people": "person"}
+
+# Mapeamento fixo de status, com prioridade sobre os rótulos do quadro
+STATUS_MAPPING = {
+    "0": "Em Andamento",
+    "1": "Feito",
+    "2": "Parado"
+}
+
+# Máximo de valores distintos guardados no cache de decodificação
+DECODER_CACHE_SIZE = 65536
+
+# Função para traduzir o índice de um status para o rótulo
+def status_label(column_id, index, text, status_labels_map):
+    # Verificar se o índice está no mapeamento fixo (prioridade)
+    if index in STATUS_MAPPING:
+        return STATUS_MAPPING[index]
+    
+    # Caso contrário, verificar se temos um mapeamento no status_labels_map
+    if column_id in status_labels_map and index in status_labels_map[column_id]:
+        return status_labels_map[column_id][index]
+    
+    # Se não houver mapeamento, usar o texto se disponível
+    return text if text else f"Status {index}"
+
+# Decodificador de colunas de status
+def decode_status(column_id, value, text, status_labels_map):
+    try:
+        parsed_value = json_loads(value)
+        
+        # Caso 1: Formato padrão do Monday com index
+        if isinstance(parsed_value, dict) and "index" in parsed_value:
+            return status_label(column_id, str(parsed_value.get("index")), text, status_labels_map)
+        
+        # Caso 2: Formato com label explícito
+        elif isinstance(parsed_value, dict) and "label" in parsed_value:
+            if isinstance(parsed_value["label"], dict):
+                return parsed_value["label"].get("text", text if text else "No status")
+            return str(parsed_value["label"])
+        
+        # Caso 3: Outros formatos (como múltiplas alterações)
+        elif re.search(r'\{.*?\}\{.*?\}', value):
+            # Extrair o último status com changed_at
+            matches = re.findall(r'\{.*?"index":\s*(\d+).*?"changed_at":\s*"([^"]+)".*?\}', value)
+            if matches:
+                # Ordenar por data e pegar o mais recente
+                matches.sort(key=lambda x: x[1], reverse=True)
+                return status_label(column_id, matches[0][0], text, status_labels_map)
+        
+        # Caso padrão: usar o texto ou valor bruto
+        return text if text else str(parsed_value)
+            
+    except json.JSONDecodeError:
+        # Se o valor não for JSON, usar o texto ou tratar como valor direto
+        if text and text != "":
+            return text
+        return "No status"
+
+# Decodificador de colunas de data
+def decode_date(column_id, value, text, status_labels_map):
+    try:
+        parsed_value = json_loads(value)
+        if isinstance(parsed_value, dict) and "date" in parsed_value:
+            return parsed_value["date"]
+        return text if text else str(parsed_value)
+    except json.JSONDecodeError:
+        return text if text else "No date"
+
+# Decodificador de colunas de pessoas (IDs separados por vírgula)
+def decode_person_ids(column_id, value, text, status_labels_map):
+    try:
+        parsed_value = json_loads(value)
+        if isinstance(parsed_value, dict) and "personsAndTeams" in parsed_value:
+            persons = []
+            for person in parsed_value["personsAndTeams"]:
+                if person.get("kind") == "person":
+                    persons.append(str(person.get("id", "")))
+            return ",".join(persons)
+        return text if text else "No person"
+    except json.JSONDecodeError:
+        return text if text else "No person"
+
+# Decodificador genérico para os demais tipos de coluna
+def decode_generic(column_id, value, text, status_labels_map):
+    try:
+        parsed_value = json_loads(value)
+        if isinstance(parsed_value, dict):
+            for key in ["text", "label", "value", "name"]:
+                if key in parsed_value:
+                    if isinstance(parsed_value[key], dict):
+                        return parsed_value[key].get("text", str(parsed_value[key]))
+                    return str(parsed_value[key])
+            return text if text else str(parsed_value)
+        else:
+            return str(parsed_value)
+    except json.JSONDecodeError:
+        return text if text else value
+
+# Decodificadores por tipo de coluna; tipos ausentes usam decode_generic
+COLUMN_DECODERS = {
+    "status": decode_status,
+    "date": decode_date,
+    "person": decode_person_ids,
+}
+
+# Função ajustada para extrair valores de coluna
+def extract_column_value(column_id, column_type, column_values, status_labels_map):
+    if not column_id or column_id not in column_values:
+        return f"No {column_type}"
+    
+    value = column_values[column_id].get("value")
+    text = column_values[column_id].get("text", "")
+    
+    # Se não houver valor, usar texto se disponível
+    if not value:
+        return text if text else f"No {column_type}"
+    
+    decoder = COLUMN_DECODERS.get(column_type, decode_generic)
+    return decoder(column_id, value, text, status_labels_map)
+
+# Decodificador com cache LRU de (coluna, valor bruto, texto) para o valor decodificado.
+# Colunas de status e pessoas repetem poucos valores milhares de vezes, então o custo
+# passa a ser proporcional aos valores distintos e não à quantidade de linhas.
+# O cache vale para um único conjunto de rótulos de status. As colunas de pessoas são
+# decodificadas na chave de referências de encode_person_refs, sem nomes: os nomes
+# são resolvidos depois, por resolve_persons, com o diretório de usuários da vez.
+class ColumnDecoder:
+    def __init__(self, status_labels_map, maxsize=DECODER_CACHE_SIZE):
+        self.status_labels_map = status_labels_map
+        self._decode = functools.lru_cache(maxsize=maxsize)(self._decode_uncached)
+
+    # Mesmas regras de extract_column_value, com cache
+    def decode(self, column_id, column_type, column_values):
+        if not column_id or column_id not in column_values:
+            return f"No {column_type}"
+        column_value = column_values[column_id]
+        return self._decode(column_id, column_type, column_value.get("value"), column_value.get("text", ""))
+
+    # Chave das pessoas e equipes de uma coluna de pessoas, com cache
+    def decode_persons(self, column_id, column_values):
+        if not column_id or column_id not in column_values:
+            return ""
+        column_value = column_values[column_id]
+        return self._decode(column_id, "persons", column_value.get("value"), column_value.get("text", ""))
+
+    def _decode_uncached(self, column_id, column_type, value, text):
+        if column_type == "persons":
+            return encode_person_refs(person_refs(value, text))
+        if not value:
+            return text if text else f"No {column_type}"
+        decoder = COLUMN_DECODERS.get(column_type, decode_generic)
+        return decoder(column_id, value, text, self.status_labels_map)
+
+    # Acertos, falhas e tamanho atual do cache
+    def cache_info(self):
+        info = self._decode.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+# Colunas dos itens exibidos no dashboard, antes das colunas adicionais
+ITEM_COLUMNS = ["id", "name", "group", "board", "persons", "date", "status"]
+
+# Coluna com o ID do quadro de cada item (os nomes dos quadros podem se repetir)
+BOARD_ID_COLUMN = "board_id"
+
+# Coluna com a chave das pessoas e equipes de cada item (ver encode_person_refs)
+PERSON_IDS_COLUMN = "person_ids"
+
+# Coluna com o nome de cada referência da chave, em JSON: [["person:1", "Ana"], ...]
+# (ver resolve_persons); nomes de pessoas podem ter vírgula, então não são separados
+PERSON_NAMES_COLUMN = "person_names"
+
+# Colunas do resultado normalizado, antes das colunas adicionais: no lugar dos nomes
+# das pessoas vem a chave das referências, e os nomes entram com resolve_persons
+NORMALIZED_COLUMNS = ["id", "name", "group", "board", BOARD_ID_COLUMN, PERSON_IDS_COLUMN, "date", "status"]
+
+# Colunas do resultado normalizado que não são exibidas no dashboard
+INTERNAL_COLUMNS = [BOARD_ID_COLUMN, PERSON_IDS_COLUMN, PERSON_NAMES_COLUMN]
+
+# Normalizador dos itens de um quadro: grupos, colunas e nome do quadro são
+# resolvidos uma única vez e cada página de itens é convertida diretamente em colunas
+class BoardNormalizer:
+    def __init__(self, board_data, column_map, status_labels_map, decoder=None, plan=None):
+        self.board = board_data.get("name", "No board")
+        self.board_id = str(board_data["id"]) if board_data.get("id") is not None else None
+        self.decoder = decoder or ColumnDecoder(status_labels_map)
+        self.group_map = plan["group_map"] if plan else {g["id"]: g["title"] for g in board_data.get("groups", [])}
+        self.person_column_id = column_map.get("person_column_id")
+        self.date_column_id = column_map.get("date_column_id")
+        self.status_column_id = column_map.get("status_column_id")
+
+        # Colunas adicionais escolhidas pelo usuário, nomeadas pelo título
+        self.extra_columns = []
+        self.column_names = list(NORMALIZED_COLUMNS)
+        for column in column_map.get("extra_columns", []):
+            key = column["title"] if column["title"] not in self.column_names else f"{column['title']} ({column['id']})"
+            column_type = EXTRACT_COLUMN_TYPES.get(column["type"], column["type"])
+            self.extra_columns.append((column["id"], column_type))
+            self.column_names.append(key)
+
+    # Converte um item em uma tupla com os valores na ordem de column_names
+    def normalize_item(self, item):
+        column_values = {cv["id"]: cv for cv in item.get("column_values", [])}
+
+        group_id = item["group"]["id"] if item.get("group") else None
+        group = self.group_map.get(group_id, "No group") if group_id else "No group"
+
+        persons = self.decoder.decode_persons(self.person_column_id, column_values)
+        date = self.decoder.decode(self.date_column_id, "date", column_values)
+        status = self.decoder.decode(self.status_column_id, "status", column_values)
+
+        row = (item.get("id", "No ID"), item.get("name", "No name"), group, self.board, self.board_id, persons, date, status)
+        extra = tuple(
+            self.decoder.decode(column_id, column_type, column_values)
+            for column_id, column_type in self.extra_columns
+        )
+        return row + extra
+
+    # Campos alterados por novos valores de coluna de um item (eventos de webhook),
+    # pelo nome da coluna no DataFrame; colunas não usadas pelo dashboard são ignoradas
+    def column_fields(self, column_values):
+        column_values = {cv["id"]: cv for cv in column_values}
+        fields = {}
+        if self.person_column_id in column_values:
+            fields[PERSON_IDS_COLUMN] = self.decoder.decode_persons(self.person_column_id, column_values)
+        if self.date_column_id in column_values:
+            fields["date"] = self.decoder.decode(self.date_column_id, "date", column_values)
+        if self.status_column_id in column_values:
+            fields["status"] = self.decoder.decode(self.status_column_id, "status", column_values)
+        for (column_id, column_type), name in zip(self.extra_columns, self.column_names[len(NORMALIZED_COLUMNS):]):
+            if column_id in column_values:
+                fields[name] = self.decoder.decode(column_id, column_type, column_values)
+        return fields
+
+    # Converte uma página de itens em colunas (uma tupla de valores por coluna, na ordem
+    # de column_names); itens com erro são devolvidos em uma lista de (id do item,
+    # mensagem) sem interromper a página
+    def normalize_columns(self, items):
+        rows = []
+        errors = []
+        for item in items:
+            try:
+                rows.append(self.normalize_item(item))
+            except Exception as e:
+                errors.append((item.get("id", "desconhecido"), str(e)))
+        columns = list(zip(*rows)) if rows else [()] * len(self.column_names)
+        return columns, errors
+
+    # Converte uma página de itens em um DataFrame (ver normalize_columns)
+    def normalize(self, items):
+        columns, errors = self.normalize_columns(items)
+        return columns_frame(self.column_names, columns), errors
+
+# Função para processar um item e extrair os campos desejados, com os nomes das pessoas
+def process_item(item, board_data, user_map, column_map, status_labels_map, team_map=None):
+    normalizer = BoardNormalizer(board_data, column_map, status_labels_map)
+    values = dict(zip(normalizer.column_names, normalizer.normalize_item(item)))
+    values["persons"] = persons_from_refs(decode_person_refs(values.pop(PERSON_IDS_COLUMN)), user_map, team_map)
+    return {name: values[name] for name in ITEM_COLUMNS + normalizer.column_names[len(NORMALIZED_COLUMNS):]}
+
+# Função para montar o DataFrame de uma página a partir das colunas normalizadas
+def columns_frame(column_names, columns):
+    return pd.DataFrame(
+        {name: pd.Series(values, dtype=object) for name, values in zip(column_names, columns)},
+        columns=column_names
+    )
+
+# Função para extrair as referências de uma coluna de pessoas: uma tupla de
+# (tipo, ID) de pessoas e equipes ou, se o valor não for JSON, o texto da coluna
+def person_refs(value, text):
+    if not value:
+        return ()
+    try:
+        parsed_value = json_loads(value)
+    except json.JSONDecodeError:
+        return text or ()
+    if not isinstance(parsed_value, dict):
+        return ()
+    return tuple(
+        (entry.get("kind"), str(entry.get("id", "")))
+        for entry in parsed_value.get("personsAndTeams") or []
+        if entry.get("kind") in ("person", "team")
+    )
+
+# Função para converter as referências de person_refs em uma chave de texto, que pode
+# ser guardada e comparada: "person:1,team:2", "" sem pessoas ou "text:..." para o
+# texto de um valor que não é JSON (IDs do Monday nunca têm vírgula)
+def encode_person_refs(refs):
+    if isinstance(refs, str):
+        return "text:" + refs
+    return ",".join(f"{kind}:{entity_id}" for kind, entity_id in refs)
+
+# Função inversa de encode_person_refs: tupla de (tipo, ID), com ("text", texto)
+# para o texto de um valor que não é JSON
+def decode_person_refs(key):
+    if not key or not isinstance(key, str):
+        return ()
+    if key.startswith("text:"):
+        return (("text", key[len("text:"):]),)
+    return tuple(tuple(ref.split(":", 1)) for ref in key.split(","))
+
+# Função para listar [chave da referência, nome] de cada referência, com a chave de
+# encode_person_refs ("person:1"); sem team_map, as equipes ficam de fora
+def named_refs(refs, user_map, team_map=None):
+    named = []
+    for kind, entity_id in refs:
+        if kind == "person":
+            name = user_map.get(entity_id, f"Unknown User {entity_id}")
+        elif kind == "team" and team_map is not None:
+            name = team_map.get(entity_id, f"Unknown Team {entity_id}")
+        elif kind == "text":
+            name = entity_id
+        else:
+            continue
+        named.append([f"{kind}:{entity_id}", name])
+    return named
+
+# Função para listar os nomes de cada referência; sem team_map, as equipes ficam de fora
+def person_names(refs, user_map, team_map=None):
+    return [name for _, name in named_refs(refs, user_map, team_map)]
+
+# Função para converter referências nos nomes exibidos, separados por vírgula
+def persons_from_refs(refs, user_map, team_map=None):
+    names = person_names(refs, user_map, team_map)
+    return ", ".join(names) if names else "No person"
+
+# Função para acrescentar a itens normalizados a coluna persons (nomes exibidos), antes
+# da coluna de referências, e PERSON_NAMES_COLUMN, depois dela. Cada combinação
+# distinta de pessoas é resolvida uma vez.
+def resolve_persons(frame, user_map, team_map=None):
+    codes, keys = pd.factorize(frame[PERSON_IDS_COLUMN].fillna("").astype(str))
+    named = [named_refs(decode_person_refs(key), user_map, team_map) for key in keys]
+    names = np.array([", ".join(name for _, name in pairs) or "No person" for pairs in named], dtype=object)
+    pairs = np.array([json.dumps(pairs, ensure_ascii=False) for pairs in named], dtype=object)
+    frame = frame.drop(columns=["persons", PERSON_NAMES_COLUMN], errors="ignore")
+    frame.insert(frame.columns.get_loc(PERSON_IDS_COLUMN), "persons", pd.Series(names[codes], index=frame.index, dtype=object))
+    frame.insert(frame.columns.get_loc(PERSON_IDS_COLUMN) + 1, PERSON_NAMES_COLUMN, pd.Series(pairs[codes], index=frame.index, dtype=object))
+    return frame
+
+# Função para listar os IDs de pessoas e de equipes citados em chaves de referências
+def referenced_ids(keys):
+    person_ids, team_ids = set(), set()
+    for key in set(keys):
+        for kind, entity_id in decode_person_refs(key):
+            if kind == "person":
+                person_ids.add(entity_id)
+            elif kind == "team":
+                team_ids.add(entity_id)
+    return person_ids, team_ids
+
+# Descrição de um quadro enviada aos processos de decodificação (JSON, para servir de
+# chave de cache): nome, mapa de grupos, colunas identificadas, rótulos de status e ID
+def page_spec(board_name, group_map, column_map, status_labels_map, board_id=None):
+    return json.dumps([board_name, group_map, column_map, status_labels_map, board_id], sort_keys=True)
+
+# Normalizador de um quadro dentro de um processo de decodificação; cada processo
+# guarda os seus, com o cache de valores do decodificador entre uma página e outra
+@functools.lru_cache(maxsize=256)
+def page_normalizer(spec):
+    board_name, group_map, column_map, status_labels_map, board_id = json.loads(spec)
+    decoder = ColumnDecoder(status_labels_map)
+    return BoardNormalizer({"name": board_name, "id": board_id}, column_map, status_labels_map, decoder, {"group_map": group_map})
+
+# Função executada nos processos de decodificação: normaliza uma página de itens e
+# devolve as colunas e os erros de normalize_columns
+def decode_page(spec, items):
+    return page_normalizer(spec).normalize_columns(items)
+
+# Página de itens normalizada em um processo de decodificação: nomes das colunas,
+# valores (ver normalize_columns) e erros dos itens
+class DecodedPage(namedtuple("DecodedPage", ["column_names", "columns", "errors"])):
+    __slots__ = ()
+
+    @property
+    def item_count(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def frame(self):
+        return columns_frame(self.column_names, self.columns)
+
+    # Chaves de referências das pessoas de cada item (ver encode_person_refs)
+    def person_keys(self):
+        return self.columns[self.column_names.index(PERSON_IDS_COLUMN)]
+
+# Função executada nos processos de decodificação: converte o corpo bruto (bytes) de
+# uma resposta de itens em JSON e troca a lista de itens de cada página por uma
+# DecodedPage. specs traz o page_spec de cada página, pelo ID do quadro nas primeiras
+# páginas (boards(ids: [...])) e pelo alias (page_0, ...) nas de next_items_page.
+def decode_items_response(content, specs):
+    data = json_loads(content)
+    root = data.get("data") if isinstance(data, dict) else None
+    if not isinstance(root, dict):
+        return data
+    pages = [(str(board.get("id")), board.get("items_page")) for board in root.get("boards") or []]
+    pages += [(key, page) for key, page in root.items() if key in specs]
+    for key, page in pages:
+        if key in specs and isinstance(page, dict) and isinstance(page.get("items"), list):
+            normalizer = page_normalizer(specs[key])
+            columns, errors = normalizer.normalize_columns(page["items"])
+            page["items"] = DecodedPage(normalizer.column_names, columns, errors)
+    return data
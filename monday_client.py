@@ -0,0 +1,369 @@
+# Cliente da API GraphQL do Monday.com usado por todo o acesso a dados do dashboard:
+# sessão HTTP com conexões reaproveitadas (keep-alive), compressão gzip, timeouts
+# configuráveis, transporte substituível (requests ou httpx, ou um servidor local)
+# e o agendador que respeita o orçamento de complexidade da API.
+import importlib.util
+import json
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt
+
+# Endereço padrão da API
+DEFAULT_API_URL = "https://api.monday.com/v2"
+
+# Tempos máximos de conexão e de espera por uma resposta da API (segundos)
+CONNECT_TIMEOUT = 10
+REQUEST_TIMEOUT = 60
+
+# Conexões mantidas abertas por transporte (suficiente para todas as threads de busca)
+POOL_SIZE = 32
+
+# Número máximo de tentativas para uma mesma requisição
+MAX_REQUEST_ATTEMPTS = 6
+
+# Limites do tamanho de página de items_page
+ITEMS_PAGE_MIN_LIMIT = 25
+ITEMS_PAGE_MAX_LIMIT = 500
+
+# Máximo de itens pedidos em uma única requisição com várias páginas (aliases)
+MAX_ITEMS_PER_REQUEST = 2500
+
+# Complexidade máxima aceita pela API em uma única consulta
+MAX_QUERY_COMPLEXITY = 5_000_000
+
+# Fração do orçamento restante que uma única consulta pode consumir
+BUDGET_SHARE_PER_QUERY = 0.1
+
+# Espera padrão quando a API limita a taxa sem informar quando renova (segundos)
+DEFAULT_RETRY_IN_SECONDS = 30
+
+# Leitura de JSON: orjson quando estiver instalado (várias vezes mais rápido nas páginas
+# de itens e nos valores de coluna), senão o módulo json. Os erros de ambos são
+# subclasses de json.JSONDecodeError.
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    json_loads = orjson.loads
+else:
+    json_loads = json.loads
+
+# Campo de complexidade adicionado a todas as consultas
+COMPLEXITY_FIELD = "complexity { before after query reset_in_x_seconds }"
+
+# Erro levantado pelas funções de busca executadas fora da thread principal,
+# onde não é possível chamar funções de UI diretamente
+class MondayAPIError(Exception):
+    pass
+
+# Erro temporário (falha de rede ou erro 5xx) que pode ser repetido
+class MondayTransientError(MondayAPIError):
+    pass
+
+# Orçamento de complexidade esgotado ou limite de taxa atingido
+class MondayRateLimitError(MondayAPIError):
+    def __init__(self, message, retry_in=DEFAULT_RETRY_IN_SECONDS):
+        super().__init__(message)
+        self.retry_in = retry_in
+
+# Consulta individual acima da complexidade máxima permitida
+class MondayQueryTooComplexError(MondayAPIError):
+    pass
+
+# Função para extrair o tempo de espera informado pela API em um erro de limite
+def parse_retry_in(response, errors):
+    for error in errors:
+        extensions = error.get("extensions") or {}
+        if extensions.get("retry_in_seconds") is not None:
+            return float(extensions["retry_in_seconds"])
+        message = error.get("message") or error.get("error_message") or ""
+        match = re.search(r"reset in (\d+) seconds", message)
+        if match:
+            return float(match.group(1))
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return DEFAULT_RETRY_IN_SECONDS
+
+# Função para listar os erros do corpo de uma resposta, nos dois formatos da API
+# (lista errors do GraphQL ou error_code/error_message)
+def graphql_errors(data):
+    if not isinstance(data, dict):
+        return []
+    errors = list(data.get("errors") or [])
+    if data.get("error_code"):
+        errors.append({"message": data.get("error_message", ""), "extensions": {"code": data["error_code"]}})
+    return errors
+
+# Função para classificar os erros retornados no corpo de uma resposta GraphQL
+def raise_for_graphql_errors(response, data):
+    errors = graphql_errors(data)
+    if not errors:
+        return
+
+    codes = {str((error.get("extensions") or {}).get("code", "")) for error in errors}
+    messages = "; ".join(error.get("message") or error.get("error_message") or "" for error in errors)
+
+    if codes & {"ComplexityException", "COMPLEXITY_BUDGET_EXHAUSTED", "RATE_LIMIT_EXCEEDED", "IP_RATE_LIMIT_EXCEEDED"} \
+            or "budget exhausted" in messages.lower():
+        raise MondayRateLimitError(f"Limite da API atingido: {messages}", parse_retry_in(response, errors))
+    if "maxComplexityExceeded" in codes or "exceeds max complexity" in messages.lower():
+        raise MondayQueryTooComplexError(f"Consulta muito complexa: {messages}")
+    # Erros parciais com dados presentes não interrompem a busca
+    if not data.get("data"):
+        raise MondayAPIError(f"Erro na API: {messages}")
+
+# Espera entre tentativas: limites de taxa já são respeitados pelo agendador,
+# demais erros temporários usam espera exponencial
+def retry_wait(retry_state):
+    if isinstance(retry_state.outcome.exception(), MondayRateLimitError):
+        return 0
+    return min(60, 2 ** retry_state.attempt_number)
+
+# Agendador central das requisições à API, compartilhado entre as threads de busca.
+# Acompanha o orçamento de complexidade informado pela API, segura novas
+# requisições quando o orçamento acaba e ajusta o tamanho das páginas de itens.
+class RequestScheduler:
+    def __init__(self, client):
+        self.client = client
+        self._lock = threading.Lock()
+        self.remaining = None  # Orçamento restante conhecido
+        self.reset_at = 0.0  # Momento (time.monotonic) em que o orçamento renova
+        self.blocked_until = 0.0  # Momento até o qual nenhuma requisição deve sair
+        self.cost_per_item = None  # Custo estimado de cada item em items_page
+
+        # Contadores acumulados desde a criação do agendador (ver stats)
+        self._stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "bytes_downloaded": 0,
+            "complexity_used": 0,
+            "request_seconds": 0.0,
+            "json_decode_seconds": 0.0,
+            "throttle_seconds": 0.0,
+        }
+
+    # Soma valores aos contadores
+    def _count(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                self._stats[name] += value
+
+    # Cópia dos contadores acumulados; a diferença entre duas cópias mede um intervalo
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    # Bloqueia a thread até que haja orçamento para uma consulta com o custo estimado
+    def wait_for_budget(self, estimated_cost=0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.remaining is not None and self.remaining < estimated_cost and now < self.reset_at:
+                    wait = self.reset_at - now
+                else:
+                    if self.remaining is not None:
+                        self.remaining -= estimated_cost
+                    return
+            time.sleep(wait)
+            self._count(throttle_seconds=wait)
+
+    # Atualiza o orçamento com o campo complexity da resposta
+    def record_complexity(self, complexity):
+        if not complexity:
+            return
+        with self._lock:
+            if complexity.get("after") is not None:
+                self.remaining = complexity["after"]
+            if complexity.get("reset_in_x_seconds") is not None:
+                self.reset_at = time.monotonic() + complexity["reset_in_x_seconds"]
+
+    # Registra o custo de uma página de itens para estimar o custo por item
+    def record_items_page_cost(self, limit, cost):
+        if not limit or not cost:
+            return
+        with self._lock:
+            observed = cost / limit
+            if self.cost_per_item is None:
+                self.cost_per_item = observed
+            else:
+                self.cost_per_item = 0.7 * self.cost_per_item + 0.3 * observed
+
+    # Quantidade de itens que cabe em uma consulta dentro da fração permitida do orçamento
+    def items_per_request(self):
+        with self._lock:
+            if not self.cost_per_item:
+                return ITEMS_PAGE_MAX_LIMIT
+            allowed_cost = MAX_QUERY_COMPLEXITY
+            if self.remaining is not None:
+                allowed_cost = min(allowed_cost, self.remaining * BUDGET_SHARE_PER_QUERY)
+            items = int(allowed_cost / self.cost_per_item)
+        return max(ITEMS_PAGE_MIN_LIMIT, min(MAX_ITEMS_PER_REQUEST, items))
+
+    # Tamanho de página que mantém cada consulta dentro da fração permitida do orçamento
+    def items_page_limit(self):
+        return min(ITEMS_PAGE_MAX_LIMIT, self.items_per_request())
+
+    # Custo estimado de uma página de itens com o tamanho informado
+    def estimate_items_page_cost(self, limit):
+        with self._lock:
+            return int(self.cost_per_item * limit) if self.cost_per_item else 0
+
+    # Segura novas requisições depois de um limite de taxa
+    def _block(self, retry_in):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_in)
+            self._stats["rate_limited"] += 1
+
+    # Envia uma única requisição e atualiza o orçamento. decode converte o corpo bruto
+    # da resposta (bytes) no JSON; por padrão, json_loads
+    def _send(self, query, estimated_cost, decode=None):
+        self.wait_for_budget(estimated_cost)
+        started = time.perf_counter()
+        try:
+            response = self.client.post(with_complexity(query))
+        except MondayAPIError:
+            self._count(requests=1, errors=1, request_seconds=time.perf_counter() - started)
+            raise
+        received = time.perf_counter()
+
+        try:
+            data = (decode or json_loads)(response.content)
+        except ValueError:
+            data = {}
+        self._count(
+            requests=1,
+            bytes_downloaded=len(response.content),
+            request_seconds=received - started,
+            json_decode_seconds=time.perf_counter() - received,
+        )
+
+        # O status 429 é sempre um limite de taxa, quaisquer que sejam os erros no corpo
+        if response.status_code == 429:
+            retry_in = parse_retry_in(response, graphql_errors(data))
+            self._block(retry_in)
+            raise MondayRateLimitError(f"Limite da API atingido: {response.text}", retry_in)
+        if response.status_code == 200 and data:
+            try:
+                raise_for_graphql_errors(response, data)
+            except MondayRateLimitError as e:
+                self._block(e.retry_in)
+                raise
+            except MondayAPIError:
+                self._count(errors=1)
+                raise
+        if response.status_code != 200 or not data:
+            self._count(errors=1)
+        if response.status_code >= 500:
+            raise MondayTransientError(f"Erro na API: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise MondayAPIError(f"Erro na API: {response.status_code} - {response.text}")
+        if not data:
+            raise MondayTransientError("Resposta vazia da API")
+
+        complexity = (data.get("data") or {}).get("complexity")
+        self.record_complexity(complexity)
+        if complexity and complexity.get("query"):
+            self._count(complexity_used=complexity["query"])
+        return data
+
+    # Executa uma consulta repetindo-a em caso de limite de taxa ou erro temporário
+    def execute(self, query, estimated_cost=0, decode=None):
+        retrying = Retrying(
+            retry=retry_if_exception_type((MondayRateLimitError, MondayTransientError)),
+            stop=stop_after_attempt(MAX_REQUEST_ATTEMPTS),
+            wait=retry_wait,
+            reraise=True,
+        )
+        return retrying(self._send, query, estimated_cost, decode)
+
+# Função para incluir o campo de complexidade na raiz de uma consulta
+def with_complexity(query):
+    if "complexity" in query:
+        return query
+    return query.replace("{", "{ " + COMPLEXITY_FIELD, 1)
+
+# Transporte HTTP com requests: uma Session com pool de conexões keep-alive.
+# requests já pede e descompacta respostas gzip automaticamente.
+class RequestsTransport:
+    def __init__(self, pool_size=POOL_SIZE):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+    def post(self, url, payload, headers, timeout):
+        try:
+            return self.session.post(url, json=payload, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise MondayTransientError(f"Falha de conexão com a API: {str(e)}")
+
+    def close(self):
+        self.session.close()
+
+# Transporte HTTP com httpx: um Client compartilhado, com HTTP/2 quando o pacote h2
+# estiver instalado (uma única conexão multiplexa as requisições de todas as threads)
+class HttpxTransport:
+    def __init__(self, pool_size=POOL_SIZE, http2=True):
+        import httpx
+
+        self._httpx = httpx
+        self.client = httpx.Client(
+            http2=http2 and importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+
+    def post(self, url, payload, headers, timeout):
+        connect_timeout, read_timeout = timeout
+        try:
+            return self.client.post(
+                url,
+                json=payload,
+                headers=headers,
+                timeout=self._httpx.Timeout(read_timeout, connect=connect_timeout),
+            )
+        except self._httpx.TransportError as e:
+            raise MondayTransientError(f"Falha de conexão com a API: {str(e)}")
+
+    def close(self):
+        self.client.close()
+
+# Transportes disponíveis por nome
+TRANSPORTS = {
+    "requests": RequestsTransport,
+    "httpx": HttpxTransport,
+}
+
+# Função para criar um transporte pelo nome
+def create_transport(name="requests"):
+    if name not in TRANSPORTS:
+        raise ValueError(f"Transporte desconhecido: {name} (disponíveis: {', '.join(TRANSPORTS)})")
+    return TRANSPORTS[name]()
+
+# Cliente da API: monta e envia as requisições GraphQL autenticadas pelo transporte.
+# Qualquer objeto com post(url, payload, headers, timeout) pode ser usado como transporte;
+# a resposta precisa ter status_code, headers, text e content.
+class MondayClient:
+    def __init__(self, api_token, transport=None, api_url=DEFAULT_API_URL, connect_timeout=CONNECT_TIMEOUT, timeout=REQUEST_TIMEOUT):
+        self.api_token = api_token
+        self.transport = transport or RequestsTransport()
+        self.api_url = api_url
+        self.timeout = (connect_timeout, timeout)
+
+    def post(self, query, variables=None):
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        headers = {"Authorization": self.api_token}
+        return self.transport.post(self.api_url, payload, headers, self.timeout)
+
+    def close(self):
+        self.transport.close()
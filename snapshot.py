@@ -0,0 +1,112 @@
+# Gera um snapshot dos itens do Monday.com fora do Streamlit, para ser agendado
+# (cron, por exemplo) e lido pelo dashboard sem esperar a busca na API.
+# Usa a mesma busca e normalização do app.py e grava Parquet ou Arrow em SNAPSHOT_DIR.
+#
+# O token vem de --token, da variável MONDAY_API_TOKEN ou de API_TOKEN em
+# .streamlit/secrets.toml. Uso (a partir da raiz do repositório):
+#     python snapshot.py --workers 8 --keep 7
+#     python snapshot.py --format arrow --incremental --metrics-file /var/lib/node_exporter/monday.prom
+import argparse
+import os
+import sys
+
+from headless import quiet_streamlit
+
+quiet_streamlit()
+
+import app  # noqa: E402
+
+
+# Token da API: argumento, variável de ambiente ou segredo do Streamlit
+def resolve_token(token=None):
+    if token:
+        return token
+    if os.environ.get("MONDAY_API_TOKEN"):
+        return os.environ["MONDAY_API_TOKEN"]
+    try:
+        return app.st.secrets["API_TOKEN"]
+    except (KeyError, FileNotFoundError):
+        return None
+
+
+def build_snapshot(args, token):
+    metrics = app.FetchMetrics()
+    board_filters = {
+        "skip_archived": not args.include_archived,
+        "skip_empty": not args.include_empty,
+        "workspaces": args.workspace,
+        "max_age_days": args.max_age_days,
+    }
+    df = app.fetch_all_items(
+        token,
+        max_workers=args.workers,
+        batch_boards=not args.no_batch,
+        extra_columns=[name.strip() for name in args.extra_columns.split(",") if name.strip()],
+        incremental=args.incremental,
+        board_filters=board_filters,
+        metrics=metrics,
+        raw=True,
+        decode_processes=args.decode_processes,
+    )
+    if df is None:
+        return None, metrics
+
+    # Status e áreas de trabalho para os filtros do dashboard, sem carregar os quadros de novo
+    all_status = set(app.get_all_status_values([], {})) | set(df["status"].dropna().unique())
+    board_index = app.fetch_board_index(token)
+    metadata = {
+        "all_status": sorted(all_status),
+        "workspaces": sorted({app.workspace_label(board) for board in board_index}),
+        "boards": int(metrics.counters.get("boards", 0)),
+        "board_filters": board_filters,
+    }
+    manifest = app.write_snapshot(df, args.output, args.format, metadata, keep=args.keep)
+    return manifest, metrics
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gera um snapshot dos itens do Monday.com para o dashboard")
+    parser.add_argument("--token", help="token da API (padrão: MONDAY_API_TOKEN ou .streamlit/secrets.toml)")
+    parser.add_argument("--output", default=app.SNAPSHOT_DIR, help="pasta dos snapshots")
+    parser.add_argument("--format", choices=sorted(app.SNAPSHOT_FORMATS), default="parquet", help="formato do arquivo")
+    parser.add_argument("--keep", type=int, default=7, help="quantidade de snapshots mantidos na pasta")
+    parser.add_argument("--workers", type=int, default=app.DEFAULT_MAX_WORKERS, help="quadros buscados em paralelo")
+    parser.add_argument("--no-batch", action="store_true", help="não agrupar quadros pequenos")
+    parser.add_argument("--decode-processes", type=int, default=app.DEFAULT_DECODE_PROCESSES, help="processos usados para decodificar as páginas (0 = thread principal)")
+    parser.add_argument("--extra-columns", default="", help="colunas adicionais (IDs ou títulos, separados por vírgula)")
+    parser.add_argument("--incremental", action="store_true", help="usar o armazenamento local e buscar só o que mudou")
+    parser.add_argument("--include-archived", action="store_true", help="incluir quadros arquivados ou excluídos")
+    parser.add_argument("--include-empty", action="store_true", help="incluir quadros vazios")
+    parser.add_argument("--workspace", action="append", help="buscar apenas esta área de trabalho (pode repetir)")
+    parser.add_argument("--max-age-days", type=int, default=None, help="ignorar quadros sem atualização há mais dias")
+    parser.add_argument("--metrics-file", help="grava as métricas da busca no formato do Prometheus neste arquivo")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    token = resolve_token(args.token)
+    if not token:
+        print("Token de API não configurado (use --token ou MONDAY_API_TOKEN).", file=sys.stderr)
+        return 2
+
+    manifest, metrics = build_snapshot(args, token)
+    if args.metrics_file:
+        with open(args.metrics_file + ".tmp", "w", encoding="utf-8") as file:
+            file.write(metrics.to_prometheus())
+        os.replace(args.metrics_file + ".tmp", args.metrics_file)
+
+    if manifest is None:
+        print("Nenhum item foi obtido; o snapshot anterior foi mantido.", file=sys.stderr)
+        return 1
+
+    summary = metrics.summary()
+    print(
+        f"Snapshot {os.path.join(args.output, manifest['file'])}: {manifest['items']} itens de "
+        f"{manifest['boards']} quadros em {summary['total_seconds']:.1f} s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
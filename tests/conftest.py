@@ -0,0 +1,40 @@
+# Configuração comum dos testes: a raiz do repositório no caminho de importação, o
+# Streamlit em silêncio (app.py é importado fora de "streamlit run", ver headless.py)
+# e o servidor GraphQL sintético de benchmarks/fake_server.py como API do Monday.
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Arquivos do app (armazenamento local e snapshots) ficam fora do repositório
+TEST_DIR = tempfile.mkdtemp(prefix="monday-tests-")
+os.environ.setdefault("MONDAY_STORE_PATH", os.path.join(TEST_DIR, "store.sqlite3"))
+os.environ.setdefault("MONDAY_SNAPSHOT_DIR", os.path.join(TEST_DIR, "snapshots"))
+
+from headless import quiet_streamlit  # noqa: E402
+
+quiet_streamlit()
+
+from benchmarks.fake_server import AccountConfig, FakeMondayServer, SyntheticAccount  # noqa: E402
+
+
+# Servidor sintético pequeno, compartilhado pelos testes de um módulo
+@pytest.fixture(scope="module")
+def fake_server():
+    server = FakeMondayServer(SyntheticAccount(AccountConfig(boards=4, items=60, users=12, teams=3, team_ratio=0.1))).start()
+    yield server
+    server.stop()
+
+
+# Token novo por teste, com o app apontando para o servidor sintético: os caches do
+# Streamlit (agendador, índice de quadros, diretório) são por token e não se misturam
+@pytest.fixture
+def api_token(fake_server, monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "API_URL", fake_server.url)
+    return f"token-{uuid.uuid4().hex}"
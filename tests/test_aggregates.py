@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import app
+
+
+def raw_items(count=400, seed=1):
+    rng = np.random.default_rng(seed)
+    today = date.today()
+    people = ["Ana", "Bruno", "Carla", "Davi"]
+    return pd.DataFrame({
+        "id": [str(1000 + index) for index in range(count)],
+        "name": [f"Item {index}" for index in range(count)],
+        "group": rng.choice(["G1", "G2"], count),
+        "board": rng.choice(["Quadro A", "Quadro B", "Quadro C"], count),
+        "persons": [app.PERSONS_SEPARATOR.join(sorted(set(rng.choice(people, rng.integers(1, 3))))) if rng.random() > 0.1 else "No person" for _ in range(count)],
+        "date": [(today + timedelta(days=int(days))).isoformat() if days < 60 else "No date" for days in rng.integers(-45, 80, count)],
+        "status": rng.choice(["Feito", "Parado", "Em Andamento"], count),
+    })
+
+
+def assert_same_aggregates(left, right):
+    assert left.items == right.items
+    for name in right.counts:
+        expected = right.counts[name].sort_index()
+        actual = left.counts[name].sort_index()
+        assert actual.index.tolist() == expected.index.tolist(), name
+        assert actual.tolist() == expected.tolist(), name
+
+
+def test_partial_results_aggregates():
+    partial = app.process_dates_and_add_urgency(raw_items())
+    assert not pd.api.types.is_datetime64_any_dtype(partial["date"])
+
+    aggregates = app.ItemAggregates.from_items(partial)
+
+    assert aggregates.items == len(partial)
+    assert aggregates.count("urgency", "Atrasado") == (partial["urgency"] == "Atrasado").sum()
+    assert dict(aggregates.counts["status"]) == partial["status"].value_counts().to_dict()
+    assert not aggregates.counts["weekly"].empty
+
+
+def test_partial_results_accumulate_new_items():
+    items = app.process_dates_and_add_urgency(raw_items())
+    partial = app.PartialResults(st.empty())
+    partial(items.iloc[:150])
+    partial(items.iloc[150:150])
+    partial(items.iloc[150:])
+
+    assert_same_aggregates(partial.aggregates, app.ItemAggregates.from_items(items))
+    assert partial.preview["id"].tolist() == items["id"].head(app.STREAM_PREVIEW_ROWS).tolist()
+
+
+def test_fetch_with_partial_results(fake_server, api_token, monkeypatch):
+    monkeypatch.setattr(app, "STREAM_RENDER_INTERVAL", 0)
+    partial = app.PartialResults(st.empty())
+    renders = []
+
+    def on_partial(new_items):
+        partial(new_items)
+        renders.append(new_items["id"].tolist())
+
+    df = app.fetch_all_items(api_token, on_partial=on_partial, raw=True)
+
+    # Cada item aparece uma única vez nos resultados parciais
+    rendered_ids = [item_id for ids in renders for item_id in ids]
+    assert len(rendered_ids) == len(set(rendered_ids)) == len(df) == fake_server.api.account.total_items
+    assert partial.aggregates.items == len(df)
+
+
+def test_repeated_fetch_uses_the_page_cache(fake_server, api_token, monkeypatch):
+    monkeypatch.setattr(app, "STREAM_RENDER_INTERVAL", 0)
+    first = app.fetch_all_items(api_token, on_partial=lambda new_items: None, raw=True)
+    metrics = app.FetchMetrics()
+    renders = []
+    second = app.fetch_all_items(api_token, on_partial=lambda new_items: renders.append(len(new_items)), raw=True, metrics=metrics)
+
+    assert metrics.counters["cached_jobs"] == metrics.counters["jobs"]
+    assert metrics.counters.get("pages", 0) == 0
+    assert sum(renders) == len(second)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_page_cache_expires_and_evicts():
+    cache = app.PageCache(ttl=60, max_items=10)
+    frame = pd.DataFrame({"id": [str(index) for index in range(4)]})
+    cache.put("a", {"1": [frame]})
+    cache.put("b", {"2": [frame, frame]})
+    assert cache.get("a") is None
+    assert len(cache.get("b")["2"]) == 2
+    assert cache.items == 8
+
+    cache.ttl = 0
+    assert cache.get("b") is None
+    assert cache.items == 0
+
+
+def test_dataset_aggregates_match_the_view():
+    dataset = app.SharedDataset("teste", raw_items(), "api")
+    filters = ((date.today() - timedelta(days=30)).isoformat(), (date.today() + timedelta(days=30)).isoformat(), ("Feito",))
+    aggregates = dataset.aggregates(*filters)
+    view = dataset.view(*filters)
+    persons = dataset.view_persons(view)
+
+    assert aggregates is dataset.aggregates(*filters)
+    assert aggregates.items == len(view)
+    assert len(aggregates.counts["person"]) == persons["person"].nunique()
+    assert aggregates.count("urgency", "Atenção") == (view["urgency"] == "Atenção").sum()
+    workload = aggregates.workload()
+    assert list(workload.columns) == app.URGENCY_LABELS + ["Itens"]
+    assert workload["Itens"].sum() == len(persons)
+
+
+def test_combine_adds_and_subtracts():
+    items = app.process_dates_and_add_urgency(raw_items())
+    first, second = items.iloc[:150], items.iloc[150:]
+    whole = app.ItemAggregates.from_items(items)
+    parts = app.ItemAggregates.from_items(first).combine(app.ItemAggregates.from_items(second))
+
+    assert_same_aggregates(parts, whole)
+    assert_same_aggregates(whole.combine(app.ItemAggregates.from_items(second), -1), app.ItemAggregates.from_items(first))
+
+
+def test_carried_aggregates_match_a_rebuild():
+    items = raw_items()
+    dataset = app.SharedDataset("teste", items, "api")
+    filters = ((date.today() - timedelta(days=30)).isoformat(), (date.today() + timedelta(days=30)).isoformat(), ("Feito",))
+    dataset.aggregates(*filters)
+
+    changed = items.copy()
+    changed.loc[:9, "status"] = "Feito"
+    changed.loc[10:19, "date"] = date.today().isoformat()
+    changed.loc[20:29, "persons"] = "Nova Pessoa"
+    changed = changed.drop(index=range(30, 40))
+    updated = app.SharedDataset("teste", changed, "api")
+    updated.carry_aggregates(dataset, set(items["id"][:40]))
+
+    rebuilt = app.SharedDataset("teste", changed, "api")
+    assert_same_aggregates(updated.aggregates(*filters), rebuilt.aggregates(*filters))
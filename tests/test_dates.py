@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+import app
+
+
+def test_parse_dates_formats():
+    values = pd.Series(["2024-03-01", "2024-03-01T10:30:00", "15/03/2024", "2024/03/20", "No date", "", None, "abc", 5])
+    parsed = app.parse_dates(values)
+    assert list(parsed[:4]) == [
+        pd.Timestamp("2024-03-01"), pd.Timestamp("2024-03-01 10:30"), pd.Timestamp("2024-03-15"), pd.Timestamp("2024-03-20"),
+    ]
+    assert parsed[4:].isna().all()
+    assert parsed.index.equals(values.index)
+
+
+def test_parse_dates_keeps_local_time_of_offset_dates():
+    values = pd.Series(["2024-03-01T23:00:00-03:00", "2024-03-02T01:00:00Z", "2024-03-01 10:00:00+05:30", "2024-03-01T23:59:59.500-0300"])
+    parsed = app.parse_dates(values)
+    assert list(parsed) == [
+        pd.Timestamp("2024-03-01 23:00"), pd.Timestamp("2024-03-02 01:00"), pd.Timestamp("2024-03-01 10:00"), pd.Timestamp("2024-03-01 23:59:59.5"),
+    ]
+
+
+def test_offset_dates_keep_their_urgency():
+    today = date.today()
+    values = pd.Series([f"{today.isoformat()}T23:00:00-03:00", f"{(today + timedelta(days=15)).isoformat()}T22:00:00-05:00"])
+    urgency = app.classify_urgency(app.parse_dates(values), pd.Series(["Parado", "Parado"]), today)
+    assert list(urgency) == ["Atrasado", "Atenção"]
+
+
+def test_classify_urgency():
+    today = date(2024, 3, 10)
+    dates = pd.Series(pd.to_datetime(["2024-03-10", "2024-02-09", "2024-02-08", "2024-03-25", "2024-03-26", "2024-03-01", None]))
+    statuses = pd.Series(["Parado", "Parado", "Parado", "Parado", "Parado", "Feito", "Parado"])
+    assert list(app.classify_urgency(dates, statuses, today)) == ["Atrasado", "Atrasado", None, "Atenção", None, None, None]
+
+
+def test_process_dates_and_add_urgency_filters_and_sorts():
+    df = pd.DataFrame({
+        "id": ["1", "2", "3", "4"],
+        "persons": ["bruno", "Ana", "ana", "Carla"],
+        "date": ["2024-03-05", "2024-03-02", "2024-03-01", "2024-04-30"],
+        "status": ["Feito", "Parado", "Parado", "Parado"],
+    })
+    processed = app.process_dates_and_add_urgency(df, "2024-03-01", "2024-03-31", ["Feito"])
+    assert list(processed["id"]) == ["3", "2"]
+    assert "urgency" in processed.columns
+    assert "date_converted" not in processed.columns
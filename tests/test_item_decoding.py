@@ -0,0 +1,132 @@
+import json
+
+import pandas as pd
+
+import app
+from item_decoding import (
+    BoardNormalizer,
+    DecodedPage,
+    PERSON_IDS_COLUMN,
+    PERSON_NAMES_COLUMN,
+    decode_items_response,
+    decode_person_refs,
+    encode_person_refs,
+    page_spec,
+    person_refs,
+    persons_from_refs,
+    referenced_ids,
+    resolve_persons,
+)
+
+COLUMN_MAP = {"person_column_id": "person", "date_column_id": "date4", "status_column_id": "status", "extra_columns": []}
+STATUS_LABELS = {"status": {"5": "Revisão"}}
+GROUPS = {"topics": "Grupo 1"}
+
+
+def make_item(item_id, people=(), date="2024-03-01", status=5):
+    people_value = json.dumps({"personsAndTeams": [{"id": entity_id, "kind": kind} for kind, entity_id in people]}) if people else None
+    return {
+        "id": item_id,
+        "name": f"Item {item_id}",
+        "group": {"id": "topics"},
+        "column_values": [
+            {"id": "person", "value": people_value, "text": ""},
+            {"id": "date4", "value": json.dumps({"date": date}), "text": date},
+            {"id": "status", "value": json.dumps({"index": status}), "text": ""},
+        ],
+    }
+
+
+def test_person_refs_round_trip():
+    refs = person_refs(json.dumps({"personsAndTeams": [{"id": 1, "kind": "person"}, {"id": 9, "kind": "team"}]}), "")
+    key = encode_person_refs(refs)
+
+    assert key == "person:1,team:9"
+    assert decode_person_refs(key) == (("person", "1"), ("team", "9"))
+    assert decode_person_refs(encode_person_refs(person_refs("não é json", "Ana, Bia"))) == (("text", "Ana, Bia"),)
+    assert decode_person_refs("") == ()
+    assert referenced_ids(["person:1,team:9", "person:2", ""]) == ({"1", "2"}, {"9"})
+
+
+def test_names_resolved_from_refs():
+    user_map, team_map = {"1": "Ana"}, {"9": "Equipe"}
+
+    assert persons_from_refs((("person", "1"), ("person", "2"), ("team", "9")), user_map, team_map) == "Ana, Unknown User 2, Equipe"
+    assert persons_from_refs((), user_map) == "No person"
+
+    frame = pd.DataFrame({"id": ["1", "2"], PERSON_IDS_COLUMN: ["person:1", ""]})
+    resolved = resolve_persons(frame, user_map, team_map)
+    assert list(resolved.columns) == ["id", "persons", PERSON_IDS_COLUMN, PERSON_NAMES_COLUMN]
+    assert resolved["persons"].tolist() == ["Ana", "No person"]
+    assert [json.loads(value) for value in resolved[PERSON_NAMES_COLUMN]] == [[["person:1", "Ana"]], []]
+
+
+def test_person_relation_keeps_names_with_commas():
+    user_map, team_map = {"1": "Silva, Ana", "2": "Bruno"}, {"9": "Vendas, Sul"}
+    frame = pd.DataFrame({
+        "id": ["1", "2", "3"],
+        "name": ["A", "B", "C"],
+        "group": "Grupo 1",
+        "board": "Quadro",
+        PERSON_IDS_COLUMN: ["person:1,team:9", "person:2,person:1", ""],
+        "date": ["2024-03-01", "No date", "2024-03-02"],
+        "status": "Feito",
+    })
+
+    resolved = resolve_persons(frame, user_map, team_map)
+    items, item_persons = app.compact_items(resolved)
+
+    assert list(items.columns) == app.ITEM_COLUMNS
+    assert items["persons"].tolist() == ["Silva, Ana, Vendas, Sul", "Bruno, Silva, Ana", "No person"]
+    assert item_persons.astype(object).to_numpy().tolist() == [
+        [1, "person:1", "Silva, Ana"],
+        [1, "team:9", "Vendas, Sul"],
+        [2, "person:2", "Bruno"],
+        [2, "person:1", "Silva, Ana"],
+    ]
+    aggregates = app.SharedDataset("k", resolved, "api").aggregates()
+    assert aggregates.counts["person"].to_dict() == {"Bruno": 1, "Silva, Ana": 2, "Vendas, Sul": 1}
+
+
+def test_decode_items_response_matches_the_normalizer():
+    first = [make_item("1", [("person", 1)]), make_item("2", status=1)]
+    following = [make_item("3", [("team", 9)], date="2024-04-02")]
+    response = {"data": {
+        "boards": [{"id": "10", "items_page": {"cursor": "abc", "items": first}}],
+        "page_0": {"cursor": None, "items": following},
+        "complexity": {"query": 100},
+    }}
+    spec = page_spec("Quadro", GROUPS, COLUMN_MAP, STATUS_LABELS)
+
+    data = decode_items_response(json.dumps(response).encode("utf-8"), {"10": spec, "page_0": spec})
+
+    normalizer = BoardNormalizer({"name": "Quadro"}, COLUMN_MAP, STATUS_LABELS, plan={"group_map": GROUPS})
+    for page, items in [(data["data"]["boards"][0]["items_page"]["items"], first), (data["data"]["page_0"]["items"], following)]:
+        assert isinstance(page, DecodedPage)
+        assert page.item_count == len(items)
+        pd.testing.assert_frame_equal(page.frame(), normalizer.normalize(items)[0])
+    assert data["data"]["boards"][0]["items_page"]["items"].person_keys() == ("person:1", "")
+    assert data["data"]["complexity"] == {"query": 100}
+
+
+def test_decode_items_response_keeps_errors_and_empty_pages():
+    response = {"data": {"boards": [{"id": "10", "items_page": {"cursor": None, "items": [{"id": "1", "group": "x"}]}}], "page_0": {"items": []}}}
+    spec = page_spec("Quadro", GROUPS, COLUMN_MAP, STATUS_LABELS)
+
+    data = decode_items_response(json.dumps(response).encode("utf-8"), {"10": spec, "page_0": spec})
+
+    page = data["data"]["boards"][0]["items_page"]["items"]
+    assert page.item_count == 0 and page.errors and page.errors[0][0] == "1"
+    assert data["data"]["page_0"]["items"].frame().empty
+    assert decode_items_response(b'{"errors": [{"message": "x"}]}', {"10": spec}) == {"errors": [{"message": "x"}]}
+
+
+def test_fetch_with_decode_processes(fake_server, api_token):
+    expected = app.fetch_all_items(api_token, raw=True)
+    decoded = app.fetch_all_items(api_token + "-pool", raw=True, decode_processes=1)
+
+    pd.testing.assert_frame_equal(
+        decoded.sort_values("id").reset_index(drop=True),
+        expected.sort_values("id").reset_index(drop=True),
+    )
+    assert not decoded["persons"].str.startswith("Unknown").any()
@@ -0,0 +1,92 @@
+import pandas as pd
+
+import app
+from item_decoding import PERSON_IDS_COLUMN
+
+
+def items_frame(board_id, count, persons="person:1"):
+    return pd.DataFrame({
+        "id": [f"{board_id}{index}" for index in range(count)],
+        "name": [f"Item {index}" for index in range(count)],
+        "group": "Grupo",
+        "board": f"Quadro {board_id}",
+        "persons": "Ana",
+        PERSON_IDS_COLUMN: persons,
+        "date": "2024-03-01",
+        "status": "Feito",
+    })
+
+
+def test_items_are_stored_without_person_names(tmp_path):
+    store = app.ItemStore(str(tmp_path / "store.sqlite3"))
+    synced_at = pd.Timestamp("2024-03-01", tz="UTC").to_pydatetime()
+    store.replace_board_items("1", items_frame("1", 3), "sig", synced_at)
+    store.replace_board_items("2", items_frame("2", 2, "team:9"), "sig", synced_at)
+
+    items = store.load_items(["1"])
+    assert len(items) == 3
+    assert "persons" not in items.columns
+    assert set(items[PERSON_IDS_COLUMN]) == {"person:1"}
+    assert len(store.load_items()) == 5
+
+
+def test_remove_missing_boards_keeps_listed_boards(tmp_path):
+    store = app.ItemStore(str(tmp_path / "store.sqlite3"))
+    synced_at = pd.Timestamp("2024-03-01", tz="UTC").to_pydatetime()
+    for board_id in ("1", "2", "3"):
+        store.replace_board_items(board_id, items_frame(board_id, 2), "sig", synced_at)
+
+    store.remove_missing_boards(["1", "2"])
+
+    assert set(store.load_items()["id"].str[0]) == {"1", "2"}
+    assert set(store.board_sync_states()) == {"1", "2"}
+
+
+def test_users_and_teams_round_trip(tmp_path):
+    store = app.ItemStore(str(tmp_path / "store.sqlite3"))
+    store.save_users({"1": "Ana"}, {"9": "Equipe"})
+    assert store.load_users() == {"1": "Ana"}
+    assert store.load_teams() == {"9": "Equipe"}
+
+
+def test_board_signature_tracks_groups():
+    column_map = {"person_column_id": "person", "date_column_id": "date4", "status_column_id": "status", "extra_columns": []}
+    labels = {"status": {"0": "Feito"}}
+    signature = app.board_signature(column_map, labels, {"g1": "Grupo 1"})
+    assert signature == app.board_signature(column_map, labels, {"g1": "Grupo 1"})
+    assert signature != app.board_signature(column_map, labels, {"g1": "Renomeado"})
+    assert signature != app.board_signature(column_map, {"status": {"0": "Parado"}}, {"g1": "Grupo 1"})
+
+
+def test_incremental_sync_resolves_names_at_read_time(fake_server, api_token, tmp_path, monkeypatch):
+    store = app.ItemStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(app, "get_item_store", lambda path=None: store)
+    account = fake_server.api.account
+
+    first = app.fetch_all_items(api_token, incremental=True, raw=True)
+    user = account.users[0]
+    assert (first["persons"].str.contains(user["name"])).any()
+
+    # Usuário renomeado: os itens não mudam, só o nome, que é resolvido na leitura
+    original_name = user["name"]
+    user["name"] = "Nome Novo"
+    try:
+        app.get_user_directory.clear()
+        second = app.fetch_all_items(api_token, incremental=True, raw=True)
+    finally:
+        user["name"] = original_name
+
+    assert len(second) == len(first)
+    assert second["persons"].str.contains("Nome Novo").any()
+    assert not second["persons"].str.contains(f"{original_name}(?:,|$)").any()
+
+
+def test_incremental_sync_keeps_boards_outside_the_filters(fake_server, api_token, tmp_path, monkeypatch):
+    store = app.ItemStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(app, "get_item_store", lambda path=None: store)
+
+    everything = app.fetch_all_items(api_token, incremental=True, raw=True)
+    filtered = app.fetch_all_items(api_token, incremental=True, raw=True, board_filters={"workspaces": ["Espaço 1"]})
+
+    assert set(filtered["board"]) < set(everything["board"])
+    assert len(store.load_items()) == len(everything)
@@ -0,0 +1,77 @@
+import pytest
+
+from monday_client import (
+    MondayAPIError,
+    MondayRateLimitError,
+    RequestScheduler,
+    json_loads,
+    raise_for_graphql_errors,
+)
+
+
+# Resposta mínima com os atributos usados pelo agendador
+class FakeResponse:
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self.text = body
+        self.content = body.encode("utf-8")
+        self.headers = headers or {}
+
+
+# Cliente que devolve as respostas na ordem em que foram dadas
+class FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.queries = []
+
+    def post(self, query):
+        self.queries.append(query)
+        return self.responses.pop(0)
+
+
+def test_429_with_other_graphql_errors_is_a_rate_limit():
+    body = '{"errors": [{"message": "Internal error", "extensions": {"code": "INTERNAL_SERVER_ERROR"}}]}'
+    scheduler = RequestScheduler(FakeClient(FakeResponse(429, body, {"Retry-After": "7"})))
+
+    with pytest.raises(MondayRateLimitError) as error:
+        scheduler._send("query { me { id } }", 0)
+
+    assert error.value.retry_in == 7
+    assert scheduler.stats()["rate_limited"] == 1
+    assert scheduler.blocked_until > 0
+
+
+def test_429_is_retried():
+    limited = FakeResponse(429, '{"error_code": "SomethingElse", "error_message": "reset in 0 seconds"}')
+    ok = FakeResponse(200, '{"data": {"me": {"id": 1}}}')
+    client = FakeClient(limited, ok)
+
+    assert RequestScheduler(client).execute("query { me { id } }") == {"data": {"me": {"id": 1}}}
+    assert len(client.queries) == 2
+
+
+def test_graphql_error_classification():
+    response = FakeResponse(200, "")
+    with pytest.raises(MondayRateLimitError):
+        raise_for_graphql_errors(response, {"errors": [{"message": "x", "extensions": {"code": "COMPLEXITY_BUDGET_EXHAUSTED", "retry_in_seconds": 3}}]})
+    with pytest.raises(MondayAPIError):
+        raise_for_graphql_errors(response, {"errors": [{"message": "Board not found"}]})
+    # Erros parciais com dados presentes não interrompem a busca
+    raise_for_graphql_errors(response, {"errors": [{"message": "x"}], "data": {"boards": []}})
+
+
+def test_json_loads_accepts_bytes():
+    assert json_loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_decode_receives_the_raw_response():
+    bodies = []
+
+    def decode(content):
+        bodies.append(content)
+        return dict(json_loads(content), decoded=True)
+
+    scheduler = RequestScheduler(FakeClient(FakeResponse(200, '{"data": {"me": {"id": 1}}}')))
+
+    assert scheduler.execute("query { me { id } }", decode=decode) == {"data": {"me": {"id": 1}}, "decoded": True}
+    assert bodies == [b'{"data": {"me": {"id": 1}}}']
@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import app
+from benchmarks.fake_server import AccountConfig, FakeMondayServer, SyntheticAccount
+
+COLUMN_MAP = {"date_column_id": "date4", "status_column_id": "status"}
+STATUS_LABELS = {"status": {"5": "Feito", "7": "Revisão", "x": "Feito"}}
+
+
+# Servidor sem datas em texto ambíguo, que o servidor filtra pela data guardada e o
+# cliente pelo texto; com elas, os dois filtros podem discordar em alguns itens
+@pytest.fixture(scope="module")
+def fake_server():
+    server = FakeMondayServer(SyntheticAccount(AccountConfig(boards=6, items=80, users=12, teams=3, odd_date_ratio=0))).start()
+    yield server
+    server.stop()
+
+
+def test_pushdown_rules():
+    rules = app.pushdown_rules(COLUMN_MAP, STATUS_LABELS, date(2024, 3, 1), date(2024, 3, 31), ["Feito", "Revisão"])
+
+    assert rules == (
+        '{column_id: "date4", compare_value: ["2024-03-01", "2024-03-31"], operator: between}',
+        '{column_id: "status", compare_value: [1, 5, 7], operator: not_any_of}',
+    )
+    assert app.rules_query_params(rules) == "{rules: [" + ", ".join(rules) + "], operator: and}"
+
+
+def test_pushdown_rules_skip_missing_filters_and_columns():
+    assert app.pushdown_rules(COLUMN_MAP, STATUS_LABELS) == ()
+    assert app.rules_query_params(()) is None
+    assert app.pushdown_rules(COLUMN_MAP, STATUS_LABELS, excluded_status=["Outro"]) == ()
+
+    no_date = app.pushdown_rules({"date_column_id": None, "status_column_id": "status"}, {}, date(2024, 3, 1), date(2024, 3, 31), ["Parado"])
+    assert no_date == ('{column_id: "status", compare_value: [2], operator: not_any_of}',)
+
+    no_status = app.pushdown_rules({"date_column_id": "date4", "status_column_id": None}, {}, date(2024, 3, 1), date(2024, 3, 31), ["Parado"])
+    assert len(no_status) == 1 and "between" in no_status[0]
+
+
+def test_fetch_with_pushdown_matches_the_client_filters(fake_server, api_token):
+    start_date, end_date = date.today() - timedelta(days=30), date.today() + timedelta(days=30)
+    excluded_status = ["Feito"]
+    client_metrics, pushed_metrics = app.FetchMetrics(), app.FetchMetrics()
+
+    expected = app.fetch_all_items(api_token, start_date, end_date, excluded_status, metrics=client_metrics)
+    pushed = app.fetch_all_items(api_token + "-pushdown", start_date, end_date, excluded_status, metrics=pushed_metrics, pushdown=True)
+
+    assert not expected.empty
+    assert sorted(pushed["id"].tolist()) == sorted(expected["id"].tolist())
+    assert pushed_metrics.counters["items_fetched"] < client_metrics.counters["items_fetched"]
+
+
+def test_covers_only_views_inside_the_pushed_filters():
+    start_date, end_date = date(2024, 3, 1), date(2024, 3, 31)
+    frame = pd.DataFrame({
+        "id": ["1"], "name": ["A"], "group": ["G"], "board": ["Q"],
+        "persons": ["No person"], "date": ["2024-03-10"], "status": ["Parado"],
+    })
+    dataset = app.SharedDataset("k", frame, "api", (start_date, end_date, ("Feito",)))
+
+    assert dataset.covers(start_date + timedelta(days=5), end_date, ["Feito", "Parado"])
+    assert not dataset.covers(start_date - timedelta(days=1), end_date, ["Feito"])
+    assert not dataset.covers(start_date, end_date, [])
+    assert not dataset.covers(None, None, ["Feito"])
+    assert app.SharedDataset("k", frame, "api").covers(None, None, [])
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+import app
+import snapshot
+from item_decoding import PERSON_IDS_COLUMN, resolve_persons
+
+USERS = {"1": "Silva, Ana", "2": "Bruno"}
+
+
+# Itens normalizados com todos os itens atribuídos a alguém
+def assigned_items():
+    return resolve_persons(pd.DataFrame({
+        "id": [str(100 + index) for index in range(6)],
+        "name": [f"Item {index}" for index in range(6)],
+        "group": "Grupo 1",
+        "board": "Quadro",
+        app.BOARD_ID_COLUMN: ["10", "10", "10", "20", "20", "20"],
+        PERSON_IDS_COLUMN: ["person:1", "person:2", "person:1,person:2", "person:2", "person:1", "person:2,person:1"],
+        "date": [f"2024-03-{index + 1:02d}" for index in range(6)],
+        "status": ["Feito", "Parado"] * 3,
+    }), USERS)
+
+
+@pytest.mark.parametrize("file_format", sorted(app.SNAPSHOT_FORMATS))
+def test_snapshot_of_assigned_items_round_trip(tmp_path, file_format):
+    items = assigned_items()
+    app.write_snapshot(items, directory=str(tmp_path), file_format=file_format)
+    manifest = app.read_snapshot_manifest(str(tmp_path))
+
+    dataset = app.SharedDataset("k", app.load_snapshot(str(tmp_path), manifest["file"], manifest["format"]), "snapshot")
+    expected = app.SharedDataset("k", items, "api")
+
+    assert dataset.board_ids == {"10", "20"}
+    pd.testing.assert_frame_equal(dataset.frame.astype(object), expected.frame.astype(object))
+    relation = lambda result: result.item_persons.astype(object).to_numpy().tolist()
+    assert relation(dataset) == relation(expected)
+    assert "No person" not in dataset.frame["persons"].tolist()
+
+
+@pytest.mark.parametrize("file_format", sorted(app.SNAPSHOT_FORMATS))
+def test_snapshot_script_matches_a_fetch(fake_server, api_token, tmp_path, file_format):
+    assert snapshot.main(["--token", api_token, "--output", str(tmp_path), "--format", file_format, "--decode-processes", "0"]) == 0
+
+    manifest = app.read_snapshot_manifest(str(tmp_path))
+    assert manifest["format"] == file_format and manifest["file"].endswith(app.SNAPSHOT_FORMATS[file_format])
+    assert manifest["boards"] > 0 and manifest["workspaces"]
+    assert set(app.get_all_status_values([], {})) <= set(manifest["all_status"])
+
+    frame = app.load_snapshot(str(tmp_path), manifest["file"], manifest["format"])
+    assert len(frame) == manifest["items"]
+    dataset = app.SharedDataset("snapshot", frame, "snapshot")
+    expected = app.SharedDataset("api", app.fetch_all_items(api_token, raw=True), "api")
+
+    assert dataset.board_ids == expected.board_ids
+    assert dataset.frame.astype(object).to_numpy().tolist() == expected.frame.astype(object).to_numpy().tolist()
+    relation = lambda result: sorted(map(tuple, result.item_persons.astype(str).to_numpy().tolist()))
+    assert relation(dataset) == relation(expected)
+
+
+def test_snapshot_manifest(tmp_path):
+    directory = str(tmp_path)
+    assert app.read_snapshot_manifest(directory) is None
+    with pytest.raises(ValueError):
+        app.write_snapshot(assigned_items(), directory=directory, file_format="csv")
+
+    manifest = app.write_snapshot(assigned_items(), directory=directory, metadata={"boards": 2})
+    assert app.read_snapshot_manifest(directory) == manifest
+    assert (manifest["boards"], manifest["items"], manifest["format"]) == (2, 6, "parquet")
+    assert not [name for name in tmp_path.iterdir() if name.suffix == ".tmp"]
+
+    # Manifesto apontando para um arquivo que não existe mais
+    (tmp_path / manifest["file"]).unlink()
+    assert app.read_snapshot_manifest(directory) is None
@@ -0,0 +1,56 @@
+import threading
+
+import app
+
+
+def test_names_are_snapshots(fake_server, api_token):
+    directory = app.UserDirectory()
+    directory.seed({"1000": "Nome antigo"}, {"900": "Equipe antiga"})
+    users, teams = directory.names()
+
+    directory.resolve(api_token, ["1000", "1001"], ["900"])
+
+    assert users == {"1000": "Nome antigo"} and teams == {"900": "Equipe antiga"}
+    users, teams = directory.names()
+    assert users == {"1000": "Usuário 0", "1001": "Usuário 1"}
+    assert teams == {"900": "Equipe 0"}
+
+
+def test_names_while_other_threads_resolve(fake_server, api_token):
+    directory = app.UserDirectory()
+    errors = []
+
+    def resolve(first):
+        try:
+            for user_id in range(first, 1012, 3):
+                directory.resolve(api_token, [str(user_id)])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=resolve, args=(1000 + offset,)) for offset in range(3)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        users, _ = directory.names()
+        sorted(users.items())
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(directory.names()[0]) == 12
+
+
+def test_load_all_returns_a_copy(fake_server, api_token):
+    directory = app.UserDirectory()
+    users = directory.load_all(api_token)
+    users.clear()
+
+    assert len(directory.load_all(api_token)) == 12
+    assert len(directory.names()[1]) == 3
+
+
+def test_people_column_ids_skip_missing_columns():
+    extra = [{"id": "pessoas2", "title": "Revisor", "type": "people"}, {"id": "texto", "title": "Texto", "type": "text"}]
+
+    assert app.people_column_ids({"person_column_id": None, "extra_columns": extra}) == {"pessoas2"}
+    assert app.people_column_ids({"person_column_id": "person", "extra_columns": []}) == {"person"}
@@ -0,0 +1,204 @@
+import json
+
+import pandas as pd
+
+import app
+from item_decoding import BoardNormalizer, resolve_persons
+from monday_client import MondayAPIError
+
+COLUMN_MAP = {"person_column_id": "person", "date_column_id": "date4", "status_column_id": "status", "extra_columns": []}
+STATUS_LABELS = {"status": {"1": "Feito", "2": "Parado"}}
+USERS = {"1": "Ana", "2": "Bruno", "3": "Carla"}
+
+
+# Diretório com nomes fixos, no lugar do UserDirectory (sem chamadas à API)
+class FixedDirectory:
+    def resolve_items(self, api_token, items, column_ids):
+        pass
+
+    def names(self):
+        return dict(USERS), {}
+
+
+def make_normalizer(board_id, name="Quadro"):
+    board = {"id": board_id, "name": name, "groups": [{"id": "topics", "title": "Grupo 1"}, {"id": "done", "title": "Grupo 2"}]}
+    return BoardNormalizer(board, COLUMN_MAP, STATUS_LABELS)
+
+
+def people_value(*user_ids):
+    return {"personsAndTeams": [{"id": int(user_id), "kind": "person"} for user_id in user_ids]}
+
+
+def make_item(item_id, user_ids, date, status=1):
+    return {
+        "id": item_id,
+        "name": f"Item {item_id}",
+        "group": {"id": "topics"},
+        "column_values": [
+            {"id": "person", "value": json.dumps(people_value(*user_ids)), "text": ""},
+            {"id": "date4", "value": json.dumps({"date": date}), "text": date},
+            {"id": "status", "value": json.dumps({"index": status}), "text": ""},
+        ],
+    }
+
+
+def normalized(normalizer, items):
+    frame = pd.DataFrame([normalizer.normalize_item(item) for item in items], columns=normalizer.column_names)
+    return resolve_persons(frame, USERS, {})
+
+
+# Itens do quadro 10 com datas distintas, para a ordem de exibição não ter empates
+def board_items():
+    users = [("1",), ("2",), ("1", "3"), (), ("3",), ("2", "1")]
+    return [make_item(str(100 + index), users[index % len(users)], f"2024-03-{index + 1:02d}", 1 + index % 2) for index in range(24)]
+
+
+def webhook(event_type, item_id, board_id=10, **fields):
+    return {"event": {"type": event_type, "boardId": board_id, "pulseId": int(item_id), **fields}}
+
+
+def test_parse_webhook_event():
+    column = app.parse_webhook_event(webhook("update_column_value", "101", columnId="date4", value={"date": "2024-05-01", "time": None}))
+    assert column["kind"] == "column" and column["board_id"] == "10" and column["item_id"] == "101"
+    assert column["column_values"][0]["id"] == "date4"
+    assert json.loads(column["column_values"][0]["value"])["date"] == "2024-05-01"
+
+    status = app.parse_webhook_event(webhook("update_column_value", "101", columnId="status", value={"label": {"index": 2, "text": "Parado"}}))
+    assert status["column_values"] == [{"id": "status", "value": json.dumps({"index": 2}), "text": "Parado"}]
+
+    created = app.parse_webhook_event(webhook("create_pulse", "900", pulseName="Novo", groupId="done", columnValues={"date4": {"date": "2024-06-01"}}))
+    assert (created["kind"], created["name"], created["group_id"]) == ("create", "Novo", "done")
+    assert [value["id"] for value in created["column_values"]] == ["date4"]
+
+    assert app.parse_webhook_event(webhook("delete_pulse", "101"))["kind"] == "remove"
+    assert app.parse_webhook_event(webhook("update_name", "101", value={"name": "Outro"}))["name"] == "Outro"
+    assert app.parse_webhook_event(webhook("move_pulse_into_group", "101", destGroupId="done"))["group_id"] == "done"
+    assert app.parse_webhook_event(webhook("something_else", "101")) is None
+    assert app.parse_webhook_event({"event": {"type": "delete_pulse", "pulseId": 1}}) is None
+    assert app.parse_webhook_event({"challenge": "abc"}) is None
+
+
+def test_created_items_are_matched_by_board_id():
+    # Dois quadros com o mesmo nome; só o 10 faz parte dos dados
+    contexts = {board_id: (make_normalizer(board_id), FixedDirectory(), ["person"]) for board_id in ("10", "20")}
+    dataset = app.SharedDataset("k", normalized(make_normalizer("10"), board_items()), "api")
+    assert dataset.board_ids == {"10"}
+
+    changes = [
+        app.parse_webhook_event(webhook("create_pulse", "900", board_id=10, pulseName="Novo", groupId="done")),
+        app.parse_webhook_event(webhook("create_pulse", "901", board_id=20, pulseName="Outro quadro", groupId="done")),
+    ]
+    removed_ids, rows = app.apply_item_changes(dataset.frame, changes, contexts, "token", dataset.board_ids)
+
+    assert removed_ids == set()
+    assert rows["id"].tolist() == ["900"]
+    assert rows[["name", "group", "board", "persons"]].iloc[0].tolist() == ["Novo", "Grupo 2", "Quadro", "No person"]
+    assert app.apply_item_changes(dataset.frame, changes[1:], contexts, "token", dataset.board_ids) is None
+
+
+def test_patched_matches_a_full_rebuild(monkeypatch):
+    normalizer = make_normalizer("10")
+    contexts = {"10": (normalizer, FixedDirectory(), ["person"])}
+    monkeypatch.setattr(app, "webhook_board_contexts", lambda board_ids, api_token, extra_columns=None: contexts)
+    items = board_items()
+    dataset = app.SharedDataset("k", normalized(normalizer, items), "api")
+
+    events = [
+        webhook("update_column_value", "101", columnId="date4", value={"date": "2024-03-30"}),
+        webhook("update_column_value", "102", columnId="person", value=people_value("2", "3")),
+        webhook("update_column_value", "103", columnId="status", value={"label": {"index": 1}}),
+        webhook("update_name", "104", value={"name": "Renomeado"}),
+        webhook("move_pulse_into_group", "105", destGroupId="done"),
+        webhook("delete_pulse", "106"),
+        webhook("create_pulse", "900", pulseName="Novo", groupId="done", columnValues={"person": people_value("1", "2"), "date4": {"date": "2024-03-15"}}),
+        webhook("create_pulse", "901", pulseName="Sem data", groupId="topics"),
+    ]
+    patched = dataset.patched([app.parse_webhook_event(event) for event in events], "token")
+
+    # Mesmos itens, alterados direto na origem e normalizados de novo
+    expected_items = {item["id"]: item for item in items}
+    expected_items["101"] = make_item("101", ("2",), "2024-03-30", 2)
+    expected_items["102"] = make_item("102", ("2", "3"), "2024-03-03", 1)
+    expected_items["103"] = make_item("103", (), "2024-03-04", 1)
+    expected_items["104"] = dict(expected_items["104"], name="Renomeado")
+    expected_items["105"] = dict(expected_items["105"], group={"id": "done"})
+    del expected_items["106"]
+    created = make_item("900", ("1", "2"), "2024-03-15")
+    expected_items["900"] = dict(created, name="Novo", group={"id": "done"}, column_values=created["column_values"][:2])
+    expected_items["901"] = {"id": "901", "name": "Sem data", "group": {"id": "topics"}, "column_values": []}
+    rebuilt = app.SharedDataset("k", normalized(normalizer, expected_items.values()), "api")
+
+    assert patched is not dataset and patched.created_at == dataset.created_at
+    assert patched.frame.index.is_unique
+    assert patched.frame["id"].tolist() == rebuilt.frame["id"].tolist()
+    columns = ["id", "name", "group", "board", "persons", "date", "status"]
+    pd.testing.assert_frame_equal(
+        patched.frame[columns].astype(object).reset_index(drop=True),
+        rebuilt.frame[columns].astype(object).reset_index(drop=True),
+    )
+    relation = lambda result: sorted(map(tuple, result.item_persons.astype(str).to_numpy().tolist()))
+    assert relation(patched) == relation(rebuilt)
+    assert patched.view()["id"].tolist() == rebuilt.view()["id"].tolist()
+    patched_counts = patched.aggregates().counts
+    for name, counts in rebuilt.aggregates().counts.items():
+        assert patched_counts[name].sort_index().to_dict() == counts.sort_index().to_dict(), name
+
+    # O conjunto original não muda
+    assert "106" in dataset.frame["id"].astype(str).tolist()
+    assert "900" not in dataset.frame["id"].astype(str).tolist()
+
+
+def test_failed_changes_are_applied_on_the_next_pass(monkeypatch):
+    normalizer = make_normalizer("10")
+    contexts = {"10": (normalizer, FixedDirectory(), ["person"])}
+    outage = {"active": True}
+
+    def board_contexts(board_ids, api_token, extra_columns=None):
+        if outage["active"] and board_ids:
+            raise MondayAPIError("API fora do ar")
+        return contexts
+
+    monkeypatch.setattr(app, "webhook_board_contexts", board_contexts)
+    registry = app.DatasetRegistry()
+    registry.publish("k", normalized(normalizer, board_items()), "api")
+    receiver = app.WebhookReceiver("token", port=0, secret=None, record_path=None, registry=registry)
+    try:
+        assert receiver.submit(webhook("update_column_value", "101", columnId="date4", value={"date": "2024-03-30"}))
+        assert receiver.submit(webhook("update_name", "101", value={"name": "Renomeado"}))
+        assert receiver.submit(webhook("delete_pulse", "106"))
+
+        # A remoção não depende da API; as alterações do item 101 esperam, na ordem
+        assert receiver.apply_pending() == 1
+        assert (receiver.applied, receiver.pending, receiver.dropped) == (1, 2, 0)
+        assert receiver.errors and "fora do ar" in receiver.last_error
+        items = registry.get("k").frame.set_index(registry.get("k").frame["id"].astype(str))
+        assert "106" not in items.index
+        assert items.loc["101", "name"] == "Item 101"
+
+        outage["active"] = False
+        assert receiver.apply_pending() == 2
+        assert (receiver.applied, receiver.pending, receiver.dropped) == (3, 0, 0)
+        items = registry.get("k").frame.set_index(registry.get("k").frame["id"].astype(str))
+        assert items.loc["101", "name"] == "Renomeado"
+        assert items.loc["101", "date"] == pd.Timestamp("2024-03-30")
+        assert receiver.apply_pending() == 0
+    finally:
+        receiver.httpd.server_close()
+
+
+def test_changes_are_dropped_after_the_last_attempt(monkeypatch):
+    def board_contexts(board_ids, api_token, extra_columns=None):
+        raise MondayAPIError("API fora do ar")
+
+    monkeypatch.setattr(app, "webhook_board_contexts", board_contexts)
+    registry = app.DatasetRegistry()
+    registry.publish("k", normalized(make_normalizer("10"), board_items()), "api")
+    receiver = app.WebhookReceiver("token", port=0, secret=None, record_path=None, registry=registry)
+    try:
+        receiver.submit(webhook("update_name", "101", value={"name": "Renomeado"}))
+        for _ in range(app.WEBHOOK_MAX_ATTEMPTS):
+            assert receiver.apply_pending() == 0
+        assert (receiver.applied, receiver.pending, receiver.dropped) == (0, 0, 1)
+        assert receiver.apply_pending() == 0
+    finally:
+        receiver.httpd.server_close()
@@ -0,0 +1,71 @@
+# Reenvia ao receptor de webhooks do dashboard eventos do Monday.com gravados em um
+# arquivo JSONL (um corpo de webhook por linha, como os gravados com MONDAY_WEBHOOK_RECORD),
+# para reproduzir uma sequência de alterações sem depender da conta real.
+#
+# O dashboard precisa estar rodando com MONDAY_WEBHOOK_PORT. Com MONDAY_WEBHOOK_SECRET
+# (ou --secret), as requisições são assinadas como as do Monday. Uso:
+#     python webhooks.py eventos.jsonl --url http://127.0.0.1:8765
+#     python webhooks.py eventos.jsonl --dry-run
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+from headless import quiet_streamlit
+
+quiet_streamlit()
+
+import app  # noqa: E402
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def replay(events, url, secret=None, delay=0.0):
+    sent = 0
+    with requests.Session() as session:
+        for payload in events:
+            headers = {"Authorization": app.sign_webhook_request(secret)} if secret else {}
+            response = session.post(url, json=payload, headers=headers, timeout=10)
+            response.raise_for_status()
+            sent += 1
+            if delay:
+                time.sleep(delay)
+    return sent
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reenvia eventos de webhook gravados ao dashboard")
+    parser.add_argument("file", help="arquivo JSONL com um corpo de webhook por linha")
+    parser.add_argument("--url", default=f"http://{app.WEBHOOK_HOST}:{app.WEBHOOK_PORT or 8765}", help="endereço do receptor")
+    parser.add_argument("--secret", default=os.environ.get("MONDAY_WEBHOOK_SECRET"), help="segredo usado para assinar as requisições")
+    parser.add_argument("--delay", type=float, default=0.0, help="pausa entre eventos, em segundos")
+    parser.add_argument("--dry-run", action="store_true", help="só mostra as alterações de itens de cada evento")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    events = read_events(args.file)
+
+    if args.dry_run:
+        for payload in events:
+            print(json.dumps(app.parse_webhook_event(payload), ensure_ascii=False))
+        return 0
+
+    try:
+        sent = replay(events, args.url, args.secret, args.delay)
+    except requests.RequestException as e:
+        print(f"Erro ao enviar eventos para {args.url}: {e}", file=sys.stderr)
+        return 1
+    print(f"{sent} eventos enviados para {args.url}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())